@@ -7,9 +7,13 @@ app = typer.Typer(help="Market Making RL CLI")
 
 
 @app.command()
-def backtest(config: str = typer.Option("configs/inventory.yaml", help="Path to YAML config")):
-    # Run the existing experiment script
-    subprocess.run(["python3", "experiments/run_inventory_mm.py"], check=True)
+def backtest(config: str = typer.Option("configs/inventory.yaml", help="Path to YAML config"),
+             isolated: bool = typer.Option(False, help="Run in a separate Python process")):
+    # In-process backtest engine
+    from mmrl.backtest import run_backtest
+    run_dir, metrics = run_backtest(config, isolated=isolated)
+    print(f"Saved artifacts to: {run_dir}")
+    print(metrics)
 
 
 @app.command()
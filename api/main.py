@@ -9,6 +9,7 @@ from prometheus_client import CollectorRegistry, Counter, generate_latest, Summa
 from pydantic import BaseModel, Field
 # Local utilities for config handling and process exec
 from api.utils import merge_overrides, run_with_config
+from mmrl.backtest import run_backtest
 from api.jobs import create_job, update_job, get_job, list_jobs
 from api.queue import get_queue
 from storage.duckdb import init_db as init_duckdb, upsert_run as db_upsert_run, list_runs as db_list_runs, save_trades as db_save_trades, count_runs as db_count_runs
@@ -187,6 +188,7 @@ def download_artifacts(run_name: str):
 @app.post("/backtest")
 def backtest(
     overrides: Optional[Overrides] = Body(default=None),
+    isolated: bool = False,
     auth: None = Depends(bearer_auth),
 ):
     cfg = load_base_config()
@@ -194,7 +196,8 @@ def backtest(
         cfg = merge_overrides(cfg, json.loads(overrides.model_dump_json(exclude_none=True)))
     try:
         RUN_IN_PROGRESS.inc()
-        run_with_config(["mmrl", "backtest"], cfg)
+        # In-process by default: no interpreter startup or re-import of mlflow/matplotlib/pandas per request
+        run_dir, metrics = run_backtest(cfg, isolated=isolated)
     except Exception as e:
         RUN_ERRORS_TOTAL.inc()
         return JSONResponse(status_code=500, content={"error": f"backtest failed: {e}"})
@@ -202,18 +205,6 @@ def backtest(
         RUN_IN_PROGRESS.dec()
 
     RUNS_TOTAL.inc()
-    time.sleep(0.1)
-    run_dir = get_latest_run_dir()
-    if run_dir is None:
-        return JSONResponse(status_code=500, content={"error": "no run directory found"})
-
-    metrics_path = run_dir / "metrics.json"
-    metrics = {}
-    if metrics_path.exists():
-        try:
-            metrics = json.loads(metrics_path.read_text())
-        except Exception:
-            metrics = {}
 
     run_mlflow_id = last_mlflow_run_id_from_run_dir(run_dir) or mlflow_info(cfg).get('mlflow_run_id')
     info = mlflow_info(cfg)
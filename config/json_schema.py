@@ -0,0 +1,67 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Optional
+import json
+
+# JSON schema of config.schema.AppConfig, checked in so the config commands start without
+# importing pydantic. Regenerate after changing config/schema.py: python -m config.json_schema
+SCHEMA_PATH = Path(__file__).with_name('app_config.schema.json')
+
+
+def load_json_schema() -> Dict[str, Any]:
+    with open(SCHEMA_PATH, 'r') as f:
+        return json.load(f)
+
+
+def write_json_schema() -> Path:
+    from config.schema import export_json_schema
+    with open(SCHEMA_PATH, 'w') as f:
+        json.dump(export_json_schema(), f, indent=2)
+        f.write('\n')
+    return SCHEMA_PATH
+
+
+def conforms(data: Any, schema: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    True when `data` certainly validates against the AppConfig schema. The check is stricter
+    than pydantic (no coercion, unknown schema keywords fail), so False only means "ask pydantic".
+    """
+    schema = load_json_schema() if schema is None else schema
+    return _conforms(data, schema, schema.get('$defs', {}))
+
+
+def _conforms(data: Any, node: Dict[str, Any], defs: Dict[str, Any]) -> bool:
+    if '$ref' in node:
+        return _conforms(data, defs[node['$ref'].rsplit('/', 1)[-1]], defs)
+    if 'anyOf' in node:
+        return any(_conforms(data, option, defs) for option in node['anyOf'])
+    kind = node.get('type')
+    if kind == 'null':
+        return data is None
+    if kind == 'boolean':
+        return isinstance(data, bool)
+    if kind == 'integer':
+        return isinstance(data, int) and not isinstance(data, bool)
+    if kind == 'number':
+        return isinstance(data, (int, float)) and not isinstance(data, bool)
+    if kind == 'string':
+        return isinstance(data, str)
+    if kind == 'array':
+        return isinstance(data, list) and all(_conforms(x, node.get('items', {}), defs) for x in data)
+    if kind == 'object':
+        if not isinstance(data, dict) or not all(isinstance(k, str) for k in data):
+            return False
+        props = node.get('properties', {})
+        extra = node.get('additionalProperties')
+        for key, value in data.items():
+            if key in props:
+                if not _conforms(value, props[key], defs):
+                    return False
+            elif isinstance(extra, dict) and not _conforms(value, extra, defs):
+                return False
+        return not node.get('required') or all(k in data for k in node['required'])
+    return False  # keyword this check does not understand
+
+
+if __name__ == '__main__':
+    print(f"Wrote {write_json_schema()}")
@@ -51,6 +51,73 @@ class MultiAssetConfig(BaseModel):
     regime_skew: float = 0.05
 
 
+class SimulationConfig(BaseModel):
+    # 0 = draw directly from np.random.Generator; >0 = pre-draw blocks of this size
+    rng_block_size: int = 0
+
+
+class TrainingConfig(BaseModel):
+    # Number of parallel envs for PPO rollouts; 'batched' holds them in arrays, 'dummy' uses SB3 DummyVecEnv
+    n_envs: int = 8
+    vec_env: str = "batched"
+    # >0 = step envs in this many worker processes through shared-memory buffers
+    num_workers: int = 0
+    envs_per_worker: int = 1
+
+
+class SweepConfig(BaseModel):
+    # 'pool' = one SimpleLOBEnv run per cell on a process pool; 'batched' = every cell is a BatchedLOBEnv lane
+    engine: str = "pool"
+    # Process-pool sweep executor: 0 workers = one per CPU core
+    workers: int = 0
+    chunk_size: int = 1
+
+
+class HyperoptConfig(BaseModel):
+    n_trials: int = 30
+    # Parallel worker processes sharing `storage` (in-memory study and a single process when storage is None)
+    workers: int = 1
+    # *.db/*.sqlite = SQLite, other paths = Optuna journal file; reruns resume the same study.
+    # None = in-memory (configs/inventory.yaml opts into results/hyperopt.journal)
+    storage: Optional[str] = None
+    study_name: str = "mmrl_hyperopt"
+    # Report the objective every N steps so the median pruner can stop weak trials (0 = off)
+    report_every: int = 100
+    pruning: bool = True
+    n_startup_trials: int = 5
+    # RUNNING trials without a heartbeat for this long are marked FAIL when a run resumes
+    stale_trial_seconds: float = 3600.0
+
+
+class CacheConfig(BaseModel):
+    # Content-addressed memoization of episode metrics (see utils.cache)
+    enabled: bool = False
+    dir: str = "results/.cache"
+    max_mb: float = 512.0
+
+
+class EvaluationConfig(BaseModel):
+    # Agents are stepped in lockstep over one shared path; at least `parallel_threshold` agents
+    # are split across `workers` processes (0 = one per CPU core)
+    workers: int = 0
+    parallel_threshold: int = 16
+    # Monte Carlo mode (n_seeds > 0): every agent on n_seeds independent SeedSequence streams,
+    # `chunk_size` seeds per pool task, bootstrap CIs written to `summary_path`
+    n_seeds: int = 0
+    chunk_size: int = 8
+    n_boot: int = 1000
+    ci: float = 0.95
+    summary_path: str = "results/monte_carlo_summary.parquet"
+
+
+class TrackingConfig(BaseModel):
+    # 'async' = queue MLflow params/metrics/artifacts and flush from a background thread;
+    # 'sync' = log inline; 'off' = no MLflow run at all (e.g. large sweeps)
+    mode: str = "async"
+    batch_size: int = 100
+    flush_interval: float = 1.0
+
+
 class RiskConfig(BaseModel):
     max_inventory: int = 50
     max_drawdown: float = 0.2
@@ -68,6 +135,13 @@ class AppConfig(BaseModel):
     grid: Optional[Dict[str, List[float]]] = None
     multi_asset: Optional[MultiAssetConfig] = None
     risk: Optional[RiskConfig] = None
+    simulation: SimulationConfig = SimulationConfig()
+    training: TrainingConfig = TrainingConfig()
+    sweep: SweepConfig = SweepConfig()
+    hyperopt: HyperoptConfig = HyperoptConfig()
+    cache: CacheConfig = CacheConfig()
+    evaluation: EvaluationConfig = EvaluationConfig()
+    tracking: TrackingConfig = TrackingConfig()
 
 
 def load_config(path: str) -> AppConfig:
@@ -0,0 +1,159 @@
+from __future__ import annotations
+import numpy as np
+from env.price_paths import PricePath
+
+
+class BatchedLOBEnv:
+    """
+    N independent SimpleLOBEnv episodes stepped together as NumPy arrays.
+    - Same OU mid-price, vol-regime, exponential fill, fee and slippage model as SimpleLOBEnv
+    - All state (mid, inventory, pnl, sigma, time) is held per lane in arrays of shape (N,)
+    - One `step(bids, asks)` call advances every lane with a single set of vectorized draws
+
+    Lanes share one generator, so a lane does not reproduce the exact path of a scalar env
+    with the same seed; results match the scalar env in distribution.
+    """
+
+    def __init__(self, num_envs: int = 1, mid_price=100.0, tick_size=0.01, max_inventory=10, seed: int | None = None,
+                 market: dict | None = None, execution: dict | None = None, fees: dict | None = None,
+                 price_path: PricePath | None = None):
+        self.rng = np.random.default_rng(seed)
+        self.num_envs = int(num_envs)
+
+        self.tick_size = float(tick_size)
+        self.max_inventory = int(max_inventory)
+
+        # Market model config (mirrors SimpleLOBEnv)
+        market = market or {}
+        ou_cfg = (market.get('ou') or {})
+        self.ou_enabled = bool(market.get('ou_enabled', True))
+        self.ou_mu = float(ou_cfg.get('mu', mid_price))
+        self.ou_kappa = float(ou_cfg.get('kappa', 0.05))
+        self.ou_sigma = float(ou_cfg.get('sigma', 0.5))
+        self.ou_dt = float(ou_cfg.get('dt', 1.0))
+
+        vr = (market.get('vol_regime') or {})
+        self.vr_enabled = bool(vr.get('enabled', False))
+        self.vr_high_sigma = float(vr.get('high_sigma', self.ou_sigma * 2.0))
+        self.vr_switch_prob = float(vr.get('switch_prob', 0.0))
+
+        # Execution model; either parameter may also be an (N,) array of per-lane values
+        execution = execution or {}
+        self.exec_base_rate = self._lane_param(execution.get('base_arrival_rate', 1.0))
+        self.exec_alpha = self._lane_param(execution.get('alpha', 1.5))
+
+        # Fees/slippage
+        fees = fees or {}
+        self.fee_bps = float(fees.get('fee_bps', 0.0))
+        self.slippage_bps = float(fees.get('slippage_bps', 0.0))
+
+        n = self.num_envs
+        self.time = np.zeros(n, dtype=np.int64)
+        self.inventory = np.zeros(n, dtype=np.int64)
+        self.pnl = np.zeros(n, dtype=float)
+        self.mid_price = np.full(n, float(self.ou_mu), dtype=float)
+        self._high_regime = np.zeros(n, dtype=bool)
+        self._current_sigma = np.full(n, self.ou_sigma, dtype=float)
+
+        # Optional precomputed path: (T,) shared by every lane or (T, N) one column per lane
+        self.price_path = price_path
+        self._lanes = np.arange(n)
+
+    def _lane_param(self, value) -> float | np.ndarray:
+        arr = np.asarray(value, dtype=float)
+        if arr.ndim == 0:
+            return float(arr)
+        return np.broadcast_to(arr, (self.num_envs,)).copy()
+
+    def reset(self, mask: np.ndarray | None = None):
+        """Reset all lanes, or only the lanes selected by a boolean `mask` of shape (N,)."""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        self.time[mask] = 0
+        self.inventory[mask] = 0
+        self.pnl[mask] = 0.0
+        self.mid_price[mask] = float(self.ou_mu)
+        self._high_regime[mask] = False
+        self._current_sigma[mask] = self.ou_sigma
+
+    def _update_vol_regime(self):
+        if not self.vr_enabled:
+            return
+        switch = self.rng.random(self.num_envs) < self.vr_switch_prob
+        self._high_regime ^= switch
+        self._current_sigma = np.where(self._high_regime, self.vr_high_sigma, self.ou_sigma)
+
+    def _update_mid_price(self):
+        if self.ou_enabled:
+            noise = self.rng.standard_normal(self.num_envs)
+            dS = self.ou_kappa * (self.ou_mu - self.mid_price) * self.ou_dt + self._current_sigma * np.sqrt(self.ou_dt) * noise
+            self.mid_price = self.mid_price + dS
+        else:
+            self.mid_price = self.mid_price + self.rng.uniform(-0.05, 0.05, size=self.num_envs)
+
+    def _advance_along_path(self):
+        t = self.time
+        if t.max() >= len(self.price_path):
+            raise IndexError(f"price path exhausted after {len(self.price_path)} steps")
+        if self.price_path.mid.ndim == 1:
+            self.mid_price = self.price_path.mid[t]
+            self._current_sigma = self.price_path.sigma[t]
+        else:
+            self.mid_price = self.price_path.mid[t, self._lanes]
+            self._current_sigma = self.price_path.sigma[t, self._lanes]
+
+    def _fill_probability(self, quote_price: np.ndarray) -> np.ndarray:
+        dist_ticks = np.maximum(0.0, np.abs(quote_price - self.mid_price) / self.tick_size)
+        lam = self.exec_base_rate * np.exp(-self.exec_alpha * dist_ticks)
+        return np.clip(1.0 - np.exp(-lam), 0.0, 1.0)
+
+    def _apply_fees_slippage(self, price: np.ndarray, side: str) -> np.ndarray:
+        slip = price * (self.slippage_bps / 1e4)
+        fee = price * (self.fee_bps / 1e4)
+        if side == 'sell':
+            return price - slip - fee
+        return price + slip + fee
+
+    def step(self, bids: np.ndarray, asks: np.ndarray) -> dict:
+        """
+        bids, asks: arrays of shape (N,) (scalars broadcast) with one quote per lane.
+        Returns a record of per-lane arrays with the same keys as SimpleLOBEnv history rows;
+        executed_bid/executed_ask are NaN where the side did not fill.
+        """
+        n = self.num_envs
+        bids = np.broadcast_to(np.asarray(bids, dtype=float), (n,))
+        asks = np.broadcast_to(np.asarray(asks, dtype=float), (n,))
+        asks = np.where(asks <= bids, bids + self.tick_size, asks)
+
+        u = self.rng.random((2, n))
+        can_sell = self.inventory > -self.max_inventory
+        can_buy = self.inventory < self.max_inventory
+
+        ask_fill = can_sell & (u[0] < self._fill_probability(asks))
+        ask_px = self._apply_fees_slippage(asks, 'sell')
+        self.inventory -= ask_fill
+        self.pnl += np.where(ask_fill, ask_px, 0.0)
+
+        bid_fill = can_buy & (u[1] < self._fill_probability(bids))
+        bid_px = self._apply_fees_slippage(bids, 'buy')
+        self.inventory += bid_fill
+        self.pnl -= np.where(bid_fill, bid_px, 0.0)
+
+        if self.price_path is None:
+            self._update_vol_regime()
+            self._update_mid_price()
+        else:
+            self._advance_along_path()
+        self.time += 1
+
+        return {
+            'time': self.time.copy(),
+            'bid': bids.copy(),
+            'ask': asks,
+            'mid_price': self.mid_price.copy(),
+            'inventory': self.inventory.copy(),
+            'executed_bid': np.where(bid_fill, bid_px, np.nan),
+            'executed_ask': np.where(ask_fill, ask_px, np.nan),
+            'pnl': self.pnl.copy(),
+            'sigma': self._current_sigma.copy(),
+        }
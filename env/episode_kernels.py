@@ -0,0 +1,210 @@
+from __future__ import annotations
+from typing import Any, Dict, Tuple
+import numpy as np
+
+from env.history import HistoryBuffer
+from env.price_paths import PricePath, path_seed, simulate_price_path
+from agents.naive_mm import NaiveMarketMaker
+from agents.inventory_mm import InventoryAwareMarketMaker
+from agents.avellaneda_stoikov import AvellanedaStoikovMM
+from agents.mean_reversion_mm import MeanReversionMarketMaker
+from agents.momentum_mm import MomentumMarketMaker
+
+# Optional: compile the episode loop when numba is installed, otherwise run it as plain Python
+try:
+    from numba import njit  # type: ignore
+    HAS_NUMBA = True
+except Exception:  # pragma: no cover
+    njit = None  # type: ignore
+    HAS_NUMBA = False
+
+
+AGENT_NAIVE = 0
+AGENT_INVENTORY = 1
+AGENT_AVELLANEDA = 2
+AGENT_MEAN_REVERSION = 3
+AGENT_MOMENTUM = 4
+
+
+def agent_spec(agent: Any) -> Tuple[int, np.ndarray]:
+    """Map a rule-based agent instance to (agent code, float64 parameter vector)."""
+    if isinstance(agent, NaiveMarketMaker):
+        return AGENT_NAIVE, np.array([agent.spread], dtype=float)
+    if isinstance(agent, InventoryAwareMarketMaker):
+        return AGENT_INVENTORY, np.array([agent.spread, agent.inventory_sensitivity], dtype=float)
+    if isinstance(agent, AvellanedaStoikovMM):
+        return AGENT_AVELLANEDA, np.array([agent.risk_aversion, agent.base_spread, agent.inv_penalty], dtype=float)
+    if isinstance(agent, MeanReversionMarketMaker):
+        return AGENT_MEAN_REVERSION, np.array([agent.target_spread, agent.kappa, agent.skew_sensitivity], dtype=float)
+    if isinstance(agent, MomentumMarketMaker):
+        return AGENT_MOMENTUM, np.array([agent.spread, agent.window, agent.bias], dtype=float)
+    raise TypeError(f"No episode kernel for agent type {type(agent).__name__}")
+
+
+def _episode_loop(code, params, mid0, sigma0, path_mid, path_sigma, uniforms,
+                  tick_size, max_inventory, base_rate, alpha, slip_frac, fee_frac):
+    """
+    One SimpleLOBEnv episode of a rule-based agent. Quoting mirrors the agent classes;
+    stepping mirrors SimpleLOBEnv.step with the mid/sigma taken from a precomputed path.
+    `uniforms` is the env's uniform stream: like the env, a side blocked by the inventory
+    limit consumes no draw, so fills stay in step with SimpleLOBEnv when limits bind.
+    """
+    steps = path_mid.shape[0]
+    out_time = np.empty(steps, dtype=np.int64)
+    out_bid = np.empty(steps)
+    out_ask = np.empty(steps)
+    out_mid = np.empty(steps)
+    out_inv = np.empty(steps, dtype=np.int64)
+    out_ex_bid = np.empty(steps)
+    out_ex_ask = np.empty(steps)
+    out_pnl = np.empty(steps)
+    out_sigma = np.empty(steps)
+
+    window = int(params[1]) if code == AGENT_MOMENTUM else 1
+    window = max(window, 1)
+    prices = np.empty(window)
+    n_prices = 0
+    head = 0
+
+    mid = mid0
+    sigma = sigma0
+    inventory = 0
+    pnl = 0.0
+    u = 0
+    for t in range(steps):
+        # --- agent quote ---
+        if code == AGENT_NAIVE:
+            half = params[0] / 2.0
+            bid = mid - half
+            ask = mid + half
+        elif code == AGENT_INVENTORY:
+            skew = params[1] * inventory
+            ask = mid + params[0] / 2 - skew
+            bid = mid - params[0] / 2 + skew
+        elif code == AGENT_AVELLANEDA:
+            skew = params[0] * inventory * max(sigma, 1e-6)
+            optimal_spread = params[1] + params[2] * abs(inventory)
+            half = optimal_spread / 2.0
+            bid = mid - half + skew
+            ask = mid + half + skew
+            if ask <= bid:
+                ask = bid + optimal_spread
+        elif code == AGENT_MEAN_REVERSION:
+            skew = -params[1] * inventory * params[2]
+            half = params[0] / 2.0
+            bid = mid - half + skew
+            ask = mid + half + skew
+            if ask <= bid:
+                ask = bid + params[0]
+        else:
+            # Ring buffer standing in for the agent's deque(maxlen=window)
+            if n_prices < window:
+                prices[n_prices] = mid
+                n_prices += 1
+            else:
+                prices[head] = mid
+                head = (head + 1) % window
+            sig = 0.0
+            if n_prices >= 2:
+                newest = prices[n_prices - 1] if n_prices < window else prices[(head - 1) % window]
+                oldest = prices[0] if n_prices < window else prices[head]
+                sig = newest - oldest
+            skew = params[2] if sig > 0 else (-params[2] if sig < 0 else 0.0)
+            half = params[0] / 2.0
+            bid = mid - half - skew
+            ask = mid + half - skew
+            if ask <= bid:
+                ask = bid + params[0]
+
+        # --- env step ---
+        if ask <= bid:
+            ask = bid + tick_size
+        can_buy = inventory < max_inventory
+        can_sell = inventory > -max_inventory
+        ex_bid = np.nan
+        ex_ask = np.nan
+        if can_sell:
+            lam = base_rate * np.exp(-alpha * (abs(ask - mid) / tick_size))
+            p_ask = min(max(1.0 - np.exp(-lam), 0.0), 1.0)
+            draw = uniforms[u]
+            u += 1
+            if draw < p_ask:
+                ex_ask = ask - ask * slip_frac - ask * fee_frac
+                inventory -= 1
+                pnl += ex_ask
+        if can_buy:
+            lam = base_rate * np.exp(-alpha * (abs(bid - mid) / tick_size))
+            p_bid = min(max(1.0 - np.exp(-lam), 0.0), 1.0)
+            draw = uniforms[u]
+            u += 1
+            if draw < p_bid:
+                ex_bid = bid + bid * slip_frac + bid * fee_frac
+                inventory += 1
+                pnl -= ex_bid
+
+        mid = path_mid[t]
+        sigma = path_sigma[t]
+        out_time[t] = t + 1
+        out_bid[t] = bid
+        out_ask[t] = ask
+        out_mid[t] = mid
+        out_inv[t] = inventory
+        out_ex_bid[t] = ex_bid
+        out_ex_ask[t] = ex_ask
+        out_pnl[t] = pnl
+        out_sigma[t] = sigma
+    return out_time, out_bid, out_ask, out_mid, out_inv, out_ex_bid, out_ex_ask, out_pnl, out_sigma
+
+
+_compiled_loop = njit(cache=True)(_episode_loop) if HAS_NUMBA else None
+
+
+def run_episode(
+    agent: Any,
+    steps: int,
+    seed=None,
+    market: Dict[str, Any] | None = None,
+    execution: Dict[str, Any] | None = None,
+    fees: Dict[str, Any] | None = None,
+    tick_size: float = 0.01,
+    max_inventory: int = 10,
+    price_path: PricePath | None = None,
+    use_numba: bool | None = None,
+) -> HistoryBuffer:
+    """
+    Run a whole SimpleLOBEnv episode for a known rule-based agent in one call and return
+    its columnar history. Fill uniforms come from `default_rng(seed)` in SimpleLOBEnv's order
+    (ask then bid, skipping sides blocked by the inventory limit), so with the same seed and
+    `price_path` the history equals a SimpleLOBEnv loop's; the market path is `price_path` or
+    one simulated from a child of `seed`.
+    Uses the numba-compiled loop when available (`use_numba=None`), else plain Python.
+    """
+    code, params = agent_spec(agent)
+    market = market or {}
+    execution = execution or {}
+    fees = fees or {}
+    steps = int(steps)
+    if price_path is None:
+        price_path = simulate_price_path(steps, seed=path_seed(seed), market=market)
+    if len(price_path) < steps or price_path.mid.ndim != 1:
+        raise ValueError("price_path must be a (T,) path with at least `steps` rows")
+    uniforms = np.random.default_rng(seed).random(2 * steps)
+    ou_cfg = (market.get('ou') or {})
+    mid0 = float(ou_cfg.get('mu', 100.0))
+    sigma0 = float(ou_cfg.get('sigma', 0.5))
+
+    if use_numba is None:
+        use_numba = HAS_NUMBA
+    if use_numba and not HAS_NUMBA:
+        raise RuntimeError("numba is not installed; install the optional 'perf' extras or pass use_numba=False")
+    loop = _compiled_loop if use_numba else _episode_loop
+    cols = loop(
+        code, params, mid0, sigma0,
+        np.ascontiguousarray(price_path.mid[:steps], dtype=float),
+        np.ascontiguousarray(price_path.sigma[:steps], dtype=float),
+        uniforms,
+        float(tick_size), int(max_inventory),
+        float(execution.get('base_arrival_rate', 1.0)), float(execution.get('alpha', 1.5)),
+        float(fees.get('slippage_bps', 0.0)) / 1e4, float(fees.get('fee_bps', 0.0)) / 1e4,
+    )
+    return HistoryBuffer.from_arrays(**dict(zip(HistoryBuffer.FIELDS, cols)))
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import math
+import numpy as np
+
+
+class FillProbabilityTable:
+    """
+    Cached fill probabilities for the exponential arrival model
+        p = clip(1 - exp(-base_rate * exp(-alpha * dist_ticks) * exp(-size_sensitivity * size)), 0, 1)
+    - Rows are integer quote distances in ticks (0..max_ticks)
+    - Columns are size buckets on a `size_step` grid (0..max_size); a single column when size is unused
+    - Distances/sizes that do not fall on the grid (including negative, NaN and infinite
+      distances) are evaluated exactly
+    """
+
+    def __init__(
+        self,
+        base_rate: float,
+        alpha: float,
+        size_sensitivity: float = 0.0,
+        max_ticks: int = 256,
+        size_step: float = 0.1,
+        max_size: float = 10.0,
+        tol: float = 1e-9,
+    ) -> None:
+        self.base_rate = float(base_rate)
+        self.alpha = float(alpha)
+        self.size_sensitivity = float(size_sensitivity)
+        self.max_ticks = int(max_ticks)
+        self.size_step = float(size_step)
+        self.num_sizes = int(round(max_size / size_step)) + 1 if self.size_sensitivity != 0.0 else 1
+        self.tol = float(tol)
+        dist = np.arange(self.max_ticks + 1, dtype=float)[:, None]
+        size = (np.arange(self.num_sizes, dtype=float) * self.size_step)[None, :]
+        self.table = self.exact(dist, size)
+        # Python lists make scalar lookups cheaper than ndarray indexing
+        self._rows = self.table.tolist()
+        self._by_tick = self.table[:, 0].tolist()
+
+    def exact(self, dist_ticks, size=0.0):
+        lam = self.base_rate * np.exp(-self.alpha * np.maximum(0.0, dist_ticks))
+        if self.size_sensitivity != 0.0:
+            lam = lam * np.exp(-self.size_sensitivity * np.maximum(0.0, size))
+        return np.clip(1.0 - np.exp(-lam), 0.0, 1.0)
+
+    def lookup(self, dist_ticks: float, size: float = 0.0) -> float:
+        """Scalar probability for one quote."""
+        if not math.isfinite(dist_ticks):
+            return float(self.exact(dist_ticks, size))
+        k = round(dist_ticks)
+        if 0 <= k <= self.max_ticks and abs(dist_ticks - k) <= self.tol:
+            if self.num_sizes == 1:
+                return self._by_tick[k]
+            j = round(size / self.size_step)
+            if 0 <= j < self.num_sizes and abs(size - j * self.size_step) <= self.tol:
+                return self._rows[k][j]
+        return float(self.exact(dist_ticks, size))
+
+    def lookup_array(self, dist_ticks: np.ndarray, size: np.ndarray | float = 0.0) -> np.ndarray:
+        """Vectorized probability for arrays of distances (and broadcastable sizes)."""
+        dist_ticks = np.asarray(dist_ticks, dtype=float)
+        size = np.broadcast_to(np.asarray(size, dtype=float), dist_ticks.shape)
+        k = np.rint(dist_ticks)
+        with np.errstate(invalid="ignore"):  # inf - inf for pulled quotes
+            on_grid = (np.abs(dist_ticks - k) <= self.tol) & (k >= 0) & (k <= self.max_ticks)
+        if self.num_sizes > 1:
+            j = np.rint(size / self.size_step)
+            on_grid &= (np.abs(size - j * self.size_step) <= self.tol) & (j >= 0) & (j < self.num_sizes)
+        else:
+            j = np.zeros_like(k)
+        out = np.empty(dist_ticks.shape, dtype=float)
+        out[on_grid] = self.table[k[on_grid].astype(np.intp), j[on_grid].astype(np.intp)]
+        off = ~on_grid
+        if off.any():
+            out[off] = self.exact(dist_ticks[off], size[off])
+        return out
@@ -18,6 +18,7 @@ class MarketMakingGymEnv(gym.Env):
             market=cfg.get("market"),
             execution=cfg.get("execution"),
             fees=cfg.get("fees"),
+            simulation=cfg.get("simulation"),
         )
         self.agent = InventoryAwareMarketMaker(
             spread=cfg.get("agent", {}).get("spread", 0.1),
@@ -39,6 +40,7 @@ class MarketMakingGymEnv(gym.Env):
                 market=self._base_cfg.get("market"),
                 execution=self._base_cfg.get("execution"),
                 fees=self._base_cfg.get("fees"),
+                simulation=self._base_cfg.get("simulation"),
             )
         self.env.reset()
         self.step_count = 0
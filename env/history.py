@@ -0,0 +1,141 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List
+import numpy as np
+import pandas as pd
+
+
+class HistoryBuffer:
+    """
+    Columnar step history for SimpleLOBEnv.
+    - One growable typed NumPy column per field (capacity doubles when full)
+    - `executed_bid`/`executed_ask` store NaN when a side did not fill
+    - `to_frame()` returns an ordinary, writable copy; `to_frame(copy=False)` and `as_arrays()`
+      return read-only views without copying
+    - Indexing and iteration yield the legacy per-step dicts (None for no fill)
+    """
+
+    FIELDS = ('time', 'bid', 'ask', 'mid_price', 'inventory', 'executed_bid', 'executed_ask', 'pnl', 'sigma')
+    DTYPES = {
+        'time': np.int64,
+        'bid': np.float64,
+        'ask': np.float64,
+        'mid_price': np.float64,
+        'inventory': np.int64,
+        'executed_bid': np.float64,
+        'executed_ask': np.float64,
+        'pnl': np.float64,
+        'sigma': np.float64,
+    }
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._initial_capacity = max(1, int(capacity))
+        self._size = 0
+        self._cols: Dict[str, np.ndarray] = {}
+        self._allocate(self._initial_capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        cols = {name: np.empty(capacity, dtype=self.DTYPES[name]) for name in self.FIELDS}
+        for name, old in self._cols.items():
+            cols[name][:self._size] = old[:self._size]
+        self._cols = cols
+        self._capacity = capacity
+        # memoryview item assignment is much cheaper than NumPy scalar setitem
+        self._views = tuple(memoryview(cols[name]) for name in self.FIELDS)
+
+    def append(self, time, bid, ask, mid_price, inventory, executed_bid, executed_ask, pnl, sigma) -> None:
+        i = self._size
+        if i == self._capacity:
+            self._allocate(2 * self._capacity)
+        v = self._views
+        v[0][i] = time
+        v[1][i] = bid
+        v[2][i] = ask
+        v[3][i] = mid_price
+        v[4][i] = inventory
+        v[5][i] = np.nan if executed_bid is None else executed_bid
+        v[6][i] = np.nan if executed_ask is None else executed_ask
+        v[7][i] = pnl
+        v[8][i] = sigma
+        self._size = i + 1
+
+    def clear(self) -> None:
+        # Fresh storage so frames/views handed out earlier are never overwritten
+        self._size = 0
+        self._cols = {}
+        self._allocate(self._initial_capacity)
+
+    @classmethod
+    def from_arrays(cls, **columns: np.ndarray) -> "HistoryBuffer":
+        """Build a buffer that adopts (or converts) equal-length column arrays."""
+        n = len(columns['time'])
+        buf = cls(capacity=max(1, n))
+        for name in cls.FIELDS:
+            buf._cols[name][:n] = np.asarray(columns[name], dtype=cls.DTYPES[name])
+        buf._size = n
+        return buf
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        c = self._cols
+        ex_bid = float(c['executed_bid'][i])
+        ex_ask = float(c['executed_ask'][i])
+        return {
+            'time': int(c['time'][i]),
+            'bid': float(c['bid'][i]),
+            'ask': float(c['ask'][i]),
+            'mid_price': float(c['mid_price'][i]),
+            'inventory': int(c['inventory'][i]),
+            'executed_bid': None if np.isnan(ex_bid) else ex_bid,
+            'executed_ask': None if np.isnan(ex_ask) else ex_ask,
+            'pnl': float(c['pnl'][i]),
+            'sigma': float(c['sigma'][i]),
+        }
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._row(i) for i in range(*idx.indices(self._size))]
+        i = int(idx)
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError('history index out of range')
+        return self._row(i)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._size):
+            yield self._row(i)
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of one column over the recorded steps."""
+        view = self._cols[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def as_arrays(self) -> Dict[str, np.ndarray]:
+        return {name: self.column(name) for name in self.FIELDS}
+
+    def to_frame(self, copy: bool = True) -> pd.DataFrame:
+        """Recorded steps as a DataFrame; `copy=False` wraps the read-only column views instead (no copy)."""
+        if copy:
+            return pd.DataFrame({name: self._cols[name][:self._size].copy() for name in self.FIELDS})
+        return pd.DataFrame(self.as_arrays(), copy=False)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # memoryviews are not picklable; ship only the recorded rows
+        return {'initial_capacity': self._initial_capacity, 'columns': {k: v[:self._size].copy() for k, v in self._cols.items()}}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        cols = state['columns']
+        n = len(cols['time'])
+        self._initial_capacity = state['initial_capacity']
+        self._size = 0
+        self._cols = {}
+        self._allocate(max(self._initial_capacity, n))
+        for name in self.FIELDS:
+            self._cols[name][:n] = cols[name]
+        self._size = n
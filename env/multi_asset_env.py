@@ -1,6 +1,8 @@
 from __future__ import annotations
 import numpy as np
 from typing import List, Dict, Any, Tuple
+from env.fill_table import FillProbabilityTable
+from env.price_paths import PricePath
 
 
 class MultiAssetEnv:
@@ -21,6 +23,7 @@ class MultiAssetEnv:
         market: Dict[str, Any] | None = None,
         execution: Dict[str, Any] | None = None,
         fees: Dict[str, Any] | None = None,
+        price_path: PricePath | None = None,
     ) -> None:
         self.rng = np.random.default_rng(seed)
         self.num_assets = int(num_assets)
@@ -42,6 +45,7 @@ class MultiAssetEnv:
         self._sigma_scale = np.ones(self.num_assets)
 
         execution = execution or {}
+        self._fill_table: FillProbabilityTable | None = None
         self.base_rate = float(execution.get("base_arrival_rate", 1.0))
         self.alpha = float(execution.get("alpha", 1.5))
         self.size_sensitivity = float(execution.get("size_sensitivity", 0.1))
@@ -55,6 +59,41 @@ class MultiAssetEnv:
         self.pnl = 0.0
         self.time = 0
         self.history: List[Dict[str, Any]] = []
+        # Optional precomputed (T, A) market path (see env.price_paths)
+        self.price_path = price_path
+
+    # Execution parameters are properties so the cached fill table is rebuilt when they change
+    @property
+    def base_rate(self) -> float:
+        return self._base_rate
+
+    @base_rate.setter
+    def base_rate(self, value: float) -> None:
+        self._base_rate = float(value)
+        self._fill_table = None
+
+    @property
+    def alpha(self) -> float:
+        return self._alpha
+
+    @alpha.setter
+    def alpha(self, value: float) -> None:
+        self._alpha = float(value)
+        self._fill_table = None
+
+    @property
+    def size_sensitivity(self) -> float:
+        return self._size_sensitivity
+
+    @size_sensitivity.setter
+    def size_sensitivity(self, value: float) -> None:
+        self._size_sensitivity = float(value)
+        self._fill_table = None
+
+    def _get_fill_table(self) -> FillProbabilityTable:
+        if self._fill_table is None:
+            self._fill_table = FillProbabilityTable(self._base_rate, self._alpha, self._size_sensitivity)
+        return self._fill_table
 
     def reset(self) -> None:
         self.mid[:] = self.mu
@@ -79,11 +118,17 @@ class MultiAssetEnv:
         dS = self.kappa * (self.mu - self.mid) * self.dt + sigma * np.sqrt(self.dt) * corr_noise
         self.mid = self.mid + dS
 
+    def _advance_along_path(self) -> None:
+        t = self.time
+        if t >= len(self.price_path):
+            raise IndexError(f"price path exhausted after {len(self.price_path)} steps")
+        self.mid = self.price_path.mid[t].copy()
+        self._sigma_scale = self.price_path.sigma[t].copy()
+
     def _p_fill(self, quote_px: float, mid: float, size: float) -> float:
-        # Distance decay and size penalty
-        dist_ticks = max(0.0, abs(quote_px - mid) / self.tick_size)
-        lam = self.base_rate * np.exp(-self.alpha * dist_ticks) * np.exp(-self.size_sensitivity * max(0.0, size))
-        return float(np.clip(1.0 - np.exp(-lam), 0.0, 1.0))
+        # Scalar counterpart of the vectorized fill probabilities in `step`
+        dist_ticks = abs(quote_px - mid) / self.tick_size
+        return self._get_fill_table().lookup(dist_ticks, max(0.0, size))
 
     def _apply_maker_fee(self, price: float, side: str) -> float:
         fee = price * (self.maker_fee_bps / 1e4)
@@ -91,38 +136,42 @@ class MultiAssetEnv:
 
     def step(
         self,
-        bids: List[List[Tuple[float, float]]],
-        asks: List[List[Tuple[float, float]]],
+        bids: np.ndarray | List[List[Tuple[float, float]]],
+        asks: np.ndarray | List[List[Tuple[float, float]]],
     ) -> Dict[str, Any]:
         """
-        bids, asks: list for each asset of length depth_levels; each entry is (price, size)
+        bids, asks: (num_assets, depth_levels, 2) arrays of (price, size) per asset and level;
+        nested lists of (price, size) tuples are accepted and converted.
         Maker fills: if external order hits our quotes with probability depending on distance and size.
         This env is passive; taker fees would apply if we modeled active crossing.
+        All assets and levels are filled in one vectorized pass; `executed` holds (A, K) arrays
+        of effective fill prices (NaN where a level did not fill) and `bid_fills`/`ask_fills` masks.
         """
-        executed = {"bids": [[None] * self.depth_levels for _ in range(self.num_assets)],
-                    "asks": [[None] * self.depth_levels for _ in range(self.num_assets)]}
-        # Iterate assets and levels
-        for a in range(self.num_assets):
-            for k in range(self.depth_levels):
-                # Ask fill (we sell): maker
-                ask_px, ask_sz = asks[a][k]
-                p_ask = self._p_fill(ask_px, self.mid[a], ask_sz)
-                if self.rng.random() < p_ask and ask_sz > 0:
-                    eff_px = self._apply_maker_fee(ask_px, side="sell")
-                    self.inventory[a] -= int(ask_sz)
-                    self.pnl += eff_px * float(ask_sz)
-                    executed["asks"][a][k] = eff_px
-                # Bid fill (we buy): maker
-                bid_px, bid_sz = bids[a][k]
-                p_bid = self._p_fill(bid_px, self.mid[a], bid_sz)
-                if self.rng.random() < p_bid and bid_sz > 0:
-                    eff_px = self._apply_maker_fee(bid_px, side="buy")
-                    self.inventory[a] += int(bid_sz)
-                    self.pnl -= eff_px * float(bid_sz)
-                    executed["bids"][a][k] = eff_px
-
-        self._update_regime()
-        self._update_mid()
+        # Stack as (side, asset, level, price/size) with side 0 = asks (we sell), 1 = bids (we buy)
+        quotes = np.asarray((asks, bids), dtype=float).reshape(2, self.num_assets, self.depth_levels, 2)
+        px = quotes[..., 0]
+        sz = quotes[..., 1]
+        dist_ticks = np.abs(px - self.mid[:, None]) / self.tick_size
+        # Tabulated for on-grid distances/sizes, exact elsewhere (see `_p_fill` for one quote)
+        p_fill = self._get_fill_table().lookup_array(dist_ticks, sz)
+        fills = (self.rng.random(p_fill.shape) < p_fill) & (sz > 0)
+
+        # Maker fee/rebate: sells receive price - fee, buys pay price + fee
+        fee = self.maker_fee_bps / 1e4
+        eff = px * np.array([1.0 - fee, 1.0 + fee])[:, None, None]
+        units = (np.trunc(sz) * fills).sum(axis=2)
+        cash = (eff * sz * fills).sum(axis=(1, 2))
+        self.inventory += (units[1] - units[0]).astype(int)
+        self.pnl += float(cash[0] - cash[1])
+        executed_px = np.where(fills, eff, np.nan)
+        executed = {"bids": executed_px[1], "asks": executed_px[0]}
+        ask_fills, bid_fills = fills[0], fills[1]
+
+        if self.price_path is None:
+            self._update_regime()
+            self._update_mid()
+        else:
+            self._advance_along_path()
         self.time += 1
         rec = {
             "time": self.time,
@@ -131,6 +180,8 @@ class MultiAssetEnv:
             "pnl": self.pnl,
             "sigma_scale": self._sigma_scale.copy(),
             "executed": executed,
+            "bid_fills": bid_fills,
+            "ask_fills": ask_fills,
         }
         self.history.append(rec)
-        return rec
\ No newline at end of file
+        return rec
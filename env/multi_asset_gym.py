@@ -17,6 +17,8 @@ class MultiAssetGymEnv(gym.Env):
         self.num_assets = int(ma.get("num_assets", 2))
         self.depth_levels = int(ma.get("depth_levels", 2))
         self.level_widen = float(ma.get("level_widen", 0.05))
+        # Extra spread per depth level, shape (K,)
+        self._level_widths = self.level_widen * np.arange(self.depth_levels, dtype=float)
 
         self.env = MultiAssetEnv(
             num_assets=self.num_assets,
@@ -68,30 +70,23 @@ class MultiAssetGymEnv(gym.Env):
         self.step_count = 0
         return self._get_obs(), {}
 
+    def _decode_action(self, action: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Flat action → (A, K, 2) bid and ask ladders of (price, size).
+        Per-asset blocks are [bid_offset, ask_offset, size_1..size_K]; level k quotes
+        mid ∓ (bid_offset + ask_offset + level_widen * k) / 2 with size_k on both sides.
+        """
+        blocks = np.asarray(action, dtype=float).reshape(self.num_assets, 2 + self.depth_levels)
+        half = (blocks[:, 0:1] + blocks[:, 1:2] + self._level_widths) / 2.0
+        sizes = blocks[:, 2:]
+        mid = self.env.mid[:, None]
+        bids = np.stack((mid - half, sizes), axis=-1)
+        asks = np.stack((mid + half, sizes), axis=-1)
+        return bids, asks
+
     def step(self, action: np.ndarray):
         action = np.clip(action, self.action_space.low, self.action_space.high)
-        bids = []
-        asks = []
-        per_asset = 2 + self.depth_levels
-        for a in range(self.num_assets):
-            start = a * per_asset
-            bid_off = float(action[start + 0])
-            ask_off = float(action[start + 1])
-            sizes = action[start + 2 : start + 2 + self.depth_levels]
-            # Construct price ladder per level around mid
-            b_levels = []
-            a_levels = []
-            mid = float(self.env.mid[a])
-            for k in range(self.depth_levels):
-                spread_k = bid_off + ask_off + self.level_widen * k
-                half = spread_k / 2.0
-                b_px = mid - half
-                a_px = mid + half
-                size_k = float(sizes[k])
-                b_levels.append((b_px, size_k))
-                a_levels.append((a_px, size_k))
-            bids.append(b_levels)
-            asks.append(a_levels)
+        bids, asks = self._decode_action(action)
         prev_pnl = self.env.pnl
         self.env.step(bids, asks)
         self.step_count += 1
@@ -0,0 +1,149 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict
+import numpy as np
+
+
+@dataclass
+class PricePath:
+    """
+    Precomputed open-loop market path consumed by the envs in place of their own
+    mid-price simulation. Row t holds the state after step t + 1.
+    - mid: (T,) for SimpleLOBEnv, (T, P) for P independent lanes, (T, A) for MultiAssetEnv
+    - sigma: same shape; OU sigma (single asset) or regime sigma scale (multi-asset)
+    """
+
+    mid: np.ndarray
+    sigma: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.mid.shape[0])
+
+
+def path_seed(seed) -> np.random.SeedSequence:
+    """
+    Seed for the market path of an episode whose env fills are drawn from `seed`.
+    A spawned child of `SeedSequence(seed)`, so the path's regime/noise draws never reuse the
+    env's fill uniforms (`default_rng(seed)`), which would tie fills to regime switches.
+    """
+    return np.random.SeedSequence(seed).spawn(1)[0]
+
+
+def ar1_filter(eps: np.ndarray, phi: float, x0: float | np.ndarray = 0.0) -> np.ndarray:
+    """
+    Solve x_t = phi * x_{t-1} + eps_t along axis 0 without a per-step Python loop.
+    Works blockwise: within a block x_j = phi^j * (x_prev + cumsum(eps_i * phi^-i)),
+    with blocks short enough that phi^-j stays well inside float range.
+    """
+    eps = np.asarray(eps, dtype=float)
+    steps = eps.shape[0]
+    out = np.empty_like(eps)
+    prev = np.broadcast_to(np.asarray(x0, dtype=float), eps.shape[1:]).copy()
+    if steps == 0:
+        return out
+    if phi == 0.0:
+        out[:] = eps
+        return out
+    log_phi = abs(np.log(abs(phi)))
+    block = steps if log_phi == 0.0 else max(1, min(steps, int(np.log(1e8) / log_phi)))
+    trailing = (1,) * (eps.ndim - 1)
+    for start in range(0, steps, block):
+        e = eps[start:start + block]
+        n = e.shape[0]
+        pw = (phi ** np.arange(1, n + 1, dtype=float)).reshape((n,) + trailing)
+        x = pw * (prev + np.cumsum(e / pw, axis=0))
+        out[start:start + n] = x
+        prev = x[-1]
+    return out
+
+
+def _regime_mask(rng: np.random.Generator, shape: tuple, switch_prob: float) -> np.ndarray:
+    # Regime flips on each switch event, so the high-vol state is the running parity of switches
+    switches = rng.random(shape) < switch_prob
+    return (np.cumsum(switches, axis=0) % 2).astype(bool)
+
+
+def _ou_coefficients(kappa: float, dt: float, scheme: str) -> tuple[float, float]:
+    """(phi, noise scale per unit sigma) for the AR(1) form of the OU update."""
+    if scheme == 'euler':
+        # Same update SimpleLOBEnv/MultiAssetEnv apply step by step
+        return 1.0 - kappa * dt, float(np.sqrt(dt))
+    if scheme == 'exact':
+        phi = float(np.exp(-kappa * dt))
+        scale = float(np.sqrt((1.0 - phi ** 2) / (2.0 * kappa))) if kappa > 0 else float(np.sqrt(dt))
+        return phi, scale
+    raise ValueError(f"Unknown OU scheme '{scheme}' (expected 'euler' or 'exact')")
+
+
+def simulate_price_path(
+    steps: int,
+    seed=None,
+    market: Dict[str, Any] | None = None,
+    mid_price: float = 100.0,
+    num_paths: int | None = None,
+    scheme: str = 'euler',
+) -> PricePath:
+    """
+    Whole-episode mid/sigma path with SimpleLOBEnv's market model (OU + vol regime).
+    `num_paths` stacks independent paths as columns, e.g. one per BatchedLOBEnv lane.
+    `scheme='euler'` reproduces the env's per-step update; 'exact' uses the exact OU transition.
+    """
+    rng = np.random.default_rng(seed)
+    market = market or {}
+    ou_cfg = (market.get('ou') or {})
+    mu = float(ou_cfg.get('mu', mid_price))
+    kappa = float(ou_cfg.get('kappa', 0.05))
+    sigma = float(ou_cfg.get('sigma', 0.5))
+    dt = float(ou_cfg.get('dt', 1.0))
+    vr = (market.get('vol_regime') or {})
+    shape = (int(steps),) if num_paths is None else (int(steps), int(num_paths))
+
+    if bool(vr.get('enabled', False)):
+        high = _regime_mask(rng, shape, float(vr.get('switch_prob', 0.0)))
+        sigma_path = np.where(high, float(vr.get('high_sigma', sigma * 2.0)), sigma)
+    else:
+        sigma_path = np.full(shape, sigma)
+
+    if bool(market.get('ou_enabled', True)):
+        phi, scale = _ou_coefficients(kappa, dt, scheme)
+        eps = sigma_path * scale * rng.standard_normal(shape)
+        mid = mu + ar1_filter(eps, phi)
+    else:
+        mid = mu + np.cumsum(rng.uniform(-0.05, 0.05, size=shape), axis=0)
+    return PricePath(mid=mid, sigma=sigma_path)
+
+
+def simulate_multi_asset_path(
+    steps: int,
+    num_assets: int = 2,
+    seed=None,
+    market: Dict[str, Any] | None = None,
+    scheme: str = 'euler',
+) -> PricePath:
+    """Whole-episode correlated mid/sigma-scale path with MultiAssetEnv's market model."""
+    rng = np.random.default_rng(seed)
+    market = market or {}
+    ou = market.get('ou') or {}
+    mu = float(ou.get('mu', 100.0))
+    kappa = float(ou.get('kappa', 0.05))
+    dt = float(ou.get('dt', 1.0))
+    sigma_vec = np.array(ou.get('sigma_vec', [0.5] * num_assets), dtype=float)
+    corr = market.get('correlation')
+    corr = np.eye(num_assets) if corr is None else np.array(corr, dtype=float)
+    chol = np.linalg.cholesky(corr + 1e-12 * np.eye(num_assets))
+    vr = market.get('vol_regime', {'enabled': True, 'high_sigma_scale': 3.0, 'switch_prob': 0.02}) or {}
+    steps = int(steps)
+
+    # One regime shared by all assets
+    if vr.get('enabled', False):
+        high = _regime_mask(rng, (steps,), float(vr.get('switch_prob', 0.02)))
+        scale = np.where(high, float(vr.get('high_sigma_scale', 3.0)), 1.0)
+    else:
+        scale = np.ones(steps)
+    sigma_scale = np.repeat(scale[:, None], num_assets, axis=1)
+
+    phi, noise_scale = _ou_coefficients(kappa, dt, scheme)
+    z = rng.standard_normal((steps, num_assets)) @ chol.T
+    eps = sigma_vec * sigma_scale * noise_scale * z
+    mid = mu + ar1_filter(eps, phi)
+    return PricePath(mid=mid, sigma=sigma_scale)
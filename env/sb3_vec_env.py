@@ -0,0 +1,71 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence
+import numpy as np
+
+# Optional: Stable-Baselines3 VecEnv base
+try:
+    from stable_baselines3.common.vec_env.base_vec_env import VecEnv as _SB3VecEnv  # type: ignore
+except Exception:  # pragma: no cover
+    _SB3VecEnv = None  # type: ignore
+
+
+if _SB3VecEnv is not None:
+
+    class SB3VecEnvAdapter(_SB3VecEnv):
+        """
+        Stable-Baselines3 `VecEnv` plumbing shared by the vector env adapters.
+        Subclasses provide a same-step-autoreset backend:
+        - `_backend_reset(seed)` -> obs; lane i is seeded from `seed + i`
+        - `_backend_step(actions)` -> (obs, rewards, terminated, truncated, final_obs, infos)
+        - `_call_lanes(name, indices, args, kwargs)` for `env_method` (default: the adapter's own
+          method, called once and reported for every lane)
+        """
+
+        _actions = None
+
+        def reset(self):
+            seed = self._seeds[0] if getattr(self, "_seeds", None) and self._seeds[0] is not None else None
+            obs = self._backend_reset(seed)
+            if hasattr(self, "_reset_seeds"):
+                self._reset_seeds()
+            return obs
+
+        def step_async(self, actions) -> None:
+            self._actions = actions
+
+        def step_wait(self):
+            obs, rewards, terminated, truncated, final_obs, infos = self._backend_step(self._actions)
+            dones = terminated | truncated
+            for i in np.flatnonzero(dones):
+                infos[i]["terminal_observation"] = final_obs[i]
+                infos[i]["TimeLimit.truncated"] = bool(truncated[i] and not terminated[i])
+            return obs, rewards.astype(np.float32), dones, infos
+
+        def get_attr(self, attr_name: str, indices=None):
+            return [getattr(self, attr_name)] * len(self._get_indices(indices))
+
+        def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+            setattr(self, attr_name, value)
+
+        def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+            indices = list(self._get_indices(indices))
+            if method_name == "seed":
+                # Same convention as DummyVecEnv: lane i gets seed + i, applied on the next reset
+                seed = method_args[0] if method_args else method_kwargs.get("seed")
+                self._seeds = [None if seed is None else int(seed) + i for i in range(self.num_envs)]
+                return [self._seeds[i] for i in indices]
+            if method_name == "render":
+                # The market-making envs have no render modes (gymnasium returns None)
+                return [None] * len(indices)
+            return self._call_lanes(method_name, indices, method_args, method_kwargs)
+
+        def _call_lanes(self, name: str, indices: Sequence[int], args: tuple, kwargs: Dict[str, Any]) -> List[Any]:
+            # Lanes are not separate objects: call the adapter's method once for all of them
+            result = getattr(self, name)(*args, **kwargs)
+            return [result] * len(indices)
+
+        def env_is_wrapped(self, wrapper_class, indices=None):
+            return [False] * len(self._get_indices(indices))
+
+else:  # pragma: no cover
+    SB3VecEnvAdapter = None  # type: ignore
@@ -0,0 +1,222 @@
+from __future__ import annotations
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Sequence
+import multiprocessing as mp
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector.utils import batch_space
+from env.sb3_vec_env import SB3VecEnvAdapter
+
+
+def _buffer_specs(num_envs: int, obs_space: gym.spaces.Box, act_space: gym.spaces.Box) -> Dict[str, tuple]:
+    n = int(num_envs)
+    return {
+        "obs": ((n,) + obs_space.shape, obs_space.dtype),
+        "final_obs": ((n,) + obs_space.shape, obs_space.dtype),
+        "actions": ((n,) + act_space.shape, act_space.dtype),
+        "rewards": ((n,), np.float64),
+        "terminated": ((n,), np.bool_),
+        "truncated": ((n,), np.bool_),
+    }
+
+
+def _attach(names: Dict[str, str], specs: Dict[str, tuple]):
+    blocks = {k: shared_memory.SharedMemory(name=names[k]) for k in specs}
+    arrays = {k: np.ndarray(specs[k][0], dtype=specs[k][1], buffer=blocks[k].buf) for k in specs}
+    return blocks, arrays
+
+
+def _worker(conn, env_fn: Callable[[], gym.Env], start: int, count: int, names: Dict[str, str], specs: Dict[str, tuple]):
+    """Host lanes [start, start + count); read actions from and write results to shared memory."""
+    blocks, arrays = _attach(names, specs)
+    lanes = slice(start, start + count)
+    obs, final_obs, actions = arrays["obs"][lanes], arrays["final_obs"][lanes], arrays["actions"][lanes]
+    rewards, terminated, truncated = arrays["rewards"][lanes], arrays["terminated"][lanes], arrays["truncated"][lanes]
+    envs = [env_fn() for _ in range(count)]
+    try:
+        while True:
+            cmd = conn.recv()
+            if cmd == "step":
+                for i, env in enumerate(envs):
+                    o, r, te, tr, _ = env.step(actions[i])
+                    rewards[i], terminated[i], truncated[i] = r, te, tr
+                    if te or tr:
+                        final_obs[i] = o
+                        o, _ = env.reset()
+                    obs[i] = o
+                conn.send("ok")
+            elif cmd == "reset":
+                seed = conn.recv()
+                for i, env in enumerate(envs):
+                    obs[i], _ = env.reset(seed=None if seed is None else seed + start + i)
+                terminated[:] = False
+                truncated[:] = False
+                conn.send("ok")
+            elif cmd == "call":
+                name, args, kwargs, local = conn.recv()
+                try:
+                    out = []
+                    for i in local:
+                        attr = getattr(envs[i], name)
+                        out.append(attr(*args, **kwargs) if callable(attr) else attr)
+                    conn.send(("ok", out))
+                except Exception as e:
+                    conn.send(("error", repr(e)))
+            elif cmd == "close":
+                break
+    finally:
+        for env in envs:
+            env.close()
+        del obs, final_obs, actions, rewards, terminated, truncated, arrays
+        for b in blocks.values():
+            b.close()
+        conn.close()
+
+
+class SharedMemoryVecEnv(gym.vector.VectorEnv):
+    """
+    `gymnasium.vector.VectorEnv` that steps `num_workers * envs_per_worker` envs in worker processes.
+    - Observations, final observations, actions, rewards and done flags live in
+      `multiprocessing.shared_memory` arrays; pipes only carry short command strings
+    - Each worker steps its slice of lanes and auto-resets finished ones (same step)
+    - `env_fn` must be picklable (e.g. `functools.partial(MarketMakingGymEnv, cfg)`)
+    Lane i is reset with `seed + i`, so lanes differ even when the env config fixes a seed.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": gym.vector.AutoresetMode.SAME_STEP}
+
+    def __init__(self, env_fn: Callable[[], gym.Env], num_workers: int = 2, envs_per_worker: int = 1,
+                 seed: int | None = None, start_method: str | None = None):
+        self.num_workers = max(1, int(num_workers))
+        self.envs_per_worker = max(1, int(envs_per_worker))
+        self.num_envs = self.num_workers * self.envs_per_worker
+        self._seed = seed
+
+        probe = env_fn()
+        self.single_observation_space = probe.observation_space
+        self.single_action_space = probe.action_space
+        probe.close()
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+        specs = _buffer_specs(self.num_envs, self.single_observation_space, self.single_action_space)
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        for k, (shape, dtype) in specs.items():
+            nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            self._blocks[k] = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._arrays = {k: np.ndarray(specs[k][0], dtype=specs[k][1], buffer=self._blocks[k].buf) for k in specs}
+        names = {k: b.name for k, b in self._blocks.items()}
+
+        ctx = mp.get_context(start_method)
+        self._conns = []
+        self._procs: List[mp.Process] = []
+        for w in range(self.num_workers):
+            parent, child = ctx.Pipe()
+            p = ctx.Process(target=_worker, args=(child, env_fn, w * self.envs_per_worker, self.envs_per_worker, names, specs), daemon=True)
+            p.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(p)
+        self.closed = False
+
+    def _broadcast(self, *messages) -> None:
+        try:
+            for conn in self._conns:
+                for m in messages:
+                    conn.send(m)
+            replies = [conn.recv() for conn in self._conns]
+        except (EOFError, OSError) as e:
+            self.close()
+            raise RuntimeError("SharedMemoryVecEnv worker died") from e
+        if any(r != "ok" for r in replies):
+            raise RuntimeError("SharedMemoryVecEnv worker failed")
+
+    def reset(self, *, seed: int | None = None, options: dict | None = None):
+        if seed is None:
+            seed, self._seed = self._seed, None
+        self._broadcast("reset", seed)
+        return self._arrays["obs"].copy(), {}
+
+    def step(self, actions):
+        a = self._arrays
+        a["actions"][:] = np.asarray(actions, dtype=a["actions"].dtype).reshape(a["actions"].shape)
+        self._broadcast("step")
+        terminated, truncated = a["terminated"].copy(), a["truncated"].copy()
+        info: Dict[str, Any] = {}
+        done = terminated | truncated
+        if done.any():
+            final = np.full(self.num_envs, None, dtype=object)
+            for i in np.flatnonzero(done):
+                final[i] = a["final_obs"][i].copy()
+            info = {"final_obs": final, "_final_obs": done}
+        return a["obs"].copy(), a["rewards"].copy(), terminated, truncated, info
+
+    def call(self, name: str, *args, indices: Sequence[int] | None = None, **kwargs) -> tuple:
+        """Call method `name` (or read attribute `name`) on the envs of the given lanes, in the workers."""
+        lanes = list(range(self.num_envs)) if indices is None else [int(i) for i in indices]
+        per_worker: Dict[int, List[int]] = {}
+        for lane in lanes:
+            per_worker.setdefault(lane // self.envs_per_worker, []).append(lane % self.envs_per_worker)
+        results: Dict[int, Any] = {}
+        try:
+            for w, local in per_worker.items():
+                self._conns[w].send("call")
+                self._conns[w].send((name, args, kwargs, local))
+            for w, local in per_worker.items():
+                status, out = self._conns[w].recv()
+                if status != "ok":
+                    raise RuntimeError(f"SharedMemoryVecEnv call {name!r} failed in worker {w}: {out}")
+                for i, value in zip(local, out):
+                    results[w * self.envs_per_worker + i] = value
+        except (EOFError, OSError) as e:
+            self.close()
+            raise RuntimeError("SharedMemoryVecEnv worker died") from e
+        return tuple(results[lane] for lane in lanes)
+
+    def close_extras(self, **kwargs) -> None:
+        if self.closed:
+            return
+        for conn in self._conns:
+            try:
+                conn.send("close")
+            except (BrokenPipeError, OSError):
+                pass
+        for p in self._procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self._arrays = {}
+        for b in self._blocks.values():
+            b.close()
+            b.unlink()
+        self.closed = True
+
+
+if SB3VecEnvAdapter is not None:
+
+    class SB3SharedMemoryVecEnv(SB3VecEnvAdapter):
+        """Stable-Baselines3 `VecEnv` view of a SharedMemoryVecEnv (drop-in for SubprocVecEnv)."""
+
+        def __init__(self, env_fn: Callable[[], gym.Env], num_workers: int = 2, envs_per_worker: int = 1,
+                     seed: int | None = None, start_method: str | None = None):
+            self.venv = SharedMemoryVecEnv(env_fn, num_workers, envs_per_worker, seed=seed, start_method=start_method)
+            SB3VecEnvAdapter.__init__(self, self.venv.num_envs, self.venv.single_observation_space, self.venv.single_action_space)
+
+        def _backend_reset(self, seed):
+            obs, _ = self.venv.reset(seed=seed)
+            return obs
+
+        def _backend_step(self, actions):
+            obs, rewards, terminated, truncated, info = self.venv.step(actions)
+            infos: List[Dict[str, Any]] = [{} for _ in range(self.num_envs)]
+            return obs, rewards, terminated, truncated, info.get("final_obs"), infos
+
+        def _call_lanes(self, name: str, indices: Sequence[int], args: tuple, kwargs: Dict[str, Any]) -> List[Any]:
+            # Each lane is a real env in a worker process
+            return list(self.venv.call(name, *args, indices=indices, **kwargs))
+
+        def close(self) -> None:
+            self.venv.close()
+
+else:  # pragma: no cover
+    SB3SharedMemoryVecEnv = None  # type: ignore
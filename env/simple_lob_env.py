@@ -1,10 +1,17 @@
 import numpy as np
+from env.fill_table import FillProbabilityTable
+from env.history import HistoryBuffer
+from env.price_paths import PricePath
+from utils.rng import make_rng
 
 
 class SimpleLOBEnv:
     def __init__(self, mid_price=100.0, tick_size=0.01, max_inventory=10, seed: int | None = None,
-                 market: dict | None = None, execution: dict | None = None, fees: dict | None = None):
-        self.rng = np.random.default_rng(seed)
+                 market: dict | None = None, execution: dict | None = None, fees: dict | None = None,
+                 simulation: dict | None = None, price_path: PricePath | None = None, record_history: bool = True):
+        # Optional block-drawn RNG (simulation.rng_block_size > 0) for the per-step scalar draws
+        simulation = simulation or {}
+        self.rng = make_rng(seed, int(simulation.get('rng_block_size', 0) or 0))
 
         # Core state
         self.tick_size = float(tick_size)
@@ -12,7 +19,9 @@ class SimpleLOBEnv:
         self.time = 0
         self.inventory = 0
         self.pnl = 0.0
-        self.history = []
+        self.history = HistoryBuffer()
+        # Sweeps that only need summary metrics can skip the per-step history (constant memory)
+        self.record_history = bool(record_history)
 
         # Market model config
         market = market or {}
@@ -31,6 +40,7 @@ class SimpleLOBEnv:
 
         # Execution model
         execution = execution or {}
+        self._fill_table = None
         self.exec_base_rate = float(execution.get('base_arrival_rate', 1.0))
         self.exec_alpha = float(execution.get('alpha', 1.5))
 
@@ -42,11 +52,42 @@ class SimpleLOBEnv:
         # Initialize mid
         self.mid_price = float(self.ou_mu)
 
+        # Optional precomputed market path (see env.price_paths); replaces the in-loop OU/regime simulation
+        self.set_price_path(price_path)
+
+    def set_price_path(self, price_path: PricePath | None) -> None:
+        self.price_path = price_path
+        if price_path is not None:
+            if price_path.mid.ndim != 1:
+                raise ValueError("SimpleLOBEnv needs a single (T,) price path")
+            # Python lists index faster than ndarrays in the per-step loop
+            self._path_mid = price_path.mid.tolist()
+            self._path_sigma = price_path.sigma.tolist()
+
+    # Execution parameters are properties so the cached fill table is rebuilt when they change
+    @property
+    def exec_base_rate(self) -> float:
+        return self._exec_base_rate
+
+    @exec_base_rate.setter
+    def exec_base_rate(self, value: float) -> None:
+        self._exec_base_rate = float(value)
+        self._fill_table = None
+
+    @property
+    def exec_alpha(self) -> float:
+        return self._exec_alpha
+
+    @exec_alpha.setter
+    def exec_alpha(self, value: float) -> None:
+        self._exec_alpha = float(value)
+        self._fill_table = None
+
     def reset(self):
         self.time = 0
         self.inventory = 0
         self.pnl = 0.0
-        self.history = []
+        self.history.clear()
         self._current_sigma = self.ou_sigma
         self.mid_price = float(self.ou_mu)
 
@@ -64,11 +105,19 @@ class SimpleLOBEnv:
         else:
             self.mid_price += float(self.rng.uniform(-0.05, 0.05))
 
+    def _advance_along_path(self):
+        t = self.time
+        if t >= len(self._path_mid):
+            raise IndexError(f"price path exhausted after {len(self._path_mid)} steps")
+        self.mid_price = self._path_mid[t]
+        self._current_sigma = self._path_sigma[t]
+
     def _fill_probability(self, quote_price: float, side: str) -> float:
-        dist_ticks = max(0.0, abs(quote_price - self.mid_price) / self.tick_size)
-        lam = self.exec_base_rate * np.exp(-self.exec_alpha * dist_ticks)
-        p_fill = 1.0 - np.exp(-lam)
-        return float(np.clip(p_fill, 0.0, 1.0))
+        dist_ticks = abs(quote_price - self.mid_price) / self.tick_size
+        table = self._fill_table
+        if table is None:
+            table = self._fill_table = FillProbabilityTable(self._exec_base_rate, self._exec_alpha)
+        return table.lookup(dist_ticks)
 
     def _apply_fees_slippage(self, price: float, side: str) -> float:
         slip = price * (self.slippage_bps / 1e4)
@@ -109,11 +158,18 @@ class SimpleLOBEnv:
                 self.pnl -= px
                 executed_price_bid = px
 
-        self._update_vol_regime()
-        self._update_mid_price()
+        if self.price_path is None:
+            self._update_vol_regime()
+            self._update_mid_price()
+        else:
+            self._advance_along_path()
         self.time += 1
 
-        self.history.append({
+        if self.record_history:
+            self.history.append(self.time, bid_quote, ask_quote, self.mid_price, self.inventory,
+                                executed_price_bid, executed_price_ask, self.pnl, self._current_sigma)
+
+        return {
             'time': self.time,
             'bid': bid_quote,
             'ask': ask_quote,
@@ -123,9 +179,7 @@ class SimpleLOBEnv:
             'executed_ask': executed_price_ask,
             'pnl': self.pnl,
             'sigma': self._current_sigma
-        })
-
-        return self.history[-1]
+        }
     
     # --- Data-driven stepping support ---
     def step_from_tick(self, tick: dict) -> dict:
@@ -139,7 +193,10 @@ class SimpleLOBEnv:
         self.mid_price = float(tick.get('mid_price', self.mid_price))
         bid = float(tick.get('best_bid', self.mid_price - self.tick_size))
         ask = float(tick.get('best_ask', self.mid_price + self.tick_size))
-        self.history.append({
+        if self.record_history:
+            self.history.append(self.time, bid, ask, self.mid_price, self.inventory,
+                                None, None, self.pnl, self._current_sigma)
+        return {
             'time': self.time,
             'bid': bid,
             'ask': ask,
@@ -149,8 +206,7 @@ class SimpleLOBEnv:
             'executed_ask': None,
             'pnl': self.pnl,
             'sigma': self._current_sigma
-        })
-        return self.history[-1]
+        }
     
 
 
@@ -0,0 +1,128 @@
+from __future__ import annotations
+from typing import Any, Dict
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector.utils import batch_space
+from env.batched_lob_env import BatchedLOBEnv
+from env.sb3_vec_env import SB3VecEnvAdapter
+
+
+OBS_LOW = -np.array([1e9, 100.0, 10.0], dtype=np.float32)
+OBS_HIGH = np.array([1e9, 100.0, 10.0], dtype=np.float32)
+ACTION_LOW = np.array([0.0, 0.0], dtype=np.float32)
+ACTION_HIGH = np.array([0.5, 0.5], dtype=np.float32)
+
+
+class _BatchedMarketMaking:
+    """
+    MarketMakingGymEnv dynamics for N lanes held in one BatchedLOBEnv.
+    - action (N, 2) = [bid_offset, ask_offset], clipped to the single-env action space
+    - reward = pnl delta - 0.01 * |inventory|, per lane
+    - lanes truncate after `steps` and are reset in place (same step)
+    """
+
+    def __init__(self, cfg: dict | None, num_envs: int):
+        self._base_cfg = dict(cfg or {})
+        self.num_envs = int(num_envs)
+        self.max_steps = int(self._base_cfg.get("steps", 1000))
+        self.env = self._make_env(self._base_cfg.get("seed"))
+
+    def _make_env(self, seed):
+        cfg = self._base_cfg
+        return BatchedLOBEnv(
+            num_envs=self.num_envs,
+            seed=seed,
+            market=cfg.get("market"),
+            execution=cfg.get("execution"),
+            fees=cfg.get("fees"),
+        )
+
+    def _obs(self) -> np.ndarray:
+        return np.stack([self.env.mid_price, self.env.inventory, self.env._current_sigma], axis=1).astype(np.float32)
+
+    def _reset(self, seed: int | None = None) -> np.ndarray:
+        if seed is not None:
+            self.env = self._make_env(seed)
+        self.env.reset()
+        return self._obs()
+
+    def _step(self, actions):
+        actions = np.clip(np.asarray(actions, dtype=float).reshape(self.num_envs, 2), ACTION_LOW, ACTION_HIGH)
+        mid = self.env.mid_price
+        prev_pnl = self.env.pnl.copy()
+        self.env.step(mid - actions[:, 0], mid + actions[:, 1])
+        rewards = (self.env.pnl - prev_pnl) - 0.01 * np.abs(self.env.inventory)
+        obs = self._obs()
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        truncated = self.env.time >= self.max_steps
+        info = {"inventory": self.env.inventory.copy(), "pnl": self.env.pnl.copy()}
+        final_obs = None
+        if truncated.any():
+            final_obs = obs.copy()
+            self.env.reset(truncated)
+            obs = self._obs()
+        return obs, rewards, terminated, truncated, info, final_obs
+
+
+class MarketMakingVectorEnv(gym.vector.VectorEnv, _BatchedMarketMaking):
+    """
+    Native `gymnasium.vector.VectorEnv` equivalent of N `MarketMakingGymEnv`s.
+    Same-step autoreset: finished lanes report `final_obs`/`final_info` in `info`
+    and the returned observation is already the reset one.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": gym.vector.AutoresetMode.SAME_STEP}
+
+    def __init__(self, cfg: dict | None = None, num_envs: int = 8):
+        _BatchedMarketMaking.__init__(self, cfg, num_envs)
+        self.single_observation_space = spaces.Box(low=OBS_LOW, high=OBS_HIGH, dtype=np.float32)
+        self.single_action_space = spaces.Box(low=ACTION_LOW, high=ACTION_HIGH, dtype=np.float32)
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+    def reset(self, *, seed: int | None = None, options: dict | None = None):
+        return self._reset(seed), {}
+
+    def step(self, actions):
+        obs, rewards, terminated, truncated, info, final_obs = self._step(actions)
+        lanes = np.ones(self.num_envs, dtype=bool)
+        info = {**info, "_inventory": lanes, "_pnl": lanes}
+        if final_obs is not None:
+            done = terminated | truncated
+            final = np.full(self.num_envs, None, dtype=object)
+            final_info = np.full(self.num_envs, None, dtype=object)
+            for i in np.flatnonzero(done):
+                final[i] = final_obs[i]
+                final_info[i] = {"inventory": info["inventory"][i], "pnl": info["pnl"][i]}
+            info.update({"final_obs": final, "_final_obs": done, "final_info": final_info, "_final_info": done})
+        return obs, rewards, terminated, truncated, info
+
+
+if SB3VecEnvAdapter is not None:
+
+    class MarketMakingSB3VecEnv(SB3VecEnvAdapter, _BatchedMarketMaking):
+        """Stable-Baselines3 `VecEnv` over the same batched dynamics (drop-in for DummyVecEnv)."""
+
+        def __init__(self, cfg: dict | None = None, num_envs: int = 8):
+            _BatchedMarketMaking.__init__(self, cfg, num_envs)
+            SB3VecEnvAdapter.__init__(
+                self,
+                self.num_envs,
+                spaces.Box(low=OBS_LOW, high=OBS_HIGH, dtype=np.float32),
+                spaces.Box(low=ACTION_LOW, high=ACTION_HIGH, dtype=np.float32),
+            )
+
+        def _backend_reset(self, seed):
+            return self._reset(seed)
+
+        def _backend_step(self, actions):
+            obs, rewards, terminated, truncated, info, final_obs = self._step(actions)
+            infos = [{"inventory": int(inv), "pnl": float(p)} for inv, p in zip(info["inventory"], info["pnl"])]
+            return obs, rewards, terminated, truncated, final_obs, infos
+
+        def close(self) -> None:
+            pass
+
+else:  # pragma: no cover
+    MarketMakingSB3VecEnv = None  # type: ignore
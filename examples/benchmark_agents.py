@@ -15,7 +15,7 @@ def run_agent(agent, cfg, steps):
     for _ in range(steps):
         bid, ask = agent.quote(env.mid_price, env.inventory)
         env.step(bid, ask)
-    df = pd.DataFrame(env.history)
+    df = env.history.to_frame()
     returns = df['pnl'].diff().fillna(0.0).values
     return {
         'final_pnl': float(df['pnl'].iloc[-1]),
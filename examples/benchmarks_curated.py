@@ -4,39 +4,19 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
-from env.simple_lob_env import SimpleLOBEnv
+from env.price_paths import path_seed, simulate_price_path
 from agents.naive_mm import NaiveMarketMaker
 from agents.inventory_mm import InventoryAwareMarketMaker
 from agents.avellaneda_stoikov import AvellanedaStoikovMM
 from agents.mean_reversion_mm import MeanReversionMarketMaker
 from agents.momentum_mm import MomentumMarketMaker
-from utils.metrics import sharpe, hit_rate
-
-
-def run(env_cfg: dict, agent) -> dict:
-    env = SimpleLOBEnv(
-        seed=env_cfg['seed'], market=env_cfg['market'], execution=env_cfg['execution'], fees=env_cfg['fees']
-    )
-    steps = env_cfg['steps']
-    for _ in range(steps):
-        bid, ask = agent.quote(env.mid_price, env.inventory)
-        env.step(bid, ask)
-    df = pd.DataFrame(env.history)
-    ret = df['pnl'].diff().fillna(0.0).values
-    return {
-        'final_pnl': float(df['pnl'].iloc[-1]),
-        'sharpe': float(sharpe(ret)),
-        'hit_rate': float(hit_rate(ret)),
-    }
+from experiments.lockstep import evaluate_lockstep
 
 
-def best_of(env_cfg: dict, build_agents):
-    best = None
-    for agent in build_agents():
-        r = run(env_cfg, agent)
-        if best is None or r['sharpe'] > best['sharpe']:
-            best = r
-    return best
+def best_of(results: dict, family: str):
+    """Highest-Sharpe result among the agents named `<family>/<i>`."""
+    rows = [r for name, r in results.items() if name.split('/')[0] == family]
+    return max(rows, key=lambda r: r['sharpe'])
 
 
 def main():
@@ -76,13 +56,12 @@ def main():
             for bias in [0.02, 0.05]:
                 yield MomentumMarketMaker(spread=0.10, window=w, bias=bias)
 
-    results = {
-        'Naive': best_of(cfg, naive_grid),
-        'Inventory': best_of(cfg, inv_grid),
-        'A-S': best_of(cfg, as_grid),
-        'MeanRev': best_of(cfg, mr_grid),
-        'Momentum': best_of(cfg, mom_grid),
-    }
+    grids = {'Naive': naive_grid, 'Inventory': inv_grid, 'A-S': as_grid, 'MeanRev': mr_grid, 'Momentum': mom_grid}
+    agents = {f'{family}/{i}': agent for family, grid in grids.items() for i, agent in enumerate(grid())}
+    # Every agent and grid cell trades in lockstep against the same precomputed market path
+    path = simulate_price_path(cfg['steps'], seed=path_seed(cfg['seed']), market=cfg['market'])
+    all_results = evaluate_lockstep(cfg, agents, cfg['steps'], price_path=path)
+    results = {family: best_of(all_results, family) for family in grids}
 
     out_dir = Path('docs/assets')
     out_dir.mkdir(parents=True, exist_ok=True)
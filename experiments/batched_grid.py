@@ -0,0 +1,72 @@
+from __future__ import annotations
+import warnings
+import numpy as np
+
+from env.batched_lob_env import BatchedLOBEnv
+from env.price_paths import path_seed, simulate_price_path
+from utils.cache import cache_key
+from utils.metrics import sharpe, max_drawdown, hit_rate
+
+
+def run_batched_grid(spreads, sensitivities, alphas, steps=1000, seed=None, market=None, execution=None, fees=None,
+                     simulation=None, cache=None):
+    """
+    Whole grid as one BatchedLOBEnv episode: lane i quotes with (spreads[i], sensitivities[i])
+    under execution alpha alphas[i]. All lanes replay the market path the pool engine's cells
+    replay (`path_seed(seed)`); fills are drawn independently per lane from one shared generator.
+    Returns rows with the same keys as `run_simulation`. The fill draws differ from the pool
+    engine's per-cell streams, so the two engines agree in distribution, not cell by cell.
+    A lane's draws depend on the whole grid, so the cache holds the grid as one entry.
+    """
+    if int((simulation or {}).get('rng_block_size', 0) or 0) > 0:
+        warnings.warn("the batched grid engine ignores simulation.rng_block_size", stacklevel=2)
+    if seed is None:
+        cache = None  # unseeded episodes are not reproducible, so never memoized
+    if cache is not None:
+        key = cache_key(kind='grid_inventory_mm_batched', spreads=list(spreads), sensitivities=list(sensitivities),
+                        alphas=list(alphas), steps=steps, seed=seed, market=market, execution=execution, fees=fees)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit['rows']
+    spreads = np.asarray(spreads, dtype=float)
+    sensitivities = np.asarray(sensitivities, dtype=float)
+    alphas = np.asarray(alphas, dtype=float)
+    n = len(spreads)
+    exec_cfg = dict(execution or {})
+    exec_cfg['alpha'] = alphas
+    path = simulate_price_path(steps, seed=path_seed(seed), market=market)
+    env = BatchedLOBEnv(num_envs=n, seed=seed, market=market, execution=exec_cfg, fees=fees, price_path=path)
+
+    pnl = np.empty((steps, n))
+    inventory = np.empty((steps, n), dtype=np.int64)
+    trades = np.zeros(n, dtype=np.int64)
+    half = spreads / 2.0
+    for t in range(steps):
+        # InventoryAwareMarketMaker.quote for every lane at once
+        skew = sensitivities * env.inventory
+        rec = env.step(env.mid_price - half + skew, env.mid_price + half - skew)
+        pnl[t] = rec['pnl']
+        inventory[t] = rec['inventory']
+        trades += ~np.isnan(rec['executed_bid'])
+        trades += ~np.isnan(rec['executed_ask'])
+
+    returns = np.diff(pnl, axis=0, prepend=pnl[:1])
+    std_inventory = inventory.std(axis=0, ddof=1) if steps > 1 else np.full(n, np.nan)
+    rows = []
+    for i in range(n):
+        rows.append({
+            'spread': float(spreads[i]),
+            'sensitivity': float(sensitivities[i]),
+            'alpha': float(alphas[i]),
+            'final_pnl': float(pnl[-1, i]),
+            'final_inventory': int(inventory[-1, i]),
+            'std_inventory': float(std_inventory[i]),
+            'sharpe': sharpe(returns[:, i]),
+            'max_drawdown': max_drawdown(pnl[:, i]),
+            'hit_rate': hit_rate(returns[:, i]),
+            'trades': int(trades[i]),
+            'fill_rate': float(trades[i]) / float(steps),
+        })
+    if cache is not None:
+        cache.put(key, {'rows': rows})
+    return rows
@@ -5,10 +5,13 @@ import yaml
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import mlflow
-from env.simple_lob_env import SimpleLOBEnv
+from env.price_paths import path_seed, simulate_price_path
 from agents.inventory_mm import InventoryAwareMarketMaker
 from utils.metrics import sharpe, max_drawdown, hit_rate
+from utils.cache import get_cache
+from utils.tracking import get_tracker
+from experiments.lockstep import evaluate_lockstep
+from experiments.monte_carlo import run_monte_carlo, summarize, save_summary
 from stable_baselines3 import PPO
 from env.gym_env import MarketMakingGymEnv
 from agents.naive_mm import NaiveMarketMaker
@@ -17,14 +20,8 @@ from agents.mean_reversion_mm import MeanReversionMarketMaker
 from agents.momentum_mm import MomentumMarketMaker
 
 
-def evaluate_rule_based(cfg: dict, steps: int) -> dict:
-    env = SimpleLOBEnv(seed=cfg.get('seed'), market=cfg.get('market'), execution=cfg.get('execution'), fees=cfg.get('fees'))
-    agent_cfg = cfg.get('agent', {})
-    agent = InventoryAwareMarketMaker(spread=agent_cfg.get('spread', 0.1), inventory_sensitivity=agent_cfg.get('inventory_sensitivity', 0.05))
-    for _ in range(steps):
-        bid, ask = agent.quote(env.mid_price, env.inventory)
-        env.step(bid, ask)
-    df = pd.DataFrame(env.history)
+def _history_metrics(hist) -> dict:
+    df = hist.to_frame()
     returns = df['pnl'].diff().fillna(0.0).values
     return {
         'final_pnl': float(df['pnl'].iloc[-1]),
@@ -35,6 +32,19 @@ def evaluate_rule_based(cfg: dict, steps: int) -> dict:
     }
 
 
+def rule_based_agents(cfg: dict) -> dict:
+    """Benchmark agents built from the config, keyed by the prefix used for their MLflow metrics."""
+    agent_cfg = cfg.get('agent', {})
+    as_cfg = cfg.get('avellaneda', { 'risk_aversion': 0.1, 'base_spread': 0.1, 'inv_penalty': 0.05 })
+    return {
+        'naive': NaiveMarketMaker(spread=agent_cfg.get('spread', 0.1)),
+        'rb': InventoryAwareMarketMaker(spread=agent_cfg.get('spread', 0.1), inventory_sensitivity=agent_cfg.get('inventory_sensitivity', 0.05)),
+        'as': AvellanedaStoikovMM(**as_cfg),
+        'mr': MeanReversionMarketMaker(target_spread=agent_cfg.get('spread', 0.1), kappa=0.1, skew_sensitivity=0.05),
+        'mom': MomentumMarketMaker(spread=agent_cfg.get('spread', 0.12), window=20, bias=0.05),
+    }
+
+
 def evaluate_ppo(cfg: dict, steps: int, model_path: str) -> dict:
     env = MarketMakingGymEnv(cfg)
     model = PPO.load(model_path)
@@ -45,87 +55,10 @@ def evaluate_ppo(cfg: dict, steps: int, model_path: str) -> dict:
         if terminated or truncated:
             break
     # Extract metrics from underlying env
-    hist = getattr(env.env, 'history', [])
+    hist = env.env.history
     if not hist:
         return {'final_pnl': 0.0, 'std_inventory': 0.0, 'sharpe': 0.0, 'max_drawdown': 0.0, 'hit_rate': 0.0}
-    df = pd.DataFrame(hist)
-    returns = df['pnl'].diff().fillna(0.0).values
-    return {
-        'final_pnl': float(df['pnl'].iloc[-1]),
-        'std_inventory': float(df['inventory'].std()),
-        'sharpe': sharpe(returns),
-        'max_drawdown': max_drawdown(df['pnl'].values),
-        'hit_rate': hit_rate(returns),
-    }
-
-
-def evaluate_naive(cfg: dict, steps: int) -> dict:
-    env = SimpleLOBEnv(seed=cfg.get('seed'), market=cfg.get('market'), execution=cfg.get('execution'), fees=cfg.get('fees'))
-    agent = NaiveMarketMaker(spread=cfg.get('agent', {}).get('spread', 0.1))
-    for _ in range(steps):
-        bid, ask = agent.quote(env.mid_price, env.inventory)
-        env.step(bid, ask)
-    df = pd.DataFrame(env.history)
-    returns = df['pnl'].diff().fillna(0.0).values
-    return {
-        'final_pnl': float(df['pnl'].iloc[-1]),
-        'std_inventory': float(df['inventory'].std()),
-        'sharpe': sharpe(returns),
-        'max_drawdown': max_drawdown(df['pnl'].values),
-        'hit_rate': hit_rate(returns),
-    }
-
-
-def evaluate_mean_reversion(cfg: dict, steps: int) -> dict:
-    env = SimpleLOBEnv(seed=cfg.get('seed'), market=cfg.get('market'), execution=cfg.get('execution'), fees=cfg.get('fees'))
-    agent = MeanReversionMarketMaker(target_spread=cfg.get('agent', {}).get('spread', 0.1), kappa=0.1, skew_sensitivity=0.05)
-    for _ in range(steps):
-        bid, ask = agent.quote(env.mid_price, env.inventory)
-        env.step(bid, ask)
-    df = pd.DataFrame(env.history)
-    returns = df['pnl'].diff().fillna(0.0).values
-    return {
-        'final_pnl': float(df['pnl'].iloc[-1]),
-        'std_inventory': float(df['inventory'].std()),
-        'sharpe': sharpe(returns),
-        'max_drawdown': max_drawdown(df['pnl'].values),
-        'hit_rate': hit_rate(returns),
-    }
-
-
-def evaluate_momentum(cfg: dict, steps: int) -> dict:
-    env = SimpleLOBEnv(seed=cfg.get('seed'), market=cfg.get('market'), execution=cfg.get('execution'), fees=cfg.get('fees'))
-    agent = MomentumMarketMaker(spread=cfg.get('agent', {}).get('spread', 0.12), window=20, bias=0.05)
-    for _ in range(steps):
-        bid, ask = agent.quote(env.mid_price, env.inventory)
-        env.step(bid, ask)
-    df = pd.DataFrame(env.history)
-    returns = df['pnl'].diff().fillna(0.0).values
-    return {
-        'final_pnl': float(df['pnl'].iloc[-1]),
-        'std_inventory': float(df['inventory'].std()),
-        'sharpe': sharpe(returns),
-        'max_drawdown': max_drawdown(df['pnl'].values),
-        'hit_rate': hit_rate(returns),
-    }
-
-
-def evaluate_avellaneda(cfg: dict, steps: int) -> dict:
-    env = SimpleLOBEnv(seed=cfg.get('seed'), market=cfg.get('market'), execution=cfg.get('execution'), fees=cfg.get('fees'))
-    as_cfg = cfg.get('avellaneda', { 'risk_aversion': 0.1, 'base_spread': 0.1, 'inv_penalty': 0.05 })
-    agent = AvellanedaStoikovMM(**as_cfg)
-    for _ in range(steps):
-        bid, ask = agent.quote(env.mid_price, env.inventory, sigma=getattr(env, '_current_sigma', 0.5))
-        env.step(bid, ask)
-    df = pd.DataFrame(env.history)
-    returns = df['pnl'].diff().fillna(0.0).values
-    return {
-        'final_pnl': float(df['pnl'].iloc[-1]),
-        'std_inventory': float(df['inventory'].std()),
-        'sharpe': sharpe(returns),
-        'max_drawdown': max_drawdown(df['pnl'].values),
-        'hit_rate': hit_rate(returns),
-    }
+    return _history_metrics(hist)
 
 
 def main():
@@ -134,13 +67,15 @@ def main():
         cfg = yaml.safe_load(f)
     steps = int(cfg.get('steps', 1000))
 
-    mlflow.set_experiment(cfg.get('run_tag', 'mmrl'))
-    with mlflow.start_run(run_name='evaluate_agents'):
-        naive = evaluate_naive(cfg, steps)
-        rb = evaluate_rule_based(cfg, steps)
-        asmm = evaluate_avellaneda(cfg, steps)
-        mr = evaluate_mean_reversion(cfg, steps)
-        mom = evaluate_momentum(cfg, steps)
+    # One open-loop market path for the seed, shared by every rule-based agent; drawn from a
+    # child stream so it is independent of the envs' fill draws
+    path = simulate_price_path(steps, seed=path_seed(cfg.get('seed')), market=cfg.get('market'))
+
+    with get_tracker(cfg, 'evaluate_agents') as tracker:
+        eval_cfg = cfg.get('evaluation') or {}
+        res = evaluate_lockstep(cfg, rule_based_agents(cfg), steps, price_path=path, workers=eval_cfg.get('workers', 0),
+                                parallel_threshold=int(eval_cfg.get('parallel_threshold', 16)), cache=get_cache(cfg))
+        naive, rb, asmm, mr, mom = (res[k] for k in ('naive', 'rb', 'as', 'mr', 'mom'))
         ppo_path = os.path.join(cfg.get('output_dir', 'results'), 'ppo_market_making.zip')
         if os.path.exists(ppo_path):
             ppo = evaluate_ppo(cfg, steps, ppo_path)
@@ -148,12 +83,12 @@ def main():
             ppo = {'final_pnl': None, 'std_inventory': None, 'sharpe': None, 'max_drawdown': None, 'hit_rate': None}
 
         # Log metrics
-        mlflow.log_metrics({f"naive_{k}": v for k, v in naive.items() if v is not None})
-        mlflow.log_metrics({f"rb_{k}": v for k, v in rb.items() if v is not None})
-        mlflow.log_metrics({f"as_{k}": v for k, v in asmm.items() if v is not None})
-        mlflow.log_metrics({f"mr_{k}": v for k, v in mr.items() if v is not None})
-        mlflow.log_metrics({f"mom_{k}": v for k, v in mom.items() if v is not None})
-        mlflow.log_metrics({f"ppo_{k}": v for k, v in ppo.items() if v is not None})
+        tracker.log_metrics({f"naive_{k}": v for k, v in naive.items() if v is not None})
+        tracker.log_metrics({f"rb_{k}": v for k, v in rb.items() if v is not None})
+        tracker.log_metrics({f"as_{k}": v for k, v in asmm.items() if v is not None})
+        tracker.log_metrics({f"mr_{k}": v for k, v in mr.items() if v is not None})
+        tracker.log_metrics({f"mom_{k}": v for k, v in mom.items() if v is not None})
+        tracker.log_metrics({f"ppo_{k}": v for k, v in ppo.items() if v is not None})
 
         # Plot comparison
         labels = ['final_pnl', 'sharpe', 'max_drawdown']
@@ -178,7 +113,7 @@ def main():
         os.makedirs(out_dir, exist_ok=True)
         plot_path = os.path.join(out_dir, 'evaluate_comparison.png')
         plt.savefig(plot_path)
-        mlflow.log_artifact(plot_path)
+        tracker.log_artifact(plot_path)
 
         print('Naive:', naive)
         print('Rule-based:', rb)
@@ -187,6 +122,18 @@ def main():
         print('Momentum:', mom)
         print('PPO:', ppo)
 
+        # Monte Carlo mode: the rule-based agents over many independent seeds
+        n_seeds = int(eval_cfg.get('n_seeds', 0) or 0)
+        if n_seeds > 0:
+            per_seed = run_monte_carlo(cfg, rule_based_agents(cfg), steps, n_seeds, seed=cfg.get('seed'),
+                                       workers=eval_cfg.get('workers', 0), chunk_size=int(eval_cfg.get('chunk_size', 8)))
+            summary = summarize(per_seed, n_boot=int(eval_cfg.get('n_boot', 1000)), ci=float(eval_cfg.get('ci', 0.95)))
+            summary_path = save_summary(summary, eval_cfg.get('summary_path', os.path.join(out_dir, 'monte_carlo_summary.parquet')))
+            tracker.log_param('mc_n_seeds', n_seeds)
+            tracker.log_metrics({f"mc_{r.agent}_{r.metric}_mean": r.mean for r in summary.itertuples() if np.isfinite(r.mean)})
+            tracker.log_artifact(summary_path)
+            print(summary.to_string(index=False))
+
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -4,8 +4,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import yaml
 import numpy as np
 import pandas as pd
-import mlflow
 from utils.io import create_run_dir, save_config, save_dataframe
+from utils.tracking import get_tracker
 from env.multi_asset_env import MultiAssetEnv
 from agents.depth_mm import DepthAwareMarketMaker
 from utils.metrics import sharpe, max_drawdown, hit_rate
@@ -65,13 +65,11 @@ def main():
     # Save to run dir and log to MLflow
     run_dir = create_run_dir(cfg.get('output_dir', 'results'), f"{cfg.get('run_tag','')}_multi")
     save_config(cfg, run_dir)
-    csv_path = save_dataframe(df, run_dir, 'multi_asset_history.csv')
+    save_dataframe(df, run_dir, 'multi_asset_history.csv')
 
-    mlflow.set_experiment(cfg.get('run_tag', 'mmrl'))
-    with mlflow.start_run(run_name='evaluate_multi_asset'):
-        mlflow.log_metrics(summary)
-        mlflow.log_artifact(str(csv_path))
-        mlflow.log_artifacts(str(run_dir))
+    with get_tracker(cfg, 'evaluate_multi_asset') as tracker:
+        tracker.log_metrics(summary)
+        tracker.log_artifacts(run_dir)
 
     print('Multi-asset summary:', summary)
 
@@ -2,45 +2,76 @@ import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import yaml
-from tqdm import tqdm
 import numpy as np
 import pandas as pd
-import mlflow
 
 from env.simple_lob_env import SimpleLOBEnv
+from env.price_paths import path_seed, simulate_price_path
+from env.episode_kernels import HAS_NUMBA, run_episode
 from agents.inventory_mm import InventoryAwareMarketMaker
 from utils.seeding import set_global_seed
+from utils.parallel import parallel_map
+from utils.cache import cache_key, get_cache
+from experiments.batched_grid import run_batched_grid
 from utils.io import create_run_dir, save_config, save_dataframe
-from utils.metrics import sharpe, max_drawdown, hit_rate
+from utils.tracking import get_tracker
+from utils.metrics import MetricsAccumulator, episode_summary
 from storage.duckdb import save_metrics as db_save_metrics
 from config.schema import load_config
 
 
-def run_simulation(spread, sensitivity, steps=1000, seed=None, market=None, execution=None, fees=None):
-    env = SimpleLOBEnv(seed=seed, market=market, execution=execution, fees=fees)
-    agent = InventoryAwareMarketMaker(spread=spread, inventory_sensitivity=sensitivity)
-
-    for _ in range(steps):
-        bid, ask = agent.quote(env.mid_price, env.inventory)
-        env.step(bid, ask)
+def run_simulation(spread, sensitivity, steps=1000, seed=None, market=None, execution=None, fees=None, simulation=None, cache=None,
+                   price_path=None):
+    """
+    One grid cell as a SimpleLOBEnv episode. With a `price_path` (the grid sweep passes one
+    shared path, as the batched engine uses) the env replays it; when numba is installed the
+    compiled whole-episode kernel, which draws the same fills, stands in for the step loop.
+    """
+    if seed is None:
+        cache = None  # unseeded episodes are not reproducible, so never memoized
+    if cache is not None:
+        key = cache_key(kind='grid_inventory_mm', spread=spread, sensitivity=sensitivity, steps=steps, seed=seed,
+                        market=market, execution=execution, fees=fees, simulation=simulation, price_path=price_path)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
 
-    df = pd.DataFrame(env.history)
-    returns = df['pnl'].diff().fillna(0.0).values
-    trades = df[['executed_bid', 'executed_ask']].notna().sum(axis=1).sum()
-    fill_rate = float(trades) / float(steps)
-    return {
+    agent = InventoryAwareMarketMaker(spread=spread, inventory_sensitivity=sensitivity)
+    if price_path is not None and HAS_NUMBA:
+        # Replaying a path the env only draws fill uniforms, which the kernel reproduces (a block
+        # RNG serves the same uniforms). Uncompiled, the kernel is no faster than the env loop.
+        hist = run_episode(agent, steps, seed=seed, market=market, execution=execution, fees=fees, price_path=price_path)
+        trades = int((~np.isnan(hist.column('executed_bid'))).sum() + (~np.isnan(hist.column('executed_ask'))).sum())
+        m = episode_summary(hist.column('pnl'), hist.column('inventory'), trades)
+    else:
+        env = SimpleLOBEnv(seed=seed, market=market, execution=execution, fees=fees, simulation=simulation,
+                           price_path=price_path, record_history=False)
+        acc = MetricsAccumulator()
+        for _ in range(steps):
+            bid, ask = agent.quote(env.mid_price, env.inventory)
+            acc.update_from_step(env.step(bid, ask))
+        m = acc.summary()
+    result = {
         'spread': spread,
         'sensitivity': sensitivity,
         'alpha': execution.get('alpha') if execution else None,
-        'final_pnl': float(df['pnl'].iloc[-1]),
-        'final_inventory': int(df['inventory'].iloc[-1]),
-        'std_inventory': float(df['inventory'].std()),
-        'sharpe': sharpe(returns),
-        'max_drawdown': max_drawdown(df['pnl'].values),
-        'hit_rate': hit_rate(returns),
-        'trades': int(trades),
-        'fill_rate': fill_rate,
+        'final_pnl': m['final_pnl'],
+        'final_inventory': m['final_inventory'],
+        'std_inventory': m['std_inventory'],
+        'sharpe': m['sharpe'],
+        'max_drawdown': m['max_drawdown'],
+        'hit_rate': m['hit_rate'],
+        'trades': m['trades'],
+        'fill_rate': m['fill_rate'],
     }
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+
+def _run_cell(kwargs):
+    # Module-level so the process pool can pickle it
+    return run_simulation(**kwargs)
 
 
 def main():
@@ -51,7 +82,7 @@ def main():
     set_global_seed(seed)
 
     run_dir = create_run_dir(cfg.get('output_dir', 'results'), f"{cfg.get('run_tag','')}_grid")
-    config_path = save_config(cfg, run_dir)
+    save_config(cfg, run_dir)
 
     spreads = cfg['grid']['spread']
     sensitivities = cfg['grid']['sensitivity']
@@ -60,39 +91,62 @@ def main():
     exec_base = cfg.get('execution', {})
     alpha_grid = exec_base.get('alpha_grid', [exec_base.get('alpha', 1.5)])
 
-    mlflow.set_experiment(cfg.get('run_tag', 'mmrl'))
-    with mlflow.start_run(run_name='grid_sweep'):
-        mlflow.log_param('seed', seed)
-        mlflow.log_param('steps', steps)
-        mlflow.log_param('market', str(cfg.get('market')))
-        mlflow.log_param('fees', str(cfg.get('fees')))
-        mlflow.log_param('alpha_grid', str(alpha_grid))
-        mlflow.log_param('spreads', str(spreads))
-        mlflow.log_param('sensitivities', str(sensitivities))
-
-        results = []
-        for alpha in tqdm(alpha_grid, desc='alpha'):
+    with get_tracker(cfg, 'grid_sweep') as tracker:
+        tracker.log_params({
+            'seed': seed,
+            'steps': steps,
+            'market': str(cfg.get('market')),
+            'fees': str(cfg.get('fees')),
+            'alpha_grid': str(alpha_grid),
+            'spreads': str(spreads),
+            'sensitivities': str(sensitivities),
+        })
+
+        # Every cell uses the same seed (common random numbers) and replays one market path, the
+        # same path the batched engine shares across its lanes, so results do not depend on scheduling
+        cache = get_cache(cfg)
+        price_path = simulate_price_path(steps, seed=path_seed(seed), market=cfg.get('market'))
+        cells = []
+        for alpha in alpha_grid:
             for s in spreads:
                 for inv_s in sensitivities:
                     exec_cfg = dict(exec_base)
                     exec_cfg['alpha'] = float(alpha)
-                    results.append(
-                        run_simulation(
-                            spread=s,
-                            sensitivity=inv_s,
-                            steps=steps,
-                            seed=seed,
-                            market=cfg.get('market'),
-                            execution=exec_cfg,
-                            fees=cfg.get('fees'),
-                        )
-                    )
+                    cells.append(dict(
+                        spread=s,
+                        sensitivity=inv_s,
+                        steps=steps,
+                        seed=seed,
+                        market=cfg.get('market'),
+                        execution=exec_cfg,
+                        fees=cfg.get('fees'),
+                        simulation=cfg.get('simulation'),
+                        cache=cache,
+                        price_path=price_path,
+                    ))
+        sweep = cfg.get('sweep') or {}
+        if sweep.get('engine', 'pool') == 'batched':
+            # One vectorized episode with a lane per cell; same market path, different fill draws
+            results = run_batched_grid(
+                [c['spread'] for c in cells],
+                [c['sensitivity'] for c in cells],
+                [c['execution']['alpha'] for c in cells],
+                steps=steps,
+                seed=seed,
+                market=cfg.get('market'),
+                execution=exec_base,
+                fees=cfg.get('fees'),
+                simulation=cfg.get('simulation'),
+                cache=cache,
+            )
+        else:
+            results = parallel_map(_run_cell, cells, workers=sweep.get('workers', 0),
+                                   chunk_size=sweep.get('chunk_size', 1), desc='grid')
 
         results_df = pd.DataFrame(results)
-        csv_path = save_dataframe(results_df, run_dir, 'grid_search_results.csv')
-        mlflow.log_artifact(str(config_path))
-        mlflow.log_artifact(str(csv_path))
-        mlflow.log_artifacts(str(run_dir))
+        save_dataframe(results_df, run_dir, 'grid_search_results.csv')
+        # Uploads config and results CSV once (they live in run_dir)
+        tracker.log_artifacts(run_dir)
         # Persist aggregate metrics per (spread,sensitivity,alpha) row as key-suffixed metrics using run_dir name as id
         agg = {
             'rows': len(results_df),
@@ -100,6 +154,7 @@ def main():
             'best_sharpe': float(results_df['sharpe'].max()),
             'avg_fill_rate': float(results_df['fill_rate'].mean()) if 'fill_rate' in results_df.columns else 0.0,
         }
+        tracker.log_metrics(agg)
         db_save_metrics(run_dir.name, cfg.get('run_tag', 'mmrl'), agg)
 
     print(f"Saved grid search results to: {run_dir}")
@@ -1,48 +1,175 @@
 import os, sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from pathlib import Path
+import hashlib
+import json
+import time
 import yaml
 import optuna
-import mlflow
 import numpy as np
 import pandas as pd
 from utils.io import create_run_dir, save_config, save_dataframe
-from utils.metrics import sharpe, max_drawdown, hit_rate
+from utils.metrics import MetricsAccumulator
+from utils.parallel import parallel_map
+from utils.cache import cache_key, get_cache
+from utils.tracking import get_tracker
 from env.simple_lob_env import SimpleLOBEnv
 from agents.inventory_mm import InventoryAwareMarketMaker
 
 
-def run_sim(cfg: dict, spread: float, inv_sense: float, steps: int) -> dict:
-    env = SimpleLOBEnv(seed=cfg.get('seed'), market=cfg.get('market'), execution=cfg.get('execution'), fees=cfg.get('fees'))
-    agent = InventoryAwareMarketMaker(spread=spread, inventory_sensitivity=inv_sense)
-    for _ in range(steps):
-        bid, ask = agent.quote(env.mid_price, env.inventory)
-        env.step(bid, ask)
-    df = pd.DataFrame(env.history)
-    returns = df['pnl'].diff().fillna(0.0).values
+def _metrics(acc: MetricsAccumulator) -> dict:
     return {
-        'final_pnl': float(df['pnl'].iloc[-1]),
-        'sharpe': sharpe(returns),
-        'max_drawdown': max_drawdown(df['pnl'].values),
-        'hit_rate': hit_rate(returns),
-        'std_inventory': float(df['inventory'].std()),
+        'final_pnl': acc.last_pnl,
+        'sharpe': acc.sharpe(),
+        'max_drawdown': acc.max_drawdown(),
+        'hit_rate': acc.hit_rate(),
+        'std_inventory': acc.std_inventory,
     }
 
 
-def objective(trial: optuna.Trial, cfg: dict) -> float:
-    spread = trial.suggest_float('spread', 0.01, 0.2)
-    inv_sense = trial.suggest_float('inventory_sensitivity', 0.001, 0.08)
-    steps = int(cfg.get('steps', 1000))
-    res = run_sim(cfg, spread, inv_sense, steps)
+def score(res: dict, cfg: dict) -> float:
     # Constrain drawdown and inventory
     if res['max_drawdown'] > cfg.get('risk', {}).get('max_drawdown', 0.2):
         return -1e9
     if res['std_inventory'] > cfg.get('risk', {}).get('max_inv_std', 20.0):
         return -1e9
     # Maximize Sharpe subject to penalties
-    score = res['sharpe'] - 0.001 * res['std_inventory'] + 0.0001 * res['final_pnl']
+    return res['sharpe'] - 0.001 * res['std_inventory'] + 0.0001 * res['final_pnl']
+
+
+def run_sim(cfg: dict, spread: float, inv_sense: float, steps: int,
+            trial: optuna.Trial | None = None, report_every: int = 0) -> dict:
+    """
+    Simulate one parameter set. With a `trial` and `report_every > 0` the objective on the
+    history so far is reported every `report_every` steps and the trial is pruned if the
+    study's pruner says so (raises optuna.TrialPruned).
+    Completed episodes are memoized in the result cache when `cache.enabled` is set and the
+    config has a seed.
+    """
+    cache = get_cache(cfg) if cfg.get('seed') is not None else None
+    if cache is not None:
+        key = cache_key(kind='hyperopt_inventory_mm', spread=spread, inventory_sensitivity=inv_sense, steps=steps,
+                        seed=cfg.get('seed'), market=cfg.get('market'), execution=cfg.get('execution'),
+                        fees=cfg.get('fees'), simulation=cfg.get('simulation'))
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+    env = SimpleLOBEnv(seed=cfg.get('seed'), market=cfg.get('market'), execution=cfg.get('execution'), fees=cfg.get('fees'), simulation=cfg.get('simulation'), record_history=False)
+    agent = InventoryAwareMarketMaker(spread=spread, inventory_sensitivity=inv_sense)
+    acc = MetricsAccumulator()
+    for t in range(1, steps + 1):
+        bid, ask = agent.quote(env.mid_price, env.inventory)
+        acc.update_from_step(env.step(bid, ask))
+        if trial is not None and report_every > 0 and t % report_every == 0 and t < steps:
+            trial.report(score(_metrics(acc), cfg), t)
+            trial.set_user_attr(_HEARTBEAT, time.time())
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+    res = _metrics(acc)
+    if cache is not None:
+        cache.put(key, res)
+    return res
+
+
+def objective(trial: optuna.Trial, cfg: dict) -> float:
+    spread = trial.suggest_float('spread', 0.01, 0.2)
+    inv_sense = trial.suggest_float('inventory_sensitivity', 0.001, 0.08)
+    steps = int(cfg.get('steps', 1000))
+    report_every = int((cfg.get('hyperopt') or {}).get('report_every', 0) or 0)
+    res = run_sim(cfg, spread, inv_sense, steps, trial=trial, report_every=report_every)
     trial.set_user_attr('metrics', res)
-    return score
+    return score(res, cfg)
+
+
+def make_storage(path: str | None):
+    """None = in-memory; *.db/*.sqlite = SQLite; anything else = Optuna journal file."""
+    if not path:
+        return None
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if path.endswith(('.db', '.sqlite', '.sqlite3')):
+        return f"sqlite:///{path}"
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:  # optuna < 4.0
+        from optuna.storages import JournalFileStorage as JournalFileBackend
+    return optuna.storages.JournalStorage(JournalFileBackend(path))
+
+
+# Trial user attr refreshed while a trial runs; see `fail_stale_trials`
+_HEARTBEAT = 'heartbeat'
+# Config sections that change the objective; a study is only resumed when they all match
+_OBJECTIVE_KEYS = ('seed', 'steps', 'market', 'execution', 'fees', 'simulation', 'risk')
+
+
+def study_name(cfg: dict) -> str:
+    """`hyperopt.study_name` suffixed with a hash of the objective-relevant config."""
+    hp = cfg.get('hyperopt') or {}
+    payload = json.dumps({k: cfg.get(k) for k in _OBJECTIVE_KEYS}, sort_keys=True, default=str)
+    return f"{hp.get('study_name', 'mmrl_hyperopt')}-{hashlib.sha256(payload.encode()).hexdigest()[:12]}"
+
+
+def create_study(cfg: dict) -> optuna.Study:
+    hp = cfg.get('hyperopt') or {}
+    pruner = optuna.pruners.MedianPruner(
+        n_startup_trials=int(hp.get('n_startup_trials', 5)),
+        n_warmup_steps=int(hp.get('report_every', 0) or 0),
+    ) if hp.get('pruning', True) else optuna.pruners.NopPruner()
+    return optuna.create_study(
+        study_name=study_name(cfg),
+        storage=make_storage(hp.get('storage')),
+        direction='maximize',
+        pruner=pruner,
+        load_if_exists=True,
+    )
+
+
+def _optimize_worker(args) -> int:
+    # Runs in a worker process against the shared on-disk study
+    cfg, n_trials = args
+    study = create_study(cfg)
+    study.optimize(lambda t: objective(t, cfg), n_trials=n_trials)
+    return n_trials
+
+
+def fail_stale_trials(study: optuna.Study, stale_after: float) -> int:
+    """
+    Mark FAIL the RUNNING trials with no sign of life (last heartbeat, or start time before
+    the first report) for more than `stale_after` seconds; returns how many.
+    Journal storage has no Optuna heartbeat, so live trials of other processes sharing the
+    study are told apart by the heartbeat `run_sim` records with every report.
+    """
+    now = time.time()
+    failed = 0
+    for trial in study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.RUNNING,)):
+        started = trial.datetime_start.timestamp() if trial.datetime_start is not None else now
+        if now - float(trial.user_attrs.get(_HEARTBEAT, started)) > stale_after:
+            study.tell(trial.number, state=optuna.trial.TrialState.FAIL)
+            failed += 1
+    return failed
+
+
+def optimize(cfg: dict) -> optuna.Study:
+    """
+    Run the trials still missing from the study (finished = complete or pruned), so a
+    killed study resumes from its storage. Trials a killed run left RUNNING are marked FAIL
+    once stale (`hyperopt.stale_trial_seconds`). Trials are split across `hyperopt.workers` processes.
+    """
+    hp = cfg.get('hyperopt') or {}
+    study = create_study(cfg)
+    fail_stale_trials(study, float(hp.get('stale_trial_seconds', 3600.0)))
+    finished = len(study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)))
+    remaining = max(0, int(hp.get('n_trials', 30)) - finished)
+    workers = int(hp.get('workers', 1) or 1)
+    if remaining == 0:
+        return study
+    if workers <= 1 or not hp.get('storage'):
+        study.optimize(lambda t: objective(t, cfg), n_trials=remaining)
+        return study
+    workers = min(workers, remaining)
+    shares = [remaining // workers + (1 if i < remaining % workers else 0) for i in range(workers)]
+    parallel_map(_optimize_worker, [(cfg, n) for n in shares], workers=workers, desc='hyperopt workers')
+    return create_study(cfg)
 
 
 def main():
@@ -50,18 +177,18 @@ def main():
     with open(cfg_path, 'r') as f:
         cfg = yaml.safe_load(f)
 
-    mlflow.set_experiment(cfg.get('run_tag', 'mmrl'))
-    study = optuna.create_study(direction='maximize')
-    with mlflow.start_run(run_name='hyperopt_rule_based'):
-        study.optimize(lambda t: objective(t, cfg), n_trials=30)
+    storage = (cfg.get('hyperopt') or {}).get('storage')
+    print(f"Study {study_name(cfg)}: " + (f"stored in {storage} (reruns resume it)" if storage else "in memory"))
+    with get_tracker(cfg, 'hyperopt_rule_based') as tracker:
+        study = optimize(cfg)
         best = study.best_trial
         best_params = best.params
         best_metrics = best.user_attrs.get('metrics', {})
-        mlflow.log_params(best_params)
-        mlflow.log_metrics(best_metrics)
+        tracker.log_params(best_params)
+        tracker.log_metrics(best_metrics)
         print('Best params:', best_params)
         print('Metrics:', best_metrics)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence
+import inspect
+import numpy as np
+
+from env.simple_lob_env import SimpleLOBEnv
+from env.price_paths import PricePath, path_seed, simulate_price_path
+from utils.cache import ResultCache, cache_key
+from utils.metrics import MetricsAccumulator
+from utils.parallel import parallel_map, resolve_workers
+
+METRIC_KEYS = ('final_pnl', 'std_inventory', 'sharpe', 'max_drawdown', 'hit_rate')
+
+
+def _takes_sigma(agent: Any) -> bool:
+    try:
+        return 'sigma' in inspect.signature(agent.quote).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def run_lockstep(cfg: dict, agents: Sequence[Any], steps: int, price_path: PricePath) -> List[Dict[str, Any]]:
+    """
+    Step every agent once per tick over the same market path.
+    Each agent trades in its own SimpleLOBEnv (own inventory/PnL, fills drawn from the config
+    seed) that replays `price_path`, so an extra agent only adds its quoting and fill work.
+    Build the path from a stream independent of the fill seed (`path_seed`).
+    Returns one metrics dict per agent, in order.
+    """
+    envs = [
+        SimpleLOBEnv(seed=cfg.get('seed'), market=cfg.get('market'), execution=cfg.get('execution'), fees=cfg.get('fees'),
+                     simulation=cfg.get('simulation'), price_path=price_path, record_history=False)
+        for _ in agents
+    ]
+    accs = [MetricsAccumulator() for _ in agents]
+    lanes = [(agent, env, acc, _takes_sigma(agent)) for agent, env, acc in zip(agents, envs, accs)]
+    for _ in range(steps):
+        for agent, env, acc, with_sigma in lanes:
+            if with_sigma:
+                bid, ask = agent.quote(env.mid_price, env.inventory, sigma=getattr(env, '_current_sigma', 0.5))
+            else:
+                bid, ask = agent.quote(env.mid_price, env.inventory)
+            acc.update_from_step(env.step(bid, ask))
+    return [{k: m[k] for k in METRIC_KEYS} for m in (acc.summary() for acc in accs)]
+
+
+def _run_lockstep_chunk(args) -> List[Dict[str, Any]]:
+    # Module-level so the process pool can pickle it
+    return run_lockstep(*args)
+
+
+def evaluate_lockstep(
+    cfg: dict,
+    agents: Dict[str, Any],
+    steps: int,
+    price_path: PricePath | None = None,
+    workers: int | None = 0,
+    parallel_threshold: int = 16,
+    cache: ResultCache | None = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Evaluate named agents against one shared market path (when not given, simulated from
+    `path_seed(cfg['seed'])`, a stream independent of the envs' fill draws). With at least
+    `parallel_threshold` agents to run, they are split into chunks that run in lockstep on a
+    process pool. Cached agents are not re-run; without a `cfg['seed']` the cache is not used.
+    """
+    if cfg.get('seed') is None:
+        cache = None
+    if price_path is None:
+        price_path = simulate_price_path(steps, seed=path_seed(cfg.get('seed')), market=cfg.get('market'))
+
+    results: Dict[str, Dict[str, Any]] = {}
+    keys: Dict[str, str] = {}
+    todo: List[str] = []
+    for name, agent in agents.items():
+        if cache is not None:
+            keys[name] = cache_key(kind='evaluate_agent', agent=agent, steps=steps, seed=cfg.get('seed'), market=cfg.get('market'),
+                                   execution=cfg.get('execution'), fees=cfg.get('fees'), simulation=cfg.get('simulation'),
+                                   price_path=price_path)
+            hit = cache.get(keys[name])
+            if hit is not None:
+                results[name] = hit
+                continue
+        todo.append(name)
+
+    if todo:
+        n_chunks = min(resolve_workers(workers), len(todo))
+        if n_chunks > 1 and len(todo) >= parallel_threshold:
+            # Contiguous chunks keep the flattened results in `todo` order
+            bounds = np.linspace(0, len(todo), n_chunks + 1).astype(int)
+            chunks = [todo[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+            outs = parallel_map(_run_lockstep_chunk, [(cfg, [agents[n] for n in c], steps, price_path) for c in chunks],
+                                workers=n_chunks, desc='evaluate')
+            summaries = [m for out in outs for m in out]
+        else:
+            summaries = run_lockstep(cfg, [agents[n] for n in todo], steps, price_path)
+        for name, res in zip(todo, summaries):
+            results[name] = res
+            if cache is not None:
+                cache.put(keys[name], res)
+
+    return {name: results[name] for name in agents}
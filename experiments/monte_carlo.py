@@ -0,0 +1,95 @@
+from __future__ import annotations
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+import copy
+import numpy as np
+import pandas as pd
+
+from env.price_paths import simulate_price_path
+from experiments.lockstep import METRIC_KEYS, run_lockstep
+from utils.parallel import parallel_map
+
+
+def seed_sequence(entropy: int, index: int) -> np.random.SeedSequence:
+    """Child `index` of SeedSequence(entropy), i.e. `SeedSequence(entropy).spawn(n)[index]` without spawning n."""
+    return np.random.SeedSequence(entropy, spawn_key=(int(index),))
+
+
+def _run_seed(cfg: dict, agents: Dict[str, Any], steps: int, entropy: int, index: int) -> List[Dict[str, Any]]:
+    # Independent streams for the market path and for the fills of seed `index`
+    path_ss, fill_ss = seed_sequence(entropy, index).spawn(2)
+    path = simulate_price_path(steps, seed=path_ss, market=cfg.get('market'))
+    # Fresh agents per seed: rule-based agents carry state (e.g. momentum windows)
+    fresh = copy.deepcopy(list(agents.values()))
+    results = run_lockstep({**cfg, 'seed': fill_ss}, fresh, steps, path)
+    return [{'agent': name, 'seed': index, **res} for name, res in zip(agents, results)]
+
+
+def run_monte_carlo(
+    cfg: dict,
+    agents: Dict[str, Any],
+    steps: int,
+    n_seeds: int,
+    seed: int | None = None,
+    workers: int | None = 0,
+    chunk_size: int = 8,
+) -> pd.DataFrame:
+    """
+    Evaluate every agent on `n_seeds` independent episodes.
+    Seed i draws its market path and fills from children of SeedSequence(seed).spawn(n_seeds)[i],
+    so results do not depend on how seeds are chunked across the `workers` process pool.
+    All agents share the path of a seed (stepped in lockstep). Returns one row per (agent, seed).
+    """
+    entropy = np.random.SeedSequence(seed).entropy
+    fn = partial(_run_seed, cfg, agents, steps, entropy)
+    rows = parallel_map(fn, range(int(n_seeds)), workers=workers, chunk_size=chunk_size, desc='monte carlo')
+    return pd.DataFrame([r for seed_rows in rows for r in seed_rows])
+
+
+def bootstrap_ci(values: np.ndarray, n_boot: int = 1000, ci: float = 0.95, rng: np.random.Generator | None = None) -> tuple:
+    """Percentile bootstrap CI of the mean (NaN bounds for fewer than 2 values)."""
+    values = np.asarray(values, dtype=float)
+    if values.size < 2:
+        return float('nan'), float('nan')
+    rng = rng or np.random.default_rng()
+    means = values[rng.integers(0, values.size, size=(int(n_boot), values.size))].mean(axis=1)
+    tail = (1.0 - ci) / 2.0
+    lo, hi = np.quantile(means, [tail, 1.0 - tail])
+    return float(lo), float(hi)
+
+
+def summarize(per_seed: pd.DataFrame, metrics: Sequence[str] = METRIC_KEYS, n_boot: int = 1000, ci: float = 0.95,
+              seed: int | None = 0) -> pd.DataFrame:
+    """
+    Aggregate per-seed metrics into one row per (agent, metric): n, mean, std, stderr and
+    bootstrap CI bounds of the mean. Non-finite values (e.g. undefined Sharpe) are dropped.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for agent, group in per_seed.groupby('agent', sort=False):
+        for metric in metrics:
+            x = group[metric].to_numpy(dtype=float)
+            x = x[np.isfinite(x)]
+            n = x.size
+            std = float(x.std(ddof=1)) if n > 1 else float('nan')
+            lo, hi = bootstrap_ci(x, n_boot, ci, rng)
+            rows.append({
+                'agent': agent,
+                'metric': metric,
+                'n': n,
+                'mean': float(x.mean()) if n else float('nan'),
+                'std': std,
+                'stderr': std / np.sqrt(n) if n > 1 else float('nan'),
+                'ci_low': lo,
+                'ci_high': hi,
+            })
+    return pd.DataFrame(rows)
+
+
+def save_summary(summary: pd.DataFrame, path: str | Path) -> Path:
+    """Write `summary` as Parquet (requires pyarrow) and return the path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    summary.to_parquet(path, index=False)
+    return path
@@ -1,10 +1,12 @@
 import os, sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import functools
 import yaml
 from stable_baselines3 import PPO
 from stable_baselines3.common.vec_env import DummyVecEnv
 from env.multi_asset_gym import MultiAssetGymEnv
+from env.shm_vec_env import SB3SharedMemoryVecEnv
 from agents.depth_mm import DepthAwareMarketMaker
 import numpy as np
 
@@ -12,10 +14,18 @@ import numpy as np
 def train(cfg):
     def make_env():
         return MultiAssetGymEnv(cfg)
-    env = DummyVecEnv([make_env])
+    training = cfg.get('training') or {}
+    num_workers = int(training.get('num_workers', 0))
+    if num_workers > 0:
+        # Envs stepped in worker processes, results exchanged through shared memory
+        env = SB3SharedMemoryVecEnv(functools.partial(MultiAssetGymEnv, cfg), num_workers=num_workers,
+                                    envs_per_worker=int(training.get('envs_per_worker', 1)), seed=cfg.get('seed'))
+    else:
+        env = DummyVecEnv([make_env])
     model = PPO("MlpPolicy", env, verbose=1)
     timesteps = int(cfg.get('train_timesteps', 20000))
     model.learn(total_timesteps=timesteps)
+    env.close()
     out = os.path.join(cfg.get('output_dir', 'results'), 'ppo_multi')
     model.save(out)
     print('Saved', out + '.zip')
@@ -1,10 +1,14 @@
 import os, sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import functools
+import numpy as np
 import yaml
 from stable_baselines3 import PPO
 from stable_baselines3.common.vec_env import DummyVecEnv
 from env.gym_env import MarketMakingGymEnv
+from env.vector_env import MarketMakingSB3VecEnv
+from env.shm_vec_env import SB3SharedMemoryVecEnv
 
 
 def main():
@@ -12,13 +16,24 @@ def main():
     with open(cfg_path, 'r') as f:
         cfg = yaml.safe_load(f)
 
-    def make_env():
-        return MarketMakingGymEnv(cfg)
-
-    env = DummyVecEnv([make_env])
+    training = cfg.get('training') or {}
+    n_envs = int(training.get('n_envs', 8))
+    num_workers = int(training.get('num_workers', 0))
+    if num_workers > 0:
+        # Envs stepped in worker processes, results exchanged through shared memory
+        env = SB3SharedMemoryVecEnv(functools.partial(MarketMakingGymEnv, cfg), num_workers=num_workers,
+                                    envs_per_worker=int(training.get('envs_per_worker', 1)), seed=cfg.get('seed'))
+    elif training.get('vec_env', 'batched') == 'batched':
+        # All envs stepped together as arrays
+        env = MarketMakingSB3VecEnv(cfg, num_envs=n_envs)
+    else:
+        # Env i gets its own child seed stream; sharing the config seed would make every env identical
+        seeds = np.random.SeedSequence(cfg.get('seed')).spawn(n_envs)
+        env = DummyVecEnv([functools.partial(MarketMakingGymEnv, {**cfg, 'seed': s}) for s in seeds])
     model = PPO("MlpPolicy", env, verbose=1)
     timesteps = int(cfg.get('train_timesteps', 10000))
     model.learn(total_timesteps=timesteps)
+    env.close()
     out_dir = cfg.get('output_dir', 'results')
     os.makedirs(out_dir, exist_ok=True)
     model.save(os.path.join(out_dir, 'ppo_market_making'))
@@ -26,4 +41,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,12 @@
+"""Market Making RL: simulation, experiments and CLI."""
+
+__version__ = "0.1.0"
+__all__ = ["run_backtest", "__version__"]
+
+
+def __getattr__(name):
+    # Resolved on first use so `import mmrl` (and the CLI) stays light
+    if name == "run_backtest":
+        from mmrl.backtest import run_backtest
+        return run_backtest
+    raise AttributeError(f"module 'mmrl' has no attribute {name!r}")
@@ -0,0 +1,199 @@
+from __future__ import annotations
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Tuple
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import yaml
+
+from config.schema import AppConfig, load_config
+
+
+@lru_cache(maxsize=1)
+def pip_freeze() -> str:
+    """`pip freeze` output, computed once per process (the environment does not change mid-run)."""
+    try:
+        return subprocess.check_output([sys.executable, "-m", "pip", "freeze"]).decode()
+    except Exception:
+        return ""
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _init_db() -> None:
+    from storage.duckdb import init_db
+    init_db()
+
+
+def _resolve_config(cfg: AppConfig | Dict[str, Any] | str | os.PathLike) -> Tuple[Dict[str, Any], bytes]:
+    """Validated config dict plus the bytes its hash is taken from (the YAML file when given a path)."""
+    if isinstance(cfg, (str, os.PathLike)):
+        raw = Path(cfg).read_bytes()
+        return load_config(str(cfg)).model_dump(), raw
+    model = cfg if isinstance(cfg, AppConfig) else AppConfig.model_validate(cfg)
+    data = model.model_dump()
+    return data, yaml.safe_dump(data, sort_keys=True).encode()
+
+
+def _run_isolated(cfg: Dict[str, Any]) -> Tuple[Path, Dict[str, Any]]:
+    # Fresh interpreter; the child prints its result as JSON on the last stdout line
+    fd, path = tempfile.mkstemp(prefix="mmrl_cfg_", suffix=".yaml")
+    try:
+        with os.fdopen(fd, "w") as f:
+            yaml.safe_dump(cfg, f, sort_keys=False)
+        out = subprocess.run([sys.executable, "-m", "mmrl.backtest", path], check=True, capture_output=True, text=True).stdout
+    finally:
+        Path(path).unlink(missing_ok=True)
+    result = json.loads(out.strip().splitlines()[-1])
+    return Path(result["run_dir"]), result["metrics"]
+
+
+def run_backtest(cfg: AppConfig | Dict[str, Any] | str | os.PathLike, isolated: bool = False) -> Tuple[Path, Dict[str, Any]]:
+    """
+    Run one inventory-aware market-making backtest and return (run_dir, metrics).
+    - `cfg` is a config dict, an AppConfig or a path to a YAML config
+    - Writes the run CSV, plot, metrics.json and repro stamps to a new run directory, logs to
+      MLflow through a `utils.tracking` sink and persists the run to DuckDB
+    - Runs in the calling process; `isolated=True` runs it in a fresh interpreter instead
+    """
+    cfg, cfg_bytes = _resolve_config(cfg)
+    if isolated:
+        return _run_isolated(cfg)
+
+    from matplotlib.figure import Figure
+    from env.simple_lob_env import SimpleLOBEnv
+    from agents.inventory_mm import InventoryAwareMarketMaker
+    from utils.seeding import set_global_seed
+    from utils.io import create_run_dir, save_config, save_dataframe, save_metrics
+    from utils.metrics import MetricsAccumulator
+    from utils.tracking import get_tracker
+    from storage.duckdb import save_metrics as db_save_metrics, save_trades as db_save_trades, upsert_run as db_upsert_run
+    from risk.manager import RiskManager, RiskConfig
+
+    # Ensure DuckDB tables exist
+    _init_db()
+
+    # Seed and run dir
+    set_global_seed(cfg.get('seed'))
+    run_dir = create_run_dir(cfg.get('output_dir', 'results'), cfg.get('run_tag', ''))
+    save_config(cfg, run_dir)
+
+    # Environment and agent
+    env = SimpleLOBEnv(
+        seed=cfg.get('seed'),
+        market=cfg.get('market'),
+        execution=cfg.get('execution'),
+        fees=cfg.get('fees'),
+        simulation=cfg.get('simulation'),
+    )
+    agent_cfg = cfg.get('agent', {})
+    agent = InventoryAwareMarketMaker(
+        spread=agent_cfg.get('spread', 0.1),
+        inventory_sensitivity=agent_cfg.get('inventory_sensitivity', 0.05)
+    )
+
+    risk_cfg = cfg.get('risk') or {}
+    risk = RiskManager(RiskConfig(max_inventory=risk_cfg.get('max_inventory', 50), max_drawdown=risk_cfg.get('max_drawdown', 0.2)))
+
+    steps = int(cfg.get('steps', 1000))
+    acc = MetricsAccumulator()
+    for _ in range(steps):
+        if not risk.check(env.inventory, env.pnl):
+            break
+        bid, ask = agent.quote(env.mid_price, env.inventory)
+        acc.update_from_step(env.step(bid, ask))
+
+    df = env.history.to_frame()
+    save_dataframe(df, run_dir, 'inventory_mm_run.csv')
+
+    # Metrics (accumulated during the episode)
+    m = acc.summary()
+    metrics = {
+        'final_pnl': m['final_pnl'],
+        'final_inventory': m['final_inventory'],
+        'std_inventory': m['std_inventory'],
+        'sharpe': m['sharpe'],
+        'max_drawdown': m['max_drawdown'],
+        'hit_rate': m['hit_rate'],
+        'steps': steps
+    }
+    save_metrics(metrics, run_dir)
+
+    # Plot (Figure API: no pyplot global state, safe in a long-lived server process)
+    fig = Figure(figsize=(12, 6))
+    ax = fig.add_subplot(2, 1, 1)
+    ax.plot(df['time'], df['pnl'])
+    ax.set_title("PnL over time")
+    ax = fig.add_subplot(2, 1, 2)
+    ax.plot(df['time'], df['inventory'])
+    ax.set_title('Inventory over time')
+    fig.tight_layout()
+    plot_path = run_dir / "inventory_mm_plot.png"
+    fig.savefig(plot_path)
+
+    # MLflow logging: queued here, created/flushed/uploaded by the tracker (tracking.mode)
+    tracker = get_tracker(cfg, 'backtest')
+    tracker.log_params({
+        'seed': cfg.get('seed'),
+        'steps': steps,
+        'agent_spread': agent_cfg.get('spread', 0.1),
+        'agent_inventory_sensitivity': agent_cfg.get('inventory_sensitivity', 0.05),
+        'tick_size': getattr(env, 'tick_size', None),
+        'max_inventory': getattr(env, 'max_inventory', None),
+    })
+    # Nested dicts as strings for quick logging
+    tracker.log_params({'market': str(cfg.get('market')), 'execution': str(cfg.get('execution')), 'fees': str(cfg.get('fees'))})
+    tracker.log_metrics(metrics)
+
+    db_save_metrics(run_dir.name, cfg.get('run_tag', 'mmrl'), metrics)
+    db_save_trades(run_dir.name, df)
+
+    # Repro stamps
+    commit_hash = _git_commit()
+    config_hash = hashlib.sha256(cfg_bytes).hexdigest()
+    (run_dir / 'commit.txt').write_text(commit_hash or '')
+    (run_dir / 'config_hash.txt').write_text(config_hash)
+    (run_dir / 'pip_freeze.txt').write_text(pip_freeze())
+
+    # The run directory (config, CSV, plot, stamps) is uploaded once; the tracker writes and uploads
+    # mlflow_run_id.txt itself once the run exists, so the backtest never waits on MLflow
+    tracker.log_artifacts(run_dir)
+    tracker.write_run_id(run_dir / 'mlflow_run_id.txt')
+    tracker.close()
+    run_id = tracker.started_run_id
+
+    # Persist run metadata to DB
+    db_upsert_run({
+        "id": run_dir.name,
+        "type": "backtest",
+        "experiment": cfg.get('run_tag', 'mmrl'),
+        "run_dir": str(run_dir),
+        "mlflow_run_id": run_id,
+        "status": "completed",
+        "payload": cfg,
+        "metrics": metrics,
+        "submitted_at": None,
+        "started_at": None,
+        "finished_at": time.time(),
+        "metadata": {"pip_freeze": True},
+        "commit_hash": commit_hash,
+        "config_hash": config_hash,
+    })
+    return run_dir, metrics
+
+
+if __name__ == "__main__":
+    # Entry point for isolated runs: python -m mmrl.backtest <config.yaml>
+    run_dir, metrics = run_backtest(sys.argv[1] if len(sys.argv) > 1 else os.environ.get('MMRL_CONFIG', 'configs/inventory.yaml'))
+    print(json.dumps({"run_dir": str(run_dir), "metrics": metrics}))
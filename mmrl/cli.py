@@ -1,35 +1,40 @@
 import os
-import subprocess
+import sys
 import argparse
-from pathlib import Path
+import importlib
 
+# Keep module-level imports to the standard library: heavy subsystems (mlflow, matplotlib,
+# pandas, torch, duckdb) are imported by the subcommand that needs them.
+# `mmrl doctor --startup` reports startup time and flags regressions.
 
-def backtest(config="configs/inventory.yaml"):
-    """Run a single backtest using the given config."""
-    env = os.environ.copy()
-    env["MMRL_CONFIG"] = config
-    subprocess.run(["python3", "experiments/run_inventory_mm.py"], check=True, env=env)
+
+def _run_experiment(module, config):
+    """Import an experiment script only when its subcommand runs, then call its main()."""
+    os.environ["MMRL_CONFIG"] = config
+    importlib.import_module(module).main()
+
+
+def backtest(config="configs/inventory.yaml", isolated=False):
+    """Run a single backtest using the given config (in-process unless `isolated`)."""
+    from mmrl.backtest import run_backtest
+    run_dir, metrics = run_backtest(config, isolated=isolated)
+    print(f"Saved artifacts to: {run_dir}")
+    print(metrics)
 
 
 def grid(config="configs/inventory.yaml"):
     """Run a grid search using the given config."""
-    env = os.environ.copy()
-    env["MMRL_CONFIG"] = config
-    subprocess.run(["python3", "experiments/grid_search_inventory_mm.py"], check=True, env=env)
+    _run_experiment("experiments.grid_search_inventory_mm", config)
 
 
 def train(config="configs/inventory.yaml"):
     """Train PPO on the market making env."""
-    env = os.environ.copy()
-    env["MMRL_CONFIG"] = config
-    subprocess.run(["python3", "experiments/train_ppo.py"], check=True, env=env)
+    _run_experiment("experiments.train_ppo", config)
 
 
 def evaluate(config="configs/inventory.yaml"):
     """Evaluate rule-based vs PPO and log to MLflow."""
-    env = os.environ.copy()
-    env["MMRL_CONFIG"] = config
-    subprocess.run(["python3", "experiments/evaluate_agents.py"], check=True, env=env)
+    _run_experiment("experiments.evaluate_agents", config)
 
 
 def analyze(returns_file, risk_free_rate=0.02, periods_per_year=252, output_file=None, plot=False):
@@ -158,6 +163,7 @@ def main():
     # Backtest command
     backtest_parser = subparsers.add_parser('backtest', help='Run a single backtest')
     backtest_parser.add_argument('--config', default='configs/inventory.yaml', help='Path to YAML config')
+    backtest_parser.add_argument('--isolated', action='store_true', help='Run the backtest in a separate Python process')
     
     # Grid command
     grid_parser = subparsers.add_parser('grid', help='Run a grid search')
@@ -189,11 +195,18 @@ def main():
     # Config validate/schema commands
     subparsers.add_parser('config-validate', help='Validate current config file against schema')
     schema_parser = subparsers.add_parser('config-schema', help='Print JSON schema for configuration')
+
+    # Diagnostics
+    doctor_parser = subparsers.add_parser('doctor', help='Diagnose the installation')
+    doctor_parser.add_argument('--startup', action='store_true', help='Report CLI startup and import times (python -X importtime)')
+    doctor_parser.add_argument('--measure', action='append', metavar='COMMAND', help='Subcommand to measure (repeatable; default: help and config commands)')
+    doctor_parser.add_argument('--budget-ms', type=float, default=200.0, help='Startup budget per command in ms (default: 200)')
+    doctor_parser.add_argument('--top', type=int, default=10, help='Slowest imports to list per command (default: 10)')
     
     args = parser.parse_args()
     
     if args.command == 'backtest':
-        backtest(args.config)
+        backtest(args.config, args.isolated)
     elif args.command == 'grid':
         grid(args.config)
     elif args.command == 'train':
@@ -207,14 +220,26 @@ def main():
         out = fetch_trades_to_parquet(args.exchange, args.symbol, args.limit, args.out)
         print(f"Saved to {out}")
     elif args.command == 'config-validate':
-        from config.schema import load_config as load_cfg_model
+        import yaml
+        from config.json_schema import conforms
         cfg_path = os.environ.get('MMRL_CONFIG', 'configs/inventory.yaml')
-        _ = load_cfg_model(cfg_path)
+        with open(cfg_path, 'r') as f:
+            data = yaml.safe_load(f)
+        if not conforms(data):
+            # Only pydantic (slow to import) can decide the rest and explain what is wrong
+            from config.schema import AppConfig
+            AppConfig.model_validate(data)
         print(f"Config '{cfg_path}' is valid ✅")
     elif args.command == 'config-schema':
         import json
-        from config.schema import export_json_schema
-        print(json.dumps(export_json_schema(), indent=2))
+        from config.json_schema import load_json_schema
+        print(json.dumps(load_json_schema(), indent=2))
+    elif args.command == 'doctor':
+        if not args.startup:
+            doctor_parser.print_help()
+            return
+        from mmrl.doctor import LIGHT_COMMANDS, startup_doctor
+        sys.exit(startup_doctor(args.measure or LIGHT_COMMANDS, args.budget_ms, args.top))
     else:
         parser.print_help()
 
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+import subprocess
+import sys
+import time
+
+# Subsystems that must not load for commands that do not simulate, train or plot
+HEAVY_MODULES = ("mlflow", "matplotlib", "seaborn", "torch", "stable_baselines3", "duckdb", "pandas", "gymnasium", "optuna", "numba", "pydantic")
+# Commands expected to start fast (`mmrl` with no command prints help)
+LIGHT_COMMANDS = ("", "--help", "config-validate", "config-schema")
+# Wall-time budget per command in ms (the config commands use the checked-in JSON schema
+# and only import pydantic for configs that fail the fast check)
+DEFAULT_BUDGET_MS = 200.0
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupReport:
+    command: str
+    wall_ms: float
+    imports: List[ImportRecord]
+    returncode: int = 0
+
+    @property
+    def import_ms(self) -> float:
+        return sum(r.cumulative_us for r in self.imports if r.depth == 0) / 1000.0
+
+    @property
+    def heavy(self) -> List[str]:
+        return sorted({r.module.split('.')[0] for r in self.imports} & set(HEAVY_MODULES))
+
+    def slowest(self, n: int = 10) -> List[ImportRecord]:
+        return sorted(self.imports, key=lambda r: r.self_us, reverse=True)[:n]
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse `python -X importtime` lines ("import time: self | cumulative | <indent>module")."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        # One leading space is the separator, then two spaces per nesting level
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped, int(parts[0]), int(parts[1]), depth))
+    return records
+
+
+def measure_startup(command: str = "", python: str | None = None, repeat: int = 1) -> StartupReport:
+    """
+    Run `python -X importtime -m mmrl.cli <command>` in a fresh interpreter and collect its imports.
+    With `repeat` > 1 the fastest run is reported (the first one may pay for a cold disk cache).
+    """
+    argv = [python or sys.executable, "-X", "importtime", "-m", "mmrl.cli", *command.split()]
+    best = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        proc = subprocess.run(argv, capture_output=True, text=True)
+        wall_ms = (time.perf_counter() - start) * 1000.0
+        report = StartupReport(command or "(no command)", wall_ms, parse_importtime(proc.stderr), proc.returncode)
+        if proc.returncode != 0:
+            return report
+        if best is None or report.wall_ms < best.wall_ms:
+            best = report
+    return best
+
+
+def startup_doctor(commands: Sequence[str] = LIGHT_COMMANDS, budget_ms: float = DEFAULT_BUDGET_MS, top: int = 10,
+                   repeat: int = 3) -> int:
+    """Print a startup report per command; returns 1 if any command fails, is over budget or loads a heavy subsystem."""
+    failed = False
+    for command in commands:
+        report = measure_startup(command, repeat=repeat)
+        over = report.wall_ms > budget_ms
+        failed |= over or bool(report.heavy) or report.returncode != 0
+        status = f"EXIT {report.returncode}" if report.returncode != 0 else "OVER BUDGET" if over else "ok"
+        print(f"mmrl {report.command}: {report.wall_ms:.0f} ms wall, {report.import_ms:.0f} ms imports [{status}]")
+        if report.heavy:
+            print(f"  heavy subsystems imported: {', '.join(report.heavy)}")
+        for r in report.slowest(top):
+            print(f"  {r.self_us / 1000.0:8.1f} ms self {r.cumulative_us / 1000.0:8.1f} ms cum  {r.module}")
+    return 1 if failed else 0
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+import pytest
+
+import mmrl
+
+
+def test_import_mmrl_is_lazy():
+    out = subprocess.check_output([sys.executable, "-c", "import mmrl, sys; print('mmrl.backtest' in sys.modules, 'mlflow' in sys.modules)"])
+    assert out.decode().split() == ["False", "False"]
+    from mmrl.backtest import run_backtest
+    assert mmrl.run_backtest is run_backtest
+    with pytest.raises(AttributeError):
+        mmrl.not_there
+
+
+def test_run_backtest_in_process(tmp_path, monkeypatch):
+    pytest.importorskip("mlflow")
+    pytest.importorskip("duckdb")
+    pytest.importorskip("matplotlib")
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    monkeypatch.setenv("MMRL_DUCKDB_PATH", str(tmp_path / "mmrl.duckdb"))
+    from mmrl.backtest import run_backtest
+    cfg = {"run_tag": "test", "seed": 3, "steps": 200, "output_dir": str(tmp_path / "results")}
+    run_dir, metrics = run_backtest(cfg)
+    assert run_dir.parent == tmp_path / "results"
+    assert metrics["steps"] == 200
+    for name in ("config.yaml", "metrics.json", "inventory_mm_run.csv", "inventory_mm_plot.png", "pip_freeze.txt"):
+        assert (run_dir / name).exists()
+    # Same config and seed => same metrics
+    _, again = run_backtest(cfg)
+    assert again == metrics
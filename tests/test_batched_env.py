@@ -0,0 +1,51 @@
+import numpy as np
+from env.simple_lob_env import SimpleLOBEnv
+from env.batched_lob_env import BatchedLOBEnv
+
+
+MARKET = {"vol_regime": {"enabled": True, "switch_prob": 0.05}}
+FEES = {"fee_bps": 1.0, "slippage_bps": 2.0}
+
+
+def test_batched_step_shapes():
+    env = BatchedLOBEnv(num_envs=8, seed=0, market=MARKET, fees=FEES)
+    rec = env.step(env.mid_price - 0.05, env.mid_price + 0.05)
+    for key in ("time", "bid", "ask", "mid_price", "inventory", "executed_bid", "executed_ask", "pnl", "sigma"):
+        assert rec[key].shape == (8,)
+    filled = ~np.isnan(rec["executed_bid"])
+    assert np.all(rec["inventory"][filled & np.isnan(rec["executed_ask"])] == 1)
+
+
+def test_batched_respects_inventory_limit():
+    env = BatchedLOBEnv(num_envs=4, seed=0, max_inventory=3)
+    env.exec_base_rate = 1e6
+    for _ in range(10):
+        # Bids at mid always fill, asks far away never do
+        env.step(env.mid_price, env.mid_price + 10.0)
+    assert np.all(env.inventory == 3)
+
+
+def test_batched_matches_scalar_in_distribution():
+    n, steps = 300, 200
+    scalar_fills, scalar_mid = [], []
+    for seed in range(n):
+        env = SimpleLOBEnv(seed=seed, market=MARKET, fees=FEES)
+        fills = 0
+        for _ in range(steps):
+            rec = env.step(env.mid_price - 0.05, env.mid_price + 0.05)
+            fills += (rec["executed_bid"] is not None) + (rec["executed_ask"] is not None)
+        scalar_fills.append(fills)
+        scalar_mid.append(env.mid_price)
+
+    benv = BatchedLOBEnv(num_envs=n, seed=12345, market=MARKET, fees=FEES)
+    batched_fills = np.zeros(n)
+    for _ in range(steps):
+        rec = benv.step(benv.mid_price - 0.05, benv.mid_price + 0.05)
+        batched_fills += ~np.isnan(rec["executed_bid"])
+        batched_fills += ~np.isnan(rec["executed_ask"])
+
+    scalar_fills = np.asarray(scalar_fills, dtype=float)
+    se = np.sqrt(scalar_fills.var(ddof=1) / n + batched_fills.var(ddof=1) / n)
+    assert abs(scalar_fills.mean() - batched_fills.mean()) < 4 * se
+    se_mid = np.sqrt(np.var(scalar_mid, ddof=1) / n + benv.mid_price.var(ddof=1) / n)
+    assert abs(np.mean(scalar_mid) - benv.mid_price.mean()) < 4 * se_mid
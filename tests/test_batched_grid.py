@@ -0,0 +1,55 @@
+import numpy as np
+from experiments.batched_grid import run_batched_grid
+
+MARKET = {"ou": {"mu": 100.0, "kappa": 0.05, "sigma": 0.5}, "vol_regime": {"enabled": True, "switch_prob": 0.02}}
+COLUMNS = {'spread', 'sensitivity', 'alpha', 'final_pnl', 'final_inventory', 'std_inventory',
+           'sharpe', 'max_drawdown', 'hit_rate', 'trades', 'fill_rate'}
+
+
+def grid():
+    cells = [(a, s, k) for a in (0.5, 2.5) for s in (0.01, 0.2) for k in (0.001, 0.05)]
+    alphas, spreads, sens = map(list, zip(*cells))
+    return spreads, sens, alphas
+
+
+def test_batched_grid_rows():
+    spreads, sens, alphas = grid()
+    rows = run_batched_grid(spreads, sens, alphas, steps=300, seed=7, market=MARKET,
+                            execution={"base_arrival_rate": 1.0}, fees={"fee_bps": 1.0})
+    assert len(rows) == 8
+    assert all(set(r) == COLUMNS for r in rows)
+    assert [r['alpha'] for r in rows] == alphas
+    again = run_batched_grid(spreads, sens, alphas, steps=300, seed=7, market=MARKET,
+                             execution={"base_arrival_rate": 1.0}, fees={"fee_bps": 1.0})
+    assert rows == again
+
+
+def test_per_lane_alpha_changes_fill_rate():
+    # Higher alpha => fill probability decays faster with distance => fewer fills at a wide spread
+    rows = run_batched_grid([0.1, 0.1], [0.0, 0.0], [0.5, 3.0], steps=2000, seed=1, market=MARKET)
+    assert rows[0]['fill_rate'] > rows[1]['fill_rate']
+
+
+def test_engines_share_market_path_and_agree_in_distribution():
+    from env.price_paths import path_seed, simulate_price_path
+    from experiments.grid_search_inventory_mm import run_simulation
+    n, steps = 64, 500
+    rows = run_batched_grid([0.1] * n, [0.01] * n, [0.3] * n, steps=steps, seed=3, market=MARKET)
+    path = simulate_price_path(steps, seed=path_seed(3), market=MARKET)
+    pool = [run_simulation(0.1, 0.01, steps, seed=s, market=MARKET, execution={"alpha": 0.3}, price_path=path)
+            for s in range(n)]
+    a = np.array([r['fill_rate'] for r in rows])
+    b = np.array([r['fill_rate'] for r in pool])
+    assert abs(a.mean() - b.mean()) < 4 * np.hypot(a.std(), b.std()) / np.sqrt(n)
+
+
+def test_batched_grid_cache_and_unsupported_settings(tmp_path):
+    import pytest
+    from utils.cache import ResultCache
+    spreads, sens, alphas = grid()
+    cache = ResultCache(tmp_path)
+    rows = run_batched_grid(spreads, sens, alphas, steps=100, seed=7, market=MARKET, cache=cache)
+    assert any(tmp_path.iterdir())
+    assert run_batched_grid(spreads, sens, alphas, steps=100, seed=7, market=MARKET, cache=cache) == rows
+    with pytest.warns(UserWarning, match="rng_block_size"):
+        run_batched_grid(spreads, sens, alphas, steps=10, seed=7, market=MARKET, simulation={"rng_block_size": 64})
@@ -0,0 +1,102 @@
+import os
+import time
+import numpy as np
+from utils.cache import ResultCache, cache_key, get_cache
+from env.simple_lob_env import SimpleLOBEnv
+from env.price_paths import simulate_price_path
+from agents.naive_mm import NaiveMarketMaker
+
+
+def test_cache_key_canonical():
+    a = cache_key(seed=1, market={"ou": {"mu": 100.0, "kappa": 0.05}}, agent=NaiveMarketMaker(spread=0.1))
+    b = cache_key(agent=NaiveMarketMaker(spread=0.1), market={"ou": {"kappa": 0.05, "mu": np.float64(100.0)}}, seed=1)
+    assert a == b
+    assert a != cache_key(seed=1, market={"ou": {"mu": 100.0, "kappa": 0.05}}, agent=NaiveMarketMaker(spread=0.2))
+    p1 = simulate_price_path(50, seed=1)
+    p2 = simulate_price_path(50, seed=2)
+    assert cache_key(price_path=p1) == cache_key(price_path=simulate_price_path(50, seed=1))
+    assert cache_key(price_path=p1) != cache_key(price_path=p2)
+
+
+def test_cache_roundtrip_with_history(tmp_path):
+    cache = ResultCache(tmp_path)
+    env = SimpleLOBEnv(seed=0)
+    for _ in range(20):
+        env.step(env.mid_price - 0.05, env.mid_price + 0.05)
+    key = cache_key(kind="test", seed=0)
+    assert cache.get(key) is None
+    cache.put(key, {"final_pnl": 1.5, "sharpe": float("nan")}, history=env.history)
+    t0 = time.perf_counter()
+    hit = cache.get(key)
+    assert time.perf_counter() - t0 < 0.05
+    assert hit["final_pnl"] == 1.5 and np.isnan(hit["sharpe"])
+    hist = cache.get_history(key)
+    np.testing.assert_array_equal(hist.column("pnl"), env.history.column("pnl"))
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=10**9)
+    keys = [cache_key(i=i) for i in range(4)]
+    for i, k in enumerate(keys):
+        cache.put(k, {"x": "y" * 1000})
+        # Distinct, increasing access times
+        t = 1_000_000 + i
+        os.utime(cache._entry(k), (t, t))
+    cache.get(keys[0])  # most recently used now
+    cache.max_bytes = 2500
+    cache.evict()
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[3]) is not None
+    assert cache.get(keys[1]) is None and cache.get(keys[2]) is None
+
+
+def test_get_cache_disabled_by_default():
+    assert get_cache({}) is None
+    assert isinstance(get_cache({"cache": {"enabled": True, "dir": "x"}}), ResultCache)
+
+
+def test_config_default_disables_cache():
+    from config.schema import AppConfig
+    assert AppConfig().cache.enabled is False
+
+
+def test_unseeded_runs_are_not_cached(tmp_path):
+    from experiments.grid_search_inventory_mm import run_simulation
+    cache = ResultCache(tmp_path / "c")
+    run_simulation(0.1, 0.01, steps=20, seed=None, cache=cache)
+    assert not (tmp_path / "c").exists()
+    run_simulation(0.1, 0.01, steps=20, seed=1, cache=cache)
+    assert any((tmp_path / "c").iterdir())
+
+
+def test_put_rescans_only_past_size_estimate(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, max_bytes=10**9)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: (scans.append(1), evict()))
+    for i in range(20):
+        cache.put(cache_key(i=i), {"x": "y" * 100})
+    assert len(scans) == 1
+    cache.max_bytes = 1500
+    cache.put(cache_key(i=20), {"x": "y" * 100})
+    assert len(scans) == 2
+    assert cache._size_estimate <= 1500 * 0.9
+
+
+def test_cache_tolerates_concurrent_removal(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    key = cache_key(i=0)
+    cache.put(key, {"x": 1})
+
+    def evicted(path):
+        raise FileNotFoundError(path)
+
+    with monkeypatch.context() as m:
+        m.setattr(os, "utime", evicted)  # entry removed between the read and the mtime refresh
+        assert cache.get(key) == {"x": 1}
+    other = ResultCache(tmp_path)
+    other.clear()
+    assert cache.get(key) is None and cache.get_history(key) is None
+    cache.evict()
+    cache.put(key, {"x": 1})
+    assert cache.get(key) == {"x": 1}
@@ -0,0 +1,33 @@
+import pytest
+import yaml
+
+from config.json_schema import conforms, load_json_schema
+from config.schema import AppConfig, export_json_schema
+
+
+def test_checked_in_schema_is_current():
+    # Regenerate with: python -m config.json_schema
+    assert load_json_schema() == export_json_schema()
+
+
+@pytest.mark.parametrize("data", [
+    {},
+    {"seed": 1, "market": {"ou": {"mu": 100}}, "grid": {"spread": [0.1, 0.2]}, "unknown": [1]},
+    {"hyperopt": {"storage": None, "n_trials": 3}, "risk": None},
+])
+def test_fast_check_accepts_valid_configs(data):
+    assert conforms(data)
+    AppConfig.model_validate(data)
+
+
+def test_fast_check_defers_to_pydantic():
+    with open("configs/inventory.yaml") as f:
+        assert conforms(yaml.safe_load(f))
+    for data in ({"seed": "x"}, {"steps": 1.5}, {"market": {"ou": {"mu": "high"}}}, {"grid": {"spread": 0.1}}):
+        assert not conforms(data)
+        with pytest.raises(Exception):
+            AppConfig.model_validate(data)
+    # Stricter than pydantic: coercible values go to pydantic, which accepts them
+    assert not conforms({"seed": "7"})
+    assert AppConfig.model_validate({"seed": "7"}).seed == 7
+    assert not conforms(None)
@@ -5,9 +5,9 @@ Tests for enhanced performance metrics.
 import numpy as np
 import pytest
 from utils.metrics import (
-    sharpe, sortino, max_drawdown, max_drawdown_duration,
+    sharpe, sortino, max_drawdown, max_drawdown_duration, drawdown_episodes,
     hit_rate, profit_factor, calmar_ratio, var, cvar,
-    volatility, skewness, kurtosis, calculate_all_metrics,
+    volatility, skewness, kurtosis, calculate_all_metrics, calculate_all_metrics_batch,
     calculate_rolling_metrics, print_metrics_summary
 )
 
@@ -49,6 +49,34 @@ class TestEnhancedMetrics:
         assert duration >= 0
         assert duration <= len(self.returns)
     
+    def test_max_drawdown_duration_matches_loop(self):
+        """Run-length duration equals the longest underwater streak counted step by step."""
+        rng = np.random.default_rng(3)
+        for equity in (self.equity_curve, np.cumprod(1 + rng.normal(0, 0.01, 5000)), np.ones(10), np.array([1.0])):
+            longest = current = 0
+            for underwater in equity < np.maximum.accumulate(equity):
+                current = current + 1 if underwater else 0
+                longest = max(longest, current)
+            assert max_drawdown_duration(equity) == longest
+    
+    def test_drawdown_episodes(self):
+        """Episodes report start, trough, recovery, depth and duration of every drawdown."""
+        equity = np.array([1, 2, 1.5, 1.8, 2, 3, 2.5, 2.5, 1, 1, 4, 3.9])
+        episodes = drawdown_episodes(equity)
+        np.testing.assert_array_equal(episodes['start'], [2, 6, 11])
+        np.testing.assert_array_equal(episodes['trough'], [2, 8, 11])
+        np.testing.assert_array_equal(episodes['recovery'], [4, 10, -1])
+        np.testing.assert_allclose(episodes['depth'], [-0.25, -2 / 3, -0.025])
+        np.testing.assert_array_equal(episodes['duration'], [2, 4, 1])
+        
+        episodes = drawdown_episodes(self.equity_curve)
+        assert episodes['depth'].min() == max_drawdown(self.equity_curve)
+        assert episodes['duration'].max() == max_drawdown_duration(self.equity_curve)
+        assert (episodes['depth'] < 0).all()
+        
+        for flat in (np.array([]), np.ones(5), np.arange(1.0, 6.0)):
+            assert all(len(v) == 0 for v in drawdown_episodes(flat).values())
+    
     def test_hit_rate(self):
         """Test hit rate calculation."""
         hit_rate_val = hit_rate(self.returns)
@@ -125,6 +153,74 @@ class TestEnhancedMetrics:
             assert key in metrics
             assert not np.isnan(metrics[key])
     
+    def test_calculate_all_metrics_matches_functions(self):
+        """The shared-intermediate implementation returns exactly what the metric functions return."""
+        rng = np.random.default_rng(7)
+        cases = [
+            (self.returns, None, 0.02),
+            (self.returns, self.equity_curve * 100.0, 0.02),
+            (rng.standard_t(3, 5000) * 0.01, None, 0.0),
+            (np.abs(rng.normal(0.01, 0.01, 50)), None, 0.02),
+            (np.round(rng.normal(0, 0.01, 200), 3), None, 0.02),
+            (np.zeros(10), None, 0.02),
+            (np.array([0.01]), None, 0.02),
+            (np.array([0.01, -0.02]), None, 0.02),
+            (np.array([0.01, -0.02, 0.03]), None, 0.02),
+        ]
+        for returns, curve, rf in cases:
+            eq = np.cumprod(1 + returns) if curve is None else curve
+            expected = {
+                'total_return': float((eq[-1] / eq[0]) - 1),
+                'annualized_return': float((1 + (eq[-1] / eq[0] - 1)) ** (252 / len(returns)) - 1),
+                'volatility': volatility(returns, 252),
+                'sharpe_ratio': sharpe(returns, rf, 252),
+                'sortino_ratio': sortino(returns, rf, 252),
+                'max_drawdown': max_drawdown(eq),
+                'max_drawdown_duration': max_drawdown_duration(eq),
+                'hit_rate': hit_rate(returns),
+                'profit_factor': profit_factor(returns),
+                'calmar_ratio': calmar_ratio(returns, 252),
+                'var_95': var(returns, 0.05),
+                'cvar_95': cvar(returns, 0.05),
+                'skewness': skewness(returns),
+                'kurtosis': kurtosis(returns),
+                'num_periods': len(returns),
+                'positive_periods': int((returns > 0).sum()),
+                'negative_periods': int((returns < 0).sum()),
+                'zero_periods': int((returns == 0).sum()),
+            }
+            with np.errstate(invalid='ignore'):
+                metrics = calculate_all_metrics(returns, equity_curve=curve, risk_free_rate=rf)
+            assert metrics.keys() == expected.keys()
+            for key, value in expected.items():
+                assert metrics[key] == value or (np.isnan(value) and np.isnan(metrics[key])), key
+        assert calculate_all_metrics(np.array([])) == {}
+    
+    @pytest.mark.filterwarnings("ignore::RuntimeWarning")
+    def test_calculate_all_metrics_batch(self):
+        """Each row of the batch equals calculate_all_metrics on that series."""
+        import pandas as pd
+        rng = np.random.default_rng(11)
+        for periods in (1, 2, 3, 4, 300):
+            returns = rng.normal(0.001, 0.02, (6, periods))
+            returns[0] = 0.0
+            returns[1] = np.abs(returns[1])
+            returns[2] = -np.abs(returns[2])
+            returns[3, -1] = -0.01
+            for curves in (None, np.cumprod(1 + returns, axis=1) * 2.0):
+                batch = calculate_all_metrics_batch(returns, equity_curves=curves)
+                assert len(batch) == len(returns)
+                for i, row in enumerate(returns):
+                    expected = calculate_all_metrics(row, equity_curve=None if curves is None else curves[i])
+                    assert list(batch.columns) == list(expected)
+                    for key, value in expected.items():
+                        np.testing.assert_allclose(batch[key].iloc[i], value, rtol=1e-9, atol=1e-12, err_msg=key)
+        
+        frame = pd.DataFrame(self.returns.reshape(4, 250), index=['a', 'b', 'c', 'd'])
+        assert list(calculate_all_metrics_batch(frame).index) == ['a', 'b', 'c', 'd']
+        with pytest.raises(ValueError):
+            calculate_all_metrics_batch(self.returns)
+    
     def test_calculate_rolling_metrics(self):
         """Test rolling metrics calculation."""
         rolling_metrics = calculate_rolling_metrics(self.returns, window=60)
@@ -132,6 +228,42 @@ class TestEnhancedMetrics:
         assert isinstance(rolling_metrics, np.ndarray) or hasattr(rolling_metrics, 'shape')
         assert len(rolling_metrics) > 0
     
+    @pytest.mark.filterwarnings("ignore::RuntimeWarning")
+    def test_calculate_rolling_metrics_matches_functions(self):
+        """Each rolling column equals its metric function applied to every trailing window."""
+        import pandas as pd
+        returns = self.returns[:300].copy()
+        returns[50:70] = 0.0                            # constant windows
+        returns[100:130] = np.abs(returns[100:130])     # no losses
+        returns[150:160] = -np.abs(returns[150:160])
+        returns[250] = np.nan
+        functions = {
+            'rolling_sharpe': sharpe, 'rolling_volatility': volatility, 'rolling_sortino': sortino,
+            'rolling_hit_rate': hit_rate, 'rolling_profit_factor': profit_factor,
+        }
+        series = pd.Series(returns)
+        for window in (1, 2, 20):
+            rolling_metrics = calculate_rolling_metrics(returns, window=window)
+            for column, fn in functions.items():
+                expected = series.rolling(window).apply(lambda x: fn(x.values))
+                np.testing.assert_allclose(rolling_metrics[column], expected, rtol=1e-9, atol=1e-12, err_msg=column)
+            expected = (1 + series).cumprod().rolling(window).apply(lambda x: max_drawdown(x.values))
+            np.testing.assert_allclose(rolling_metrics['rolling_max_dd'], expected, rtol=1e-9, atol=1e-12)
+
+    def test_rolling_max_drawdown_non_positive_equity(self):
+        """Windows where the equity curve goes non-positive still match max_drawdown."""
+        import pandas as pd
+        returns = np.array([-0.8, -1.3, -0.2, 0.4, 1.1, 0.1, -0.6, -0.8])
+        rolling_metrics = calculate_rolling_metrics(returns, window=2)
+        assert rolling_metrics['rolling_max_dd'][2] == 0.0
+        assert rolling_metrics['rolling_max_dd'][6] == 0.0
+        rng = np.random.default_rng(3)
+        returns = np.concatenate([returns, rng.normal(0, 0.5, 200), rng.normal(0, 0.01, 100)])
+        for window in (2, 5, 40):
+            rolling_metrics = calculate_rolling_metrics(returns, window=window)
+            expected = (1 + pd.Series(returns)).cumprod().rolling(window).apply(lambda x: max_drawdown(x.values))
+            np.testing.assert_allclose(rolling_metrics['rolling_max_dd'], expected, rtol=1e-9, atol=1e-12)
+
     def test_edge_cases(self):
         """Test edge cases and error handling."""
         # Empty array
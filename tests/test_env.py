@@ -31,4 +31,16 @@ def test_fees_slippage_signs():
     env.step(bid, ask)
     # With both sides potentially filled, effective prices reduce pnl on buy and increase on sell
     assert env.pnl <= start_pnl + ask  # cannot exceed raw proceeds
-    assert env.inventory in (start_inv, start_inv - 1, start_inv + 1)
\ No newline at end of file
+    assert env.inventory in (start_inv, start_inv - 1, start_inv + 1)
+
+def test_block_rng_reproducible():
+    def run(block_size):
+        env = SimpleLOBEnv(seed=7, market={"vol_regime": {"enabled": True, "switch_prob": 0.1}},
+                           simulation={"rng_block_size": block_size})
+        agent = InventoryAwareMarketMaker(spread=0.1, inventory_sensitivity=0.05)
+        for _ in range(300):
+            env.step(*agent.quote(env.mid_price, env.inventory))
+        return env.pnl, env.inventory, env.mid_price
+
+    assert run(64) == run(64)
+    assert run(64) != run(0)
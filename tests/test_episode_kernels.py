@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from env.episode_kernels import HAS_NUMBA, run_episode
+from env.price_paths import simulate_price_path
+from env.simple_lob_env import SimpleLOBEnv
+from agents.naive_mm import NaiveMarketMaker
+from agents.inventory_mm import InventoryAwareMarketMaker
+from agents.avellaneda_stoikov import AvellanedaStoikovMM
+from agents.mean_reversion_mm import MeanReversionMarketMaker
+from agents.momentum_mm import MomentumMarketMaker
+
+MARKET = {"ou": {"mu": 100.0, "kappa": 0.05, "sigma": 0.5}, "vol_regime": {"enabled": True, "switch_prob": 0.05}}
+EXECUTION = {"base_arrival_rate": 1.2, "alpha": 0.8}
+FEES = {"fee_bps": 1.0, "slippage_bps": 0.5}
+
+
+def make_agents():
+    return [
+        NaiveMarketMaker(spread=0.04),
+        InventoryAwareMarketMaker(spread=0.04, inventory_sensitivity=0.01),
+        AvellanedaStoikovMM(risk_aversion=0.05, base_spread=0.04, inv_penalty=0.002),
+        MeanReversionMarketMaker(target_spread=0.04, kappa=0.2, skew_sensitivity=0.05),
+        MomentumMarketMaker(spread=0.04, window=5, bias=0.01),
+    ]
+
+
+def loop_episode(agent, steps, seed, path, max_inventory):
+    env = SimpleLOBEnv(seed=seed, market=MARKET, execution=EXECUTION, fees=FEES,
+                       max_inventory=max_inventory, price_path=path)
+    for _ in range(steps):
+        if isinstance(agent, AvellanedaStoikovMM):
+            bid, ask = agent.quote(env.mid_price, env.inventory, sigma=env._current_sigma)
+        else:
+            bid, ask = agent.quote(env.mid_price, env.inventory)
+        env.step(bid, ask)
+    return env.history
+
+
+@pytest.mark.parametrize("max_inventory", [10**6, 2])
+def test_kernel_matches_env_loop(max_inventory):
+    # With max_inventory=2 the limits bind and the env skips the draw for a blocked side
+    steps, seed = 400, 11
+    path = simulate_price_path(steps, seed=5, market=MARKET)
+    for agent, fresh in zip(make_agents(), make_agents()):
+        expected = loop_episode(agent, steps, seed, path, max_inventory=max_inventory)
+        got = run_episode(fresh, steps, seed=seed, execution=EXECUTION, fees=FEES,
+                          max_inventory=max_inventory, price_path=path, use_numba=False)
+        if max_inventory == 2:
+            assert np.abs(got.column("inventory")).max() == 2
+        assert len(got) == steps
+        for name in ("bid", "ask", "mid_price", "inventory", "executed_bid", "executed_ask", "pnl", "sigma"):
+            np.testing.assert_allclose(got.column(name), expected.column(name), rtol=1e-12, atol=1e-9, err_msg=name)
+
+
+def test_inventory_limit_respected():
+    hist = run_episode(NaiveMarketMaker(spread=0.0), 2000, seed=3, market=MARKET, max_inventory=3, use_numba=False)
+    assert np.abs(hist.column("inventory")).max() <= 3
+
+
+@pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+def test_numba_matches_python():
+    steps = 3000
+    path = simulate_price_path(steps, seed=8, market=MARKET)
+    for agent in make_agents():
+        py = run_episode(agent, steps, seed=2, execution=EXECUTION, fees=FEES, price_path=path, use_numba=False)
+        nb = run_episode(agent, steps, seed=2, execution=EXECUTION, fees=FEES, price_path=path, use_numba=True)
+        for name in py.FIELDS:
+            np.testing.assert_allclose(nb.column(name), py.column(name), rtol=1e-12, atol=1e-12, err_msg=name)
+
+
+def test_unknown_agent_rejected():
+    with pytest.raises(TypeError):
+        run_episode(object(), 10, seed=0)
+
+
+@pytest.mark.parametrize("simulation", [None, {"rng_block_size": 64}])
+def test_grid_cell_runs_in_kernel_with_env_results(simulation, monkeypatch):
+    from experiments import grid_search_inventory_mm
+    from experiments.grid_search_inventory_mm import run_simulation
+    from utils.metrics import MetricsAccumulator
+    # Take the kernel path even without numba (run_episode then runs the Python loop)
+    monkeypatch.setattr(grid_search_inventory_mm, "HAS_NUMBA", True)
+    steps, seed = 600, 4
+    path = simulate_price_path(steps, seed=9, market=MARKET)
+    got = run_simulation(0.02, 0.005, steps, seed=seed, market=MARKET, execution=EXECUTION, fees=FEES,
+                         simulation=simulation, price_path=path)
+    env = SimpleLOBEnv(seed=seed, market=MARKET, execution=EXECUTION, fees=FEES, simulation=simulation,
+                       price_path=path, record_history=False)
+    agent = InventoryAwareMarketMaker(spread=0.02, inventory_sensitivity=0.005)
+    acc = MetricsAccumulator()
+    for _ in range(steps):
+        acc.update_from_step(env.step(*agent.quote(env.mid_price, env.inventory)))
+    expected = acc.summary()
+    assert got['trades'] == expected['trades'] and got['final_inventory'] == expected['final_inventory']
+    for key in ('final_pnl', 'std_inventory', 'sharpe', 'max_drawdown', 'hit_rate', 'fill_rate'):
+        assert np.isclose(got[key], expected[key], rtol=1e-9, atol=1e-12), key
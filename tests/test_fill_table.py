@@ -0,0 +1,52 @@
+import numpy as np
+from env.fill_table import FillProbabilityTable
+from env.simple_lob_env import SimpleLOBEnv
+from env.multi_asset_env import MultiAssetEnv
+
+
+def test_lookup_matches_exact_on_and_off_grid():
+    table = FillProbabilityTable(base_rate=1.2, alpha=0.8, size_sensitivity=0.1)
+    for dist, size in [(0.0, 0.0), (5.0, 1.0), (5.0000000001, 0.3), (3.37, 1.0), (400.0, 2.0), (4.0, 0.6667)]:
+        assert np.isclose(table.lookup(dist, size), float(table.exact(dist, size)), rtol=1e-9, atol=0.0)
+    dist = np.array([[0.0, 2.5, 7.0], [1.0, 300.0, 2.0]])
+    size = np.array([[1.0, 1.0, 0.25], [0.0, 1.0, 1.5]])
+    np.testing.assert_allclose(table.lookup_array(dist, size), table.exact(dist, size), rtol=1e-9)
+
+
+def test_lookup_off_table_distances_use_exact():
+    for table in (FillProbabilityTable(base_rate=1.0, alpha=0.5), FillProbabilityTable(base_rate=1.0, alpha=0.5, size_sensitivity=0.1)):
+        assert table.lookup(float('inf'), 1.0) == 0.0  # quote pulled
+        assert np.isnan(table.lookup(float('nan'), 1.0))
+        assert np.isclose(table.lookup(-2.0, 1.0), float(table.exact(-2.0, 1.0)))
+        assert table.lookup(-2.0, 1.0) > 0.5
+        dist = np.array([float('inf'), float('nan'), -2.0, -1.0, 3.0])
+        got = table.lookup_array(dist, 1.0)
+        np.testing.assert_allclose(got, table.exact(dist, 1.0), equal_nan=True)
+    env = SimpleLOBEnv(seed=0)
+    env.step(env.mid_price - 0.05, float('inf'))
+    assert env.history[-1]['executed_ask'] is None
+
+
+def test_env_tables_rebuild_on_param_change():
+    env = SimpleLOBEnv(seed=0)
+    mid = env.mid_price
+    p_default = env._fill_probability(mid + 0.05, side='sell')
+    env.exec_alpha = 0.0
+    assert env._fill_probability(mid + 0.05, side='sell') > p_default
+
+    menv = MultiAssetEnv(seed=0)
+    p1 = menv._p_fill(100.05, 100.0, 1.0)
+    menv.size_sensitivity = 2.0
+    assert menv._p_fill(100.05, 100.0, 1.0) < p1
+
+
+def test_multi_asset_step_uses_table():
+    menv = MultiAssetEnv(seed=0)
+    table = menv._get_fill_table()
+    table.table[:] = 0.0  # on-grid quotes read the table, so none of them can fill
+    mid = menv.mid.copy()
+    tick = menv.tick_size
+    bids = [[(m - k * tick, 1.0) for k in range(1, menv.depth_levels + 1)] for m in mid]
+    asks = [[(m + k * tick, 1.0) for k in range(1, menv.depth_levels + 1)] for m in mid]
+    rec = menv.step(bids, asks)
+    assert not rec["bid_fills"].any() and not rec["ask_fills"].any()
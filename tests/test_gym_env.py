@@ -18,4 +18,26 @@ def test_gym_env_step_contract():
     assert obs2.shape == (3,)
     assert isinstance(reward, float)
     assert isinstance(terminated, bool)
-    assert isinstance(truncated, bool)
\ No newline at end of file
+    assert isinstance(truncated, bool)
+
+
+def test_multi_asset_action_decoding_matches_ladder_loop():
+    import numpy as np
+    from env.multi_asset_gym import MultiAssetGymEnv
+
+    env = MultiAssetGymEnv({"multi_asset": {"num_assets": 3, "depth_levels": 4, "level_widen": 0.05}})
+    env.reset(seed=0)
+    action = np.random.default_rng(1).uniform(0.0, 0.5, size=env.action_space.shape).astype(np.float32)
+    bids, asks = env._decode_action(action)
+    assert bids.shape == asks.shape == (3, 4, 2)
+    per_asset = 2 + env.depth_levels
+    for a in range(env.num_assets):
+        block = action[a * per_asset:(a + 1) * per_asset]
+        mid = float(env.env.mid[a])
+        for k in range(env.depth_levels):
+            half = (float(block[0]) + float(block[1]) + env.level_widen * k) / 2.0
+            assert bids[a, k, 0] == mid - half and asks[a, k, 0] == mid + half
+            assert bids[a, k, 1] == asks[a, k, 1] == float(block[2 + k])
+    obs, reward, terminated, truncated, info = env.step(action)
+    assert obs.shape == (9,)
+    assert isinstance(reward, float)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from env.history import HistoryBuffer
+from env.simple_lob_env import SimpleLOBEnv
+
+
+def test_buffer_grows_and_returns_legacy_rows():
+    buf = HistoryBuffer(capacity=2)
+    for t in range(5):
+        buf.append(t, 99.9, 100.1, 100.0, t, None if t % 2 else 99.9, None, float(t), 0.5)
+    assert len(buf) == 5
+    assert buf[-1]['time'] == 4
+    assert buf[-1]['executed_bid'] == 99.9
+    assert buf[1]['executed_bid'] is None
+    assert np.isnan(buf.column('executed_bid')[1])
+    assert buf.column('inventory').dtype == np.int64
+
+
+def test_to_frame_is_zero_copy():
+    buf = HistoryBuffer()
+    for t in range(10):
+        buf.append(t, 1.0, 2.0, 1.5, 0, None, 2.0, float(t), 0.5)
+    df = buf.to_frame(copy=False)
+    assert list(df.columns) == list(HistoryBuffer.FIELDS)
+    assert np.shares_memory(df['pnl'].to_numpy(), buf.column('pnl'))
+    assert df['executed_ask'].notna().sum() == 10
+
+
+def test_to_frame_default_is_writable_copy():
+    buf = HistoryBuffer()
+    for t in range(10):
+        buf.append(t, 1.0, 2.0, 1.5, 0, None, 2.0, float(t), 0.5)
+    df = buf.to_frame()
+    assert list(df.columns) == list(HistoryBuffer.FIELDS)
+    assert not np.shares_memory(df['pnl'].to_numpy(), buf.column('pnl'))
+    df.loc[0, 'pnl'] = 5.0
+    df['inventory'] += 1
+    assert df.loc[0, 'pnl'] == 5.0 and buf[0]['pnl'] == 0.0 and buf[0]['inventory'] == 0
+
+
+def test_env_history_compat():
+    env = SimpleLOBEnv(seed=3)
+    for _ in range(50):
+        rec = env.step(env.mid_price - 0.05, env.mid_price + 0.05)
+    assert rec == env.history[-1]
+    legacy = pd.DataFrame(env.history.to_list())
+    df = env.history.to_frame()
+    for col in ('time', 'mid_price', 'inventory', 'pnl'):
+        np.testing.assert_array_equal(legacy[col].to_numpy(), df[col].to_numpy())
+    assert legacy['executed_bid'].notna().sum() == df['executed_bid'].notna().sum()
+    env.reset()
+    assert len(env.history) == 0
@@ -0,0 +1,57 @@
+import pytest
+
+optuna = pytest.importorskip("optuna")
+pytest.importorskip("mlflow")
+
+from experiments.hyperopt import optimize  # noqa: E402
+
+
+def test_hyperopt_resumes_from_journal(tmp_path):
+    cfg = {
+        "seed": 1,
+        "steps": 200,
+        "risk": {"max_drawdown": 1e9},
+        "hyperopt": {"n_trials": 4, "workers": 2, "storage": str(tmp_path / "study.journal"), "report_every": 50},
+    }
+    study = optimize(cfg)
+    assert len(study.trials) == 4
+    cfg["hyperopt"]["n_trials"] = 6
+    cfg["hyperopt"]["workers"] = 1
+    study = optimize(cfg)
+    assert len(study.trials) == 6
+    assert all(t.state.is_finished() for t in study.trials)
+
+
+def test_hyperopt_changed_objective_starts_new_study(tmp_path):
+    from experiments.hyperopt import create_study
+    cfg = {
+        "seed": 1,
+        "steps": 100,
+        "risk": {"max_drawdown": 1e9},
+        "hyperopt": {"n_trials": 2, "storage": str(tmp_path / "study.journal"), "report_every": 0},
+    }
+    optimize(cfg)
+    # A trial left RUNNING by another worker (fresh) or by a killed run (stale)
+    create_study(cfg).ask()
+    study = optimize(cfg)
+    assert [t.state for t in study.trials].count(optuna.trial.TrialState.RUNNING) == 1
+    cfg["hyperopt"]["stale_trial_seconds"] = 0.0
+    study = optimize(cfg)
+    assert [t.state for t in study.trials].count(optuna.trial.TrialState.FAIL) == 1
+    assert not any(t.state == optuna.trial.TrialState.RUNNING for t in study.trials)
+    cfg["steps"] = 150
+    study = optimize(cfg)
+    assert len(study.trials) == 2 and all(t.state.is_finished() for t in study.trials)
+    assert len(optuna.get_all_study_names(study._storage)) == 2
+
+
+def test_reported_trials_refresh_heartbeat(tmp_path):
+    from experiments.hyperopt import create_study, fail_stale_trials, run_sim
+    cfg = {"seed": 1, "steps": 100, "risk": {"max_drawdown": 1e9},
+           "hyperopt": {"storage": str(tmp_path / "study.journal"), "pruning": False}}
+    study = create_study(cfg)
+    trial = study.ask()
+    run_sim(cfg, 0.1, 0.01, 100, trial=trial, report_every=10)
+    assert "heartbeat" in study.trials[0].user_attrs
+    assert fail_stale_trials(study, stale_after=60.0) == 0
+    assert fail_stale_trials(study, stale_after=-1.0) == 1
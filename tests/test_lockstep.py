@@ -0,0 +1,67 @@
+from env.simple_lob_env import SimpleLOBEnv
+from env.price_paths import path_seed, simulate_price_path
+from agents.naive_mm import NaiveMarketMaker
+from agents.inventory_mm import InventoryAwareMarketMaker
+from agents.avellaneda_stoikov import AvellanedaStoikovMM
+from agents.momentum_mm import MomentumMarketMaker
+from experiments.lockstep import evaluate_lockstep, METRIC_KEYS
+from utils.cache import ResultCache
+from utils.metrics import MetricsAccumulator
+
+CFG = {
+    "seed": 3,
+    "market": {"ou": {"mu": 100.0, "kappa": 0.05, "sigma": 0.5}, "vol_regime": {"enabled": True, "switch_prob": 0.02}},
+    "execution": {"base_arrival_rate": 1.0},
+    "fees": {"fee_bps": 1.0},
+}
+STEPS = 400
+
+
+def agents():
+    return {
+        "naive": NaiveMarketMaker(spread=0.1),
+        "rb": InventoryAwareMarketMaker(spread=0.08, inventory_sensitivity=0.03),
+        "as": AvellanedaStoikovMM(risk_aversion=0.1, base_spread=0.1, inv_penalty=0.05),
+        "mom": MomentumMarketMaker(spread=0.12, window=20, bias=0.05),
+    }
+
+
+def solo(agent, path, sigma_aware=False):
+    env = SimpleLOBEnv(seed=CFG["seed"], market=CFG["market"], execution=CFG["execution"], fees=CFG["fees"], price_path=path)
+    acc = MetricsAccumulator()
+    for _ in range(STEPS):
+        if sigma_aware:
+            bid, ask = agent.quote(env.mid_price, env.inventory, sigma=env._current_sigma)
+        else:
+            bid, ask = agent.quote(env.mid_price, env.inventory)
+        acc.update_from_step(env.step(bid, ask))
+    m = acc.summary()
+    return {k: m[k] for k in METRIC_KEYS}
+
+
+def test_lockstep_matches_independent_runs():
+    path = simulate_price_path(STEPS, seed=path_seed(CFG["seed"]), market=CFG["market"])
+    res = evaluate_lockstep(CFG, agents(), STEPS, price_path=path)
+    assert list(res) == ["naive", "rb", "as", "mom"]
+    for name, agent in agents().items():
+        assert res[name] == solo(agent, path, sigma_aware=(name == "as"))
+    # The default path comes from the same independent child stream, not the fill seed
+    assert evaluate_lockstep(CFG, agents(), STEPS) == res
+
+
+def test_lockstep_parallel_matches_serial():
+    serial = evaluate_lockstep(CFG, agents(), STEPS, workers=1)
+    parallel = evaluate_lockstep(CFG, agents(), STEPS, workers=2, parallel_threshold=2)
+    assert serial == parallel
+
+
+def test_lockstep_uses_cache(tmp_path):
+    cache = ResultCache(tmp_path)
+    first = evaluate_lockstep(CFG, agents(), STEPS, cache=cache)
+    poisoned = {k: -1.0 for k in METRIC_KEYS}
+    key = next(p.name for p in tmp_path.glob("*/*"))
+    cache.put(key, poisoned)
+    again = evaluate_lockstep(CFG, agents(), STEPS, cache=cache)
+    assert poisoned in again.values()
+    assert sum(r == poisoned for r in again.values()) == 1
+    assert sum(first[n] == again[n] for n in first) == len(first) - 1
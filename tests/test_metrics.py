@@ -9,4 +9,34 @@ def test_metrics_basic():
     dd = max_drawdown(np.cumsum(r))
     assert dd <= 0
     hr = hit_rate(r)
-    assert 0 <= hr <= 1
\ No newline at end of file
+    assert 0 <= hr <= 1
+
+def test_metrics_accumulator_matches_posthoc():
+    import pandas as pd
+    from env.simple_lob_env import SimpleLOBEnv
+    from utils.metrics import MetricsAccumulator, sharpe, max_drawdown, hit_rate
+
+    env = SimpleLOBEnv(seed=3, fees={"fee_bps": 1.0})
+    acc = MetricsAccumulator()
+    for _ in range(2000):
+        acc.update_from_step(env.step(env.mid_price - 0.03 + 0.01 * env.inventory, env.mid_price + 0.03 + 0.01 * env.inventory))
+    df = env.history.to_frame()
+    returns = df['pnl'].diff().fillna(0.0).values
+    m = acc.summary()
+    assert m['final_pnl'] == df['pnl'].iloc[-1]
+    assert m['final_inventory'] == df['inventory'].iloc[-1]
+    assert np.isclose(m['std_inventory'], df['inventory'].std())
+    assert np.isclose(m['sharpe'], sharpe(returns))
+    assert np.isclose(m['max_drawdown'], max_drawdown(df['pnl'].values))
+    assert m['hit_rate'] == hit_rate(returns)
+    assert m['trades'] == int(df[['executed_bid', 'executed_ask']].notna().sum().sum())
+    assert acc.min_inventory == df['inventory'].min() and acc.max_inventory == df['inventory'].max()
+
+
+def test_env_without_history():
+    from env.simple_lob_env import SimpleLOBEnv
+
+    env = SimpleLOBEnv(seed=0, record_history=False)
+    rec = env.step(99.9, 100.1)
+    assert rec['time'] == 1
+    assert len(env.history) == 0
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+import pandas as pd
+from agents.naive_mm import NaiveMarketMaker
+from agents.momentum_mm import MomentumMarketMaker
+from experiments.monte_carlo import run_monte_carlo, summarize, save_summary, seed_sequence
+
+CFG = {"seed": 5, "market": {"ou": {"mu": 100.0, "kappa": 0.05, "sigma": 0.5}, "vol_regime": {"enabled": True, "switch_prob": 0.02}}}
+
+
+def agents():
+    return {"naive": NaiveMarketMaker(spread=0.1), "mom": MomentumMarketMaker(spread=0.12, window=20, bias=0.05)}
+
+
+def test_seed_sequence_matches_spawn():
+    children = np.random.SeedSequence(123).spawn(4)
+    assert seed_sequence(123, 3).generate_state(4).tolist() == children[3].generate_state(4).tolist()
+
+
+def test_monte_carlo_reproducible_and_chunking_independent():
+    a = run_monte_carlo(CFG, agents(), steps=200, n_seeds=6, seed=11, workers=1, chunk_size=1)
+    b = run_monte_carlo(CFG, agents(), steps=200, n_seeds=6, seed=11, workers=2, chunk_size=4)
+    pd.testing.assert_frame_equal(a, b)
+    assert len(a) == 12
+    assert a.groupby("agent")["seed"].apply(list).to_dict() == {"naive": list(range(6)), "mom": list(range(6))}
+    # Independent streams: episodes differ across seeds
+    assert a[a.agent == "mom"]["final_pnl"].nunique() > 1
+
+
+def test_summarize_and_save(tmp_path):
+    per_seed = run_monte_carlo(CFG, agents(), steps=200, n_seeds=20, seed=1, workers=1)
+    summary = summarize(per_seed, n_boot=200)
+    assert list(summary.columns) == ["agent", "metric", "n", "mean", "std", "stderr", "ci_low", "ci_high"]
+    row = summary[(summary.agent == "mom") & (summary.metric == "final_pnl")].iloc[0]
+    assert row.n == 20
+    assert row.ci_low <= row["mean"] <= row.ci_high
+    assert np.isclose(row.stderr, per_seed[per_seed.agent == "mom"]["final_pnl"].std() / np.sqrt(20))
+
+
+def test_save_summary_writes_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    summary = summarize(run_monte_carlo(CFG, agents(), steps=50, n_seeds=4, seed=1, workers=1), n_boot=50)
+    out = save_summary(summary, tmp_path / "mc" / "summary.parquet")
+    assert out == tmp_path / "mc" / "summary.parquet"
+    pd.testing.assert_frame_equal(pd.read_parquet(out), summary.reset_index(drop=True))
@@ -0,0 +1,37 @@
+import numpy as np
+from env.multi_asset_env import MultiAssetEnv
+
+
+def test_vectorized_step_accepts_lists_and_arrays():
+    env = MultiAssetEnv(num_assets=2, depth_levels=3, seed=0)
+    ladder = [[(99.95 - 0.01 * k, 1.0) for k in range(3)] for _ in range(2)]
+    rec = env.step(ladder, [[(100.05 + 0.01 * k, 1.0) for k in range(3)] for _ in range(2)])
+    assert rec["executed"]["bids"].shape == (2, 3)
+    assert rec["bid_fills"].dtype == bool
+    rec = env.step(np.asarray(ladder), np.asarray(ladder) + [0.1, 0.0])
+    assert rec["inventory"].shape == (2,)
+
+
+def test_forced_fills_update_inventory_and_pnl():
+    env = MultiAssetEnv(num_assets=3, depth_levels=2, seed=1, fees={"maker_bps": 0.0})
+    env.base_rate = 1e9
+    env.alpha = 0.0
+    env.size_sensitivity = 0.0
+    bids = np.zeros((3, 2, 2))
+    asks = np.zeros((3, 2, 2))
+    bids[..., 0], bids[..., 1] = 99.0, 2.5
+    asks[..., 0], asks[..., 1] = 101.0, 1.0
+    asks[2, :, 1] = 0.0  # no ask size on the last asset
+    rec = env.step(bids, asks)
+    # int(2.5) = 2 units bought per level, 1 sold per level where size > 0
+    np.testing.assert_array_equal(rec["inventory"], [2, 2, 4])
+    assert np.isclose(rec["pnl"], 4 * 101.0 - 6 * 2.5 * 99.0)
+    assert np.isnan(rec["executed"]["asks"][2]).all()
+
+
+def test_many_assets_levels():
+    env = MultiAssetEnv(num_assets=100, depth_levels=10, seed=0, market={"correlation": np.eye(100).tolist()})
+    quotes = np.stack([np.full((100, 10), 100.0), np.ones((100, 10))], axis=-1)
+    for _ in range(5):
+        rec = env.step(quotes - [0.05, 0.0], quotes + [0.05, 0.0])
+    assert rec["bid_fills"].shape == (100, 10)
@@ -0,0 +1,17 @@
+from utils.parallel import parallel_map, resolve_workers
+
+
+def square(x):
+    return x * x
+
+
+def test_parallel_map_preserves_order():
+    items = list(range(23))
+    expected = [square(x) for x in items]
+    assert parallel_map(square, items, workers=2, chunk_size=4) == expected
+    assert parallel_map(square, items, workers=1) == expected
+
+
+def test_resolve_workers_auto():
+    assert resolve_workers(0) >= 1
+    assert resolve_workers(3) == 3
@@ -0,0 +1,61 @@
+import numpy as np
+from env.price_paths import ar1_filter, path_seed, simulate_price_path, simulate_multi_asset_path
+from env.simple_lob_env import SimpleLOBEnv
+from env.multi_asset_env import MultiAssetEnv
+from env.batched_lob_env import BatchedLOBEnv
+
+MARKET = {"ou": {"mu": 100.0, "kappa": 0.05, "sigma": 0.5}, "vol_regime": {"enabled": True, "switch_prob": 0.05}}
+
+
+def test_ar1_filter_matches_loop():
+    rng = np.random.default_rng(0)
+    eps = rng.standard_normal((5000, 3))
+    for phi in (0.95, 0.5, -0.7, 1.0):
+        expected = np.empty_like(eps)
+        x = np.full(3, 2.0)
+        for t in range(len(eps)):
+            x = phi * x + eps[t]
+            expected[t] = x
+        np.testing.assert_allclose(ar1_filter(eps, phi, x0=2.0), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_path_statistics_match_env():
+    n, steps = 400, 300
+    path = simulate_price_path(steps, seed=1, market=MARKET, num_paths=n)
+    assert path.mid.shape == (steps, n)
+    env = BatchedLOBEnv(num_envs=n, seed=2, market=MARKET)
+    for _ in range(steps):
+        env.step(env.mid_price - 1.0, env.mid_price + 1.0)
+    se = np.sqrt(path.mid[-1].var(ddof=1) / n + env.mid_price.var(ddof=1) / n)
+    assert abs(path.mid[-1].mean() - env.mid_price.mean()) < 4 * se
+    assert abs(path.mid[-1].std() / env.mid_price.std() - 1.0) < 0.2
+
+
+def test_envs_follow_shared_path():
+    steps = 50
+    path = simulate_price_path(steps, seed=3, market=MARKET)
+    pnls = []
+    for spread in (0.0, 0.04):
+        env = SimpleLOBEnv(seed=4, market=MARKET, price_path=path)
+        for _ in range(steps):
+            env.step(env.mid_price - spread / 2, env.mid_price + spread / 2)
+        np.testing.assert_array_equal(env.history.column('mid_price'), path.mid)
+        pnls.append(env.pnl)
+    assert pnls[0] != pnls[1]
+
+    mpath = simulate_multi_asset_path(steps, num_assets=2, seed=3, market=MARKET)
+    menv = MultiAssetEnv(num_assets=2, depth_levels=1, seed=4, market=MARKET, price_path=mpath)
+    ladder = np.array([[[99.9, 1.0]], [[99.9, 1.0]]])
+    for _ in range(steps):
+        rec = menv.step(ladder, ladder + [0.2, 0.0])
+    np.testing.assert_array_equal(rec["mid"], mpath.mid[-1])
+
+
+def test_path_seed_is_independent_of_fill_stream():
+    # The env draws fills from default_rng(seed); the path must not replay those uniforms
+    fills = np.random.default_rng(7).random(400)
+    path_uniforms = np.random.default_rng(path_seed(7)).random(400)
+    assert not np.any(np.isin(path_uniforms, fills))
+    a = simulate_price_path(200, seed=path_seed(7), market=MARKET)
+    b = simulate_price_path(200, seed=path_seed(7), market=MARKET)
+    np.testing.assert_array_equal(a.mid, b.mid)
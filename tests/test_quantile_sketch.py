@@ -0,0 +1,44 @@
+import pickle
+
+import numpy as np
+
+from utils.metrics import QuantileSketch, sketch_var, sketch_cvar, var, cvar
+
+
+def test_small_sketch_is_exact():
+    x = np.random.default_rng(0).normal(0, 0.01, 150)
+    sketch = QuantileSketch().update(x)
+    for q in (0.0, 0.01, 0.05, 0.5, 1.0):
+        assert sketch.quantile(q) == np.percentile(x, q * 100)
+    assert np.isclose(sketch.tail_mean(0.05), cvar(x, 0.05))
+
+
+def test_rank_error_within_bound():
+    x = np.random.default_rng(1).standard_t(4, 500_000) * 0.01
+    sketch = QuantileSketch(compression=200).update(x)
+    assert sketch.count == x.size and sketch._means.size <= 200
+    ordered = np.sort(x)
+    for q in (0.001, 0.01, 0.05, 0.25, 0.5, 0.95, 0.999):
+        rank = np.searchsorted(ordered, sketch.quantile(q)) / x.size
+        assert abs(rank - q) <= np.pi * np.sqrt(q * (1 - q)) / 200 + 1e-5
+    assert abs(sketch.tail_mean(0.05) / cvar(x, 0.05) - 1) < 0.005
+
+
+def test_merged_partial_sketches_match_whole_series():
+    x = np.random.default_rng(2).normal(0.0, 0.02, 200_000)
+    # Partial sketches as they would come back from worker processes
+    parts = [pickle.loads(pickle.dumps(QuantileSketch().update(chunk))) for chunk in np.array_split(x, 9)]
+    counts = [p.count for p in parts]
+    assert abs(sketch_var(parts) / var(x) - 1) < 0.01
+    assert abs(sketch_cvar(parts) / cvar(x) - 1) < 0.01
+    assert [p.count for p in parts] == counts  # inputs are not modified
+    merged = QuantileSketch().merge(*parts)
+    assert merged.count == x.size and merged.min == x.min() and merged.max == x.max()
+
+
+def test_empty_and_nan():
+    assert sketch_var(QuantileSketch()) == 0.0
+    assert sketch_cvar([]) == 0.0
+    assert np.isnan(QuantileSketch().quantile(0.5))
+    sketch = QuantileSketch().update([np.nan, 1.0, np.nan, 3.0])
+    assert sketch.count == 2 and sketch.quantile(0.5) == 2.0
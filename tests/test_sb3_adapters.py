@@ -0,0 +1,57 @@
+import functools
+import numpy as np
+import pytest
+
+pytest.importorskip("stable_baselines3")
+
+from stable_baselines3 import PPO
+from env.gym_env import MarketMakingGymEnv
+from env.vector_env import MarketMakingSB3VecEnv
+from env.shm_vec_env import SB3SharedMemoryVecEnv
+
+CFG = {"steps": 8, "seed": 0}
+
+
+def make_adapters():
+    return [
+        MarketMakingSB3VecEnv(CFG, num_envs=4),
+        SB3SharedMemoryVecEnv(functools.partial(MarketMakingGymEnv, CFG), num_workers=2, envs_per_worker=2, seed=0),
+    ]
+
+
+def test_sb3_adapters_step_contract():
+    for venv in make_adapters():
+        try:
+            assert venv.env_method("seed", 5) == [5, 6, 7, 8]
+            assert venv.env_method("render", indices=[0, 2]) == [None, None]
+            obs = venv.reset()
+            assert obs.shape == (4, 3)
+            for t in range(10):
+                venv.step_async(np.full((4, 2), 0.05, dtype=np.float32))
+                obs, rewards, dones, infos = venv.step_wait()
+                assert obs.shape == (4, 3) and rewards.dtype == np.float32 and len(infos) == 4
+                if t == 7:
+                    assert dones.all()
+                    assert all(info["TimeLimit.truncated"] and "terminal_observation" in info for info in infos)
+            assert venv.env_is_wrapped(object) == [False] * 4
+        finally:
+            venv.close()
+
+
+def test_sb3_shm_env_method_reaches_lanes():
+    venv = make_adapters()[1]
+    try:
+        obs = venv.reset()
+        lane_obs = venv.env_method("_get_obs", indices=[2, 1])
+        np.testing.assert_allclose(lane_obs[0], obs[2])
+        np.testing.assert_allclose(lane_obs[1], obs[1])
+    finally:
+        venv.close()
+
+
+def test_ppo_learns_on_adapters():
+    for venv in make_adapters():
+        try:
+            PPO("MlpPolicy", venv, n_steps=16, batch_size=32, n_epochs=1, verbose=0).learn(total_timesteps=64)
+        finally:
+            venv.close()
@@ -0,0 +1,53 @@
+import functools
+import numpy as np
+import pytest
+
+try:
+    from env.gym_env import MarketMakingGymEnv
+    from env.shm_vec_env import SharedMemoryVecEnv
+    HAS_GYM = True
+except Exception:
+    HAS_GYM = False
+
+pytestmark = pytest.mark.skipif(not HAS_GYM, reason="gymnasium not available")
+
+
+def test_shm_vec_env_matches_serial_envs():
+    cfg = {"steps": 4}
+    venv = SharedMemoryVecEnv(functools.partial(MarketMakingGymEnv, cfg), num_workers=2, envs_per_worker=2, seed=10)
+    try:
+        obs, _ = venv.reset()
+        assert obs.shape == (4, 3)
+        envs = [MarketMakingGymEnv(cfg) for _ in range(4)]
+        for i, env in enumerate(envs):
+            env.reset(seed=10 + i)
+        rng = np.random.default_rng(0)
+        for t in range(6):
+            actions = rng.uniform(0.0, 0.1, size=(4, 2)).astype(np.float32)
+            obs, rewards, terminated, truncated, info = venv.step(actions)
+            for i, env in enumerate(envs):
+                o, r, te, tr, _ = env.step(actions[i])
+                assert truncated[i] == tr
+                if tr:
+                    np.testing.assert_allclose(info["final_obs"][i], o)
+                    o, _ = env.reset()
+                np.testing.assert_allclose(obs[i], o)
+                assert rewards[i] == pytest.approx(r)
+    finally:
+        venv.close()
+
+
+def test_shm_vec_env_call_reaches_worker_envs():
+    cfg = {"steps": 4}
+    venv = SharedMemoryVecEnv(functools.partial(MarketMakingGymEnv, cfg), num_workers=2, envs_per_worker=2, seed=10)
+    try:
+        obs, _ = venv.reset()
+        lane_obs = venv.call("_get_obs")
+        assert len(lane_obs) == 4
+        for i in range(4):
+            np.testing.assert_allclose(lane_obs[i], obs[i])
+        assert venv.call("max_steps", indices=[3, 0]) == (4, 4)
+        with pytest.raises(RuntimeError):
+            venv.call("no_such_method")
+    finally:
+        venv.close()
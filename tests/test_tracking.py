@@ -0,0 +1,166 @@
+import subprocess
+import sys
+import time
+import pytest
+
+from utils.tracking import Tracker, get_tracker
+
+
+def test_off_mode_is_noop_without_mlflow():
+    code = ("import sys; from utils.tracking import Tracker; t = Tracker(mode='off'); t.log_params({'a': 1}); "
+            "t.log_metrics({'m': 1.0}); t.log_artifacts('.'); t.close(); print(t.run_id, 'mlflow' in sys.modules)")
+    out = subprocess.check_output([sys.executable, "-c", code]).decode().split()
+    assert out == ["None", "False"]
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        get_tracker({"tracking": {"mode": "later"}}, "x")
+
+
+@pytest.mark.parametrize("mode", ["async", "sync"])
+def test_tracker_batches_and_dedupes(tmp_path, monkeypatch, mode):
+    pytest.importorskip("mlflow")
+    from mlflow.tracking import MlflowClient
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    run_dir = tmp_path / "run"
+    (run_dir / "sub").mkdir(parents=True)
+    (run_dir / "a.csv").write_text("x\n1\n")
+    (run_dir / "sub" / "b.txt").write_text("b")
+
+    calls = []
+    client = MlflowClient()
+    original = client.log_artifact
+    monkeypatch.setattr(client, "log_artifact", lambda *a, **k: (calls.append(a[1]), original(*a, **k)))
+    tracker = Tracker("exp", "run", mode=mode, batch_size=1000, flush_interval=60.0, client=client)
+    tracker.log_params({f"p{i}": i for i in range(150)})
+    tracker.log_metrics({"m": 1.5, "skip": None})
+    tracker.log_artifact(run_dir / "a.csv")
+    tracker.log_artifacts(run_dir)
+    tracker.close(wait=True)
+
+    assert tracker.errors == []
+    run = client.get_run(tracker.run_id)
+    assert run.info.status == "FINISHED"
+    assert len(run.data.params) == 150 and run.data.metrics == {"m": 1.5}
+    assert sorted(calls) == sorted([str(run_dir / "a.csv"), str(run_dir / "sub" / "b.txt")])
+    assert [a.path for a in client.list_artifacts(tracker.run_id, "sub")] == ["sub/b.txt"]
+
+
+def test_tracker_marks_failed_run(tmp_path, monkeypatch):
+    pytest.importorskip("mlflow")
+    from mlflow.tracking import MlflowClient
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    with pytest.raises(RuntimeError):
+        with Tracker("exp", "boom") as tracker:
+            raise RuntimeError("boom")
+    tracker.join()
+    assert MlflowClient().get_run(tracker.run_id).info.status == "FAILED"
+
+
+def test_write_run_id_does_not_wait_for_run(tmp_path, monkeypatch):
+    pytest.importorskip("mlflow")
+    import threading
+    from mlflow.tracking import MlflowClient
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    client = MlflowClient()
+    release = threading.Event()
+    create_run = client.create_run
+    monkeypatch.setattr(client, "create_run", lambda *a, **k: (release.wait(10), create_run(*a, **k))[1])
+    tracker = Tracker("exp", "slow", client=client)
+    path = tmp_path / "mlflow_run_id.txt"
+    tracker.write_run_id(path)
+    assert tracker.started_run_id is None and not path.exists()
+    release.set()
+    tracker.close(wait=True)
+    assert path.read_text() == tracker.started_run_id == tracker.run_id
+    assert [a.path for a in client.list_artifacts(tracker.run_id)] == ["mlflow_run_id.txt"]
+
+
+def test_closed_tracker_leaves_open_set(tmp_path, monkeypatch):
+    pytest.importorskip("mlflow")
+    from utils import tracking
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    tracker = Tracker("exp", "nowait")
+    assert tracker in tracking._open_trackers
+    tracker.close()
+    tracker._thread.join(10)
+    assert tracker not in tracking._open_trackers
+
+
+def test_flush_caps_batches_and_keeps_failed_items():
+    pytest.importorskip("mlflow")
+
+    class FlakyClient:
+        def __init__(self):
+            self.batches, self.fail = [], True
+
+        def log_batch(self, run_id, metrics, params):
+            if self.fail:
+                self.fail = False
+                raise ConnectionError("down")
+            self.batches.append((len(params), len(metrics)))
+
+    tracker = Tracker(mode="off", client=FlakyClient())
+    tracker._run_id = "r"
+    tracker._apply("params", {f"p{i}": str(i) for i in range(150)})
+    tracker._apply("metrics", [(f"m{i}", 1.0, 0, 0) for i in range(1500)])
+    with pytest.raises(ConnectionError):
+        tracker._flush()
+    assert tracker._pending() == 1650
+    tracker._flush()
+    batches = tracker._client.batches
+    assert all(p <= 100 and p + m <= 1000 for p, m in batches)
+    assert sum(p for p, _ in batches) == 150 and sum(m for _, m in batches) == 1500
+    assert tracker._pending() == 0
+
+
+def test_persistent_failures_are_bounded():
+    pytest.importorskip("mlflow")
+    from utils import tracking
+
+    class DownClient:
+        def log_batch(self, run_id, metrics, params):
+            raise ConnectionError("down")
+
+    tracker = Tracker(mode="off", client=DownClient())
+    tracker._run_id = "r"
+    tracker._run_ready.set()
+    for i in range(tracking._MAX_ERRORS + 10):
+        tracker._apply("metrics", [(f"m{i}", 1.0, 0, 0)])
+        tracker._guard(tracker._flush)
+        assert tracker._pending() < tracking._MAX_FLUSH_ATTEMPTS
+    assert len(tracker.errors) == tracking._MAX_ERRORS and tracker.dropped_errors == 10
+
+
+def test_failed_run_start_buffers_nothing():
+    class NoRunClient:
+        def get_experiment_by_name(self, name):
+            raise ConnectionError("no server")
+
+    tracker = Tracker(mode="sync", client=NoRunClient())
+    tracker.log_params({"a": 1})
+    tracker.log_metrics({"m": 1.0})
+    assert tracker.run_id is None and tracker._pending() == 0
+    assert len(tracker.errors) == 1
+
+
+def test_exit_drain_uses_one_deadline(monkeypatch):
+    from utils import tracking
+    timeouts = []
+
+    class Slow:
+        _closed = True
+
+        def join(self, timeout=None):
+            timeouts.append(timeout)
+            time.sleep(min(timeout, 0.1))
+
+    monkeypatch.setattr(tracking, "_DRAIN_TIMEOUT", 0.15)
+    monkeypatch.setattr(tracking, "_open_trackers", {Slow(), Slow(), Slow()})
+    tracking._drain_open_trackers()
+    assert timeouts[0] <= 0.15 and timeouts[-1] == 0.0
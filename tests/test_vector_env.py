@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+try:
+    from env.vector_env import MarketMakingVectorEnv
+    HAS_GYM = True
+except Exception:
+    HAS_GYM = False
+
+pytestmark = pytest.mark.skipif(not HAS_GYM, reason="gymnasium not available")
+
+
+def test_vector_env_step_contract():
+    env = MarketMakingVectorEnv({"steps": 10}, num_envs=4)
+    obs, info = env.reset(seed=0)
+    assert obs.shape == (4, 3)
+    assert env.observation_space.shape == (4, 3)
+    obs2, reward, terminated, truncated, info = env.step(env.action_space.sample())
+    assert obs2.shape == (4, 3)
+    assert reward.shape == (4,)
+    assert terminated.dtype == bool and truncated.dtype == bool
+    assert info["inventory"].shape == (4,)
+
+
+def test_vector_env_clips_and_autoresets():
+    env = MarketMakingVectorEnv({"steps": 5}, num_envs=3)
+    env.reset(seed=1)
+    # Out-of-range offsets are clipped to [0, 0.5]
+    env.step(np.array([[5.0, 5.0], [-1.0, 0.2], [0.1, 0.1]]))
+    for _ in range(3):
+        _, _, _, truncated, _ = env.step(np.full((3, 2), 0.05))
+        assert not truncated.any()
+    obs, _, _, truncated, info = env.step(np.full((3, 2), 0.05))
+    assert truncated.all()
+    assert info["_final_obs"].all()
+    assert info["final_obs"][0].shape == (3,)
+    # Same-step reset: returned observation is the fresh episode
+    np.testing.assert_array_equal(obs[:, 1], 0.0)
+    assert (env.env.time == 0).all()
+
+
+def test_vector_env_reward_matches_pnl():
+    env = MarketMakingVectorEnv({"steps": 100}, num_envs=16)
+    env.reset(seed=2)
+    total = np.zeros(16)
+    penalty = np.zeros(16)
+    for _ in range(50):
+        _, reward, _, _, info = env.step(np.full((16, 2), 0.0))
+        total += reward
+        penalty += 0.01 * np.abs(info["inventory"])
+    np.testing.assert_allclose(total + penalty, info["pnl"], atol=1e-9)
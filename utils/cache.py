@@ -0,0 +1,160 @@
+from __future__ import annotations
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+
+from env.history import HistoryBuffer
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+# Sources whose changes invalidate cached simulation results: the simulator and agents, and
+# the modules that run the episodes and turn them into the cached metrics
+_CODE_DIRS = ('env', 'agents')
+_CODE_FILES = ('utils/metrics.py', 'utils/rng.py', 'utils/cache.py', 'experiments/grid_search_inventory_mm.py', 'experiments/batched_grid.py',
+               'experiments/hyperopt.py', 'experiments/lockstep.py')
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the simulator, agent, metric and episode-runner sources (computed once per process)."""
+    h = hashlib.sha256()
+    files = [p for d in _CODE_DIRS for p in sorted((_REPO_ROOT / d).glob('*.py'))]
+    files += [_REPO_ROOT / f for f in _CODE_FILES]
+    for p in files:
+        if p.exists():
+            h.update(p.relative_to(_REPO_ROOT).as_posix().encode())
+            h.update(p.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _canonical(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        # Arrays (e.g. price paths) are keyed by content, not spelled out
+        return {'__ndarray__': hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest(), 'shape': list(obj.shape), 'dtype': str(obj.dtype)}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, '__dict__') and not isinstance(obj, type):
+        return {'__type__': type(obj).__name__, **_canonical({k: v for k, v in vars(obj).items() if not k.startswith('_')})}
+    return obj
+
+
+def cache_key(**parts: Any) -> str:
+    """sha256 of the canonical JSON of `parts` plus the code version."""
+    payload = json.dumps({'code': code_version(), **_canonical(parts)}, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of simulation results.
+    - Entry `<dir>/<key[:2]>/<key>/` holds `metrics.json` and optionally `history.npz`
+    - Hits refresh the entry mtime; when the cache grows past `max_bytes` the least
+      recently used entries are evicted down to 90% of it
+    - The directory is only rescanned on the first write and when the size estimate (last scan
+      plus bytes written since) passes `max_bytes`; entries removed concurrently by another
+      process are skipped
+    """
+
+    def __init__(self, directory: str | os.PathLike = 'results/.cache', max_bytes: int = 512 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = int(max_bytes)
+        self._size_estimate: Optional[int] = None
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry(key) / 'metrics.json'
+        try:
+            with open(path, 'r') as f:
+                metrics = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        try:
+            os.utime(self._entry(key))
+        except FileNotFoundError:
+            pass  # evicted by another process since the read
+        return metrics
+
+    def get_history(self, key: str) -> Optional[HistoryBuffer]:
+        path = self._entry(key) / 'history.npz'
+        try:
+            with np.load(path) as data:
+                return HistoryBuffer.from_arrays(**{k: data[k] for k in data.files})
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, metrics: Dict[str, Any], history: HistoryBuffer | None = None) -> None:
+        entry = self._entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        if history is not None:
+            np.savez(entry / 'history.npz', **history.as_arrays())
+        # Write metrics last (atomically) so a readable metrics.json marks a complete entry
+        tmp = entry / f'metrics.json.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(metrics, f)
+        os.replace(tmp, entry / 'metrics.json')
+        if self._size_estimate is not None:
+            self._size_estimate += _entry_size(str(entry))
+        if self._size_estimate is None or self._size_estimate > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        total = 0
+        try:
+            shards = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            shards = []
+        for shard in shards:
+            try:
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    size = _entry_size(entry.path)
+                    entries.append((entry.stat().st_mtime, size, entry.path))
+                    total += size
+            except FileNotFoundError:
+                continue  # removed by another process mid-scan
+        if total > self.max_bytes:
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(entries):
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                if total <= target:
+                    break
+        self._size_estimate = total
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._size_estimate = None
+
+
+def _entry_size(path: str) -> int:
+    total = 0
+    try:
+        for f in os.scandir(path):
+            try:
+                if f.is_file():
+                    total += f.stat().st_size
+            except FileNotFoundError:
+                continue
+    except FileNotFoundError:
+        pass
+    return total
+
+
+def get_cache(cfg: Dict[str, Any] | None) -> Optional[ResultCache]:
+    """ResultCache from the `cache` config section, or None when caching is disabled (the default)."""
+    cache_cfg = (cfg or {}).get('cache') or {}
+    if not cache_cfg.get('enabled', False):
+        return None
+    return ResultCache(cache_cfg.get('dir', 'results/.cache'), int(float(cache_cfg.get('max_mb', 512)) * 1024 * 1024))
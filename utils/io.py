@@ -7,9 +7,17 @@ import pandas as pd
 def create_run_dir(base_dir: str = 'results', tag: str = '') -> Path:
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     safe_tag = f'_{tag}' if tag else ''
+    Path(base_dir).mkdir(parents=True, exist_ok=True)
+    # Several in-process runs can start within the same second: suffix instead of sharing a dir
     run_dir = Path(base_dir) / f'{ts}{safe_tag}'
-    run_dir.mkdir(parents=True, exist_ok=True)
-    return run_dir
+    n = 0
+    while True:
+        try:
+            run_dir.mkdir()
+            return run_dir
+        except FileExistsError:
+            n += 1
+            run_dir = Path(base_dir) / f'{ts}{safe_tag}_{n}'
 
 def save_config(cfg: dict, run_dir: Path, name: str = 'config.yaml') -> Path:
     path = run_dir / name
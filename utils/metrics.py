@@ -87,13 +87,26 @@ def max_drawdown(equity_curve: np.ndarray) -> float:
     if equity.size == 1:
         return 0.0
     
-    running_max = np.maximum.accumulate(equity)
+    return _max_drawdown_from(equity, np.maximum.accumulate(equity))
+
+
+def _max_drawdown_from(equity: np.ndarray, running_max: np.ndarray) -> float:
+    if equity.size <= 1:
+        return 0.0
     # Avoid division by zero
     denom = np.where(running_max == 0, 1.0, running_max)
     drawdowns = (equity - running_max) / denom
     return float(drawdowns.min())
 
 
+def _longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of consecutive True values."""
+    if not mask.any():
+        return 0
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).view(np.int8)))
+    return int((edges[1::2] - edges[::2]).max())
+
+
 def max_drawdown_duration(equity_curve: np.ndarray) -> int:
     """
     Calculate the duration of the maximum drawdown in periods.
@@ -108,24 +121,53 @@ def max_drawdown_duration(equity_curve: np.ndarray) -> int:
     if equity.size == 0:
         return 0
     
-    running_max = np.maximum.accumulate(equity)
-    drawdown_periods = equity < running_max
-    
-    if not np.any(drawdown_periods):
-        return 0
-    
-    # Find longest consecutive drawdown period
-    max_duration = 0
-    current_duration = 0
+    return _longest_run(equity < np.maximum.accumulate(equity))
+
+
+def drawdown_episodes(equity_curve: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Every drawdown episode of an equity curve, in order of occurrence.
+
+    An episode is a maximal run of periods below the running peak (the same periods
+    `max_drawdown_duration` counts); its peak is the period just before `start`.
     
-    for in_drawdown in drawdown_periods:
-        if in_drawdown:
-            current_duration += 1
-            max_duration = max(max_duration, current_duration)
-        else:
-            current_duration = 0
+    Args:
+        equity_curve: Array of cumulative equity values
     
-    return max_duration
+    Returns:
+        Dictionary of equal-length arrays, one entry per episode:
+        - start: index of the first period below the peak
+        - trough: index of the lowest equity in the episode
+        - recovery: index of the first period back at or above the peak (-1 if not recovered)
+        - depth: drawdown at the trough as a percentage (same convention as `max_drawdown`)
+        - duration: number of periods below the peak
+    """
+    equity = np.asarray(equity_curve, dtype=float)
+    running_max = np.maximum.accumulate(equity)
+    underwater = equity < running_max
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], underwater, [False])).view(np.int8)))
+    starts, ends = edges[::2], edges[1::2]
+    if starts.size == 0:
+        return {'start': starts, 'trough': starts, 'recovery': starts, 'depth': np.empty(0), 'duration': starts}
+
+    # Episode id of every period, then the first period of each episode that hits the episode low
+    episode = np.zeros(equity.size, dtype=np.int64)
+    episode[starts] = 1
+    episode = np.cumsum(episode) - 1
+    lows = np.minimum.reduceat(np.where(underwater, equity, np.inf), starts)
+    hits = np.flatnonzero(underwater & (equity == lows[episode]))
+    first = np.ones(hits.size, dtype=bool)
+    first[1:] = episode[hits[1:]] != episode[hits[:-1]]
+    troughs = hits[first]
+
+    denom = np.where(running_max[troughs] == 0, 1.0, running_max[troughs])
+    return {
+        'start': starts,
+        'trough': troughs,
+        'recovery': np.where(ends < equity.size, ends, -1),
+        'depth': (equity[troughs] - running_max[troughs]) / denom,
+        'duration': ends - starts,
+    }
 
 
 def hit_rate(returns: np.ndarray) -> float:
@@ -312,6 +354,10 @@ def calculate_all_metrics(returns: np.ndarray,
                          periods_per_year: int = 252) -> Dict[str, float]:
     """
     Calculate all performance metrics for a given return series.
+
+    Every metric is computed from shared intermediates (equity curve, running max, return and
+    excess-return moments, one percentile partition for the tail) rather than by calling each
+    metric function, and returns exactly the values those functions return.
     
     Args:
         returns: Array of returns
@@ -325,40 +371,298 @@ def calculate_all_metrics(returns: np.ndarray,
     returns = np.asarray(returns)
     if returns.size == 0:
         return {}
-    
-    # Calculate equity curve if not provided
+    n = len(returns)
+    sqrt_ppy = np.sqrt(periods_per_year)
+
+    # Shared intermediates: each array below is built once and reused by every metric that needs it,
+    # with the same operations as the standalone functions so the results are bit-for-bit identical
+    own_curve = np.cumprod(1 + returns)
     if equity_curve is None:
-        equity_curve = np.cumprod(1 + returns)
-    
+        equity_curve = own_curve
+    equity_curve = np.asarray(equity_curve)
+    growth = equity_curve[-1] / equity_curve[0]
+    running_max = np.maximum.accumulate(equity_curve)
+    max_dd = _max_drawdown_from(equity_curve, running_max)
+    if own_curve is equity_curve:
+        own_growth, own_max_dd = growth, max_dd
+    else:
+        # calmar_ratio() always compounds the returns, whatever curve was passed in
+        own_growth = own_curve[-1] / own_curve[0]
+        own_max_dd = _max_drawdown_from(own_curve, np.maximum.accumulate(own_curve))
+
+    positive = returns > 0
+    negative = returns < 0
+    num_positive = int(positive.sum())
+    num_negative = int(negative.sum())
+
+    # Moments of the raw returns (volatility, skewness, kurtosis)
+    mean = returns.mean() if n >= 3 else 0.0
+    std = returns.std(ddof=1) if n > 1 else 0.0
+    skew = kurt = 0.0
+    if n >= 3 and std != 0:
+        z = returns - mean
+        z /= std
+        moment = z ** 3
+        skew = float(np.mean(moment))
+        if n >= 4:
+            np.power(z, 4, out=moment)
+            kurt = float(np.mean(moment) - 3)
+
+    # Moments of the excess returns (Sharpe, Sortino)
+    sharpe_ratio = sortino_ratio = 0.0
+    if n > 1:
+        excess = returns - (risk_free_rate / periods_per_year)
+        excess_mean = excess.mean()
+        excess_std = excess.std(ddof=1)
+        if excess_std != 0:
+            sharpe_ratio = float((excess_mean / excess_std) * sqrt_ppy)
+        downside = excess[excess < 0]
+        if downside.size == 0:
+            sortino_ratio = float('inf') if excess_mean > 0 else 0.0
+        else:
+            downside_std = downside.std(ddof=1)
+            if downside_std != 0:
+                sortino_ratio = float((excess_mean / downside_std) * sqrt_ppy)
+
+    # Gains and losses
+    gross_profit = returns[positive].sum()
+    gross_loss = abs(returns[negative].sum())
+    if gross_loss == 0:
+        pf = float('inf') if gross_profit > 0 else 0.0
+    else:
+        pf = float(gross_profit / gross_loss)
+
+    # Tail: one percentile (a single partition) shared by VaR and CVaR
+    var_95 = np.percentile(returns, 0.05 * 100)
+    tail = returns[returns <= var_95]
+
+    calmar = 0.0
+    if own_max_dd != 0:
+        calmar = float(((1 + (own_growth - 1)) ** (periods_per_year / n) - 1) / abs(own_max_dd))
+
     metrics = {
-        'total_return': float((equity_curve[-1] / equity_curve[0]) - 1),
-        'annualized_return': float((1 + (equity_curve[-1] / equity_curve[0] - 1)) ** (periods_per_year / len(returns)) - 1),
-        'volatility': volatility(returns, periods_per_year),
-        'sharpe_ratio': sharpe(returns, risk_free_rate, periods_per_year),
-        'sortino_ratio': sortino(returns, risk_free_rate, periods_per_year),
-        'max_drawdown': max_drawdown(equity_curve),
-        'max_drawdown_duration': max_drawdown_duration(equity_curve),
-        'hit_rate': hit_rate(returns),
-        'profit_factor': profit_factor(returns),
-        'calmar_ratio': calmar_ratio(returns, periods_per_year),
-        'var_95': var(returns, 0.05),
-        'cvar_95': cvar(returns, 0.05),
-        'skewness': skewness(returns),
-        'kurtosis': kurtosis(returns),
-        'num_periods': len(returns),
-        'positive_periods': int((returns > 0).sum()),
-        'negative_periods': int((returns < 0).sum()),
+        'total_return': float(growth - 1),
+        'annualized_return': float((1 + (growth - 1)) ** (periods_per_year / n) - 1),
+        'volatility': float(std * sqrt_ppy) if n > 1 else 0.0,
+        'sharpe_ratio': sharpe_ratio,
+        'sortino_ratio': sortino_ratio,
+        'max_drawdown': max_dd,
+        'max_drawdown_duration': _longest_run(equity_curve < running_max),
+        'hit_rate': float(num_positive / n),
+        'profit_factor': pf,
+        'calmar_ratio': calmar,
+        'var_95': float(var_95),
+        'cvar_95': float(tail.mean()) if tail.size else 0.0,
+        'skewness': skew,
+        'kurtosis': kurt,
+        'num_periods': n,
+        'positive_periods': num_positive,
+        'negative_periods': num_negative,
         'zero_periods': int((returns == 0).sum())
     }
+
+    return metrics
+
+
+def _longest_runs(mask: np.ndarray) -> np.ndarray:
+    """Length of the longest run of consecutive True values in each row."""
+    if mask.shape[1] == 0:
+        return np.zeros(mask.shape[0], dtype=np.int64)
+    run = np.cumsum(mask, axis=1)
+    # Count at the latest False on each row, subtracted to restart the count after it
+    base = np.maximum.accumulate(np.where(mask, 0, run), axis=1)
+    return (run - base).max(axis=1)
+
+
+def _max_drawdown_rows(equity: np.ndarray, running_max: np.ndarray) -> np.ndarray:
+    if equity.shape[1] <= 1:
+        return np.zeros(equity.shape[0])
+    denom = np.where(running_max == 0, 1.0, running_max)
+    return ((equity - running_max) / denom).min(axis=1)
+
+
+def calculate_all_metrics_batch(returns_2d: np.ndarray,
+                                equity_curves: Optional[np.ndarray] = None,
+                                risk_free_rate: float = 0.02,
+                                periods_per_year: int = 252) -> pd.DataFrame:
+    """
+    Calculate all performance metrics for many equal-length return series at once.
+
+    Each row of the result holds the `calculate_all_metrics` values of one series (equal up to
+    floating-point summation order), computed with whole-matrix NumPy operations instead of a
+    Python loop. Peak memory is a few temporaries of the input's size.
+    
+    Args:
+        returns_2d: Array (or DataFrame) of shape (n_series, n_periods), one return series per row
+        equity_curves: Optional cumulative equity curves of the same shape (calculated if not provided)
+        risk_free_rate: Annual risk-free rate (default: 2%)
+        periods_per_year: Number of periods per year (default: 252 for daily)
     
+    Returns:
+        DataFrame with one row per series (the DataFrame's index if one was passed) and one
+        column per metric
+    """
+    index = returns_2d.index if isinstance(returns_2d, pd.DataFrame) else None
+    returns = np.asarray(returns_2d, dtype=float)
+    if returns.ndim != 2:
+        raise ValueError(f"returns_2d must be 2-D (n_series, n_periods), got shape {returns.shape}")
+    m, n = returns.shape
+    if n == 0:
+        return pd.DataFrame(index=index if index is not None else pd.RangeIndex(m))
+    sqrt_ppy = np.sqrt(periods_per_year)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        own_curves = np.cumprod(1 + returns, axis=1)
+        if equity_curves is None:
+            equity_curves = own_curves
+        equity_curves = np.asarray(equity_curves, dtype=float)
+        if equity_curves.shape != returns.shape:
+            raise ValueError(f"equity_curves shape {equity_curves.shape} does not match returns {returns.shape}")
+        growth = equity_curves[:, -1] / equity_curves[:, 0]
+        running_max = np.maximum.accumulate(equity_curves, axis=1)
+        max_dd = _max_drawdown_rows(equity_curves, running_max)
+        duration = _longest_runs(equity_curves < running_max)
+        if own_curves is equity_curves:
+            own_growth, own_max_dd = growth, max_dd
+        else:
+            own_growth = own_curves[:, -1] / own_curves[:, 0]
+            own_max_dd = _max_drawdown_rows(own_curves, np.maximum.accumulate(own_curves, axis=1))
+
+        positive = returns > 0
+        negative = returns < 0
+        num_positive = positive.sum(axis=1)
+        num_negative = negative.sum(axis=1)
+
+        # Moments of the raw returns
+        zeros = np.zeros(m)
+        std = returns.std(axis=1, ddof=1) if n > 1 else zeros
+        skew = kurt = zeros
+        if n >= 3:
+            z = (returns - returns.mean(axis=1, keepdims=True)) / std[:, None]
+            # Products instead of z ** 3 / z ** 4: pow is far slower and agrees to within an ulp
+            z2 = z * z
+            skew = np.where(std != 0, np.mean(z2 * z, axis=1), 0.0)
+            if n >= 4:
+                kurt = np.where(std != 0, np.mean(z2 * z2, axis=1) - 3, 0.0)
+
+        # Moments of the excess returns
+        sharpe_ratio = sortino_ratio = zeros
+        if n > 1:
+            excess = returns - (risk_free_rate / periods_per_year)
+            excess_mean = excess.mean(axis=1)
+            excess_std = excess.std(axis=1, ddof=1)
+            sharpe_ratio = np.where(excess_std != 0, excess_mean / excess_std * sqrt_ppy, 0.0)
+            downside = excess < 0
+            k = downside.sum(axis=1)
+            downside_mean = np.where(downside, excess, 0.0).sum(axis=1) / k
+            downside_std = np.sqrt(np.where(downside, (excess - downside_mean[:, None]) ** 2, 0.0).sum(axis=1) / (k - 1))
+            sortino_ratio = np.where(
+                k == 0,
+                np.where(excess_mean > 0, np.inf, 0.0),
+                np.where(downside_std != 0, excess_mean / downside_std * sqrt_ppy, 0.0),
+            )
+
+        # Gains and losses
+        gross_profit = np.where(positive, returns, 0.0).sum(axis=1)
+        gross_loss = np.abs(np.where(negative, returns, 0.0).sum(axis=1))
+        pf = np.where(gross_loss == 0, np.where(gross_profit > 0, np.inf, 0.0), gross_profit / gross_loss)
+
+        # Tail
+        var_95 = np.percentile(returns, 0.05 * 100, axis=1)
+        tail = returns <= var_95[:, None]
+        tail_count = tail.sum(axis=1)
+        cvar_95 = np.where(tail_count > 0, np.where(tail, returns, 0.0).sum(axis=1) / tail_count, 0.0)
+
+        calmar = np.where(own_max_dd != 0, ((1 + (own_growth - 1)) ** (periods_per_year / n) - 1) / np.abs(own_max_dd), 0.0)
+
+        metrics = pd.DataFrame({
+            'total_return': growth - 1,
+            'annualized_return': (1 + (growth - 1)) ** (periods_per_year / n) - 1,
+            'volatility': std * sqrt_ppy,
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'max_drawdown': max_dd,
+            'max_drawdown_duration': duration,
+            'hit_rate': num_positive / n,
+            'profit_factor': pf,
+            'calmar_ratio': calmar,
+            'var_95': var_95,
+            'cvar_95': cvar_95,
+            'skewness': skew,
+            'kurtosis': kurt,
+            'num_periods': np.full(m, n),
+            'positive_periods': num_positive,
+            'negative_periods': num_negative,
+            'zero_periods': (returns == 0).sum(axis=1),
+        }, index=index)
+
     return metrics
 
 
+def _rolling_max_drawdown(equity: np.ndarray, window: int) -> np.ndarray:
+    """
+    `max_drawdown` of every trailing window of an equity curve.
+
+    The curve is cut into blocks of `window` periods, so every window is a suffix of one block
+    followed by a prefix of the next. Prefix and suffix scans of (max, min, drawdown) per block
+    give each window's drawdown as the worst of the two parts and the drop from the suffix peak
+    to the prefix low, in O(n). That split relies on the drawdown falling as the low falls and
+    the peak rises, which only holds for positive equity: windows touching a non-positive value
+    are recomputed directly from their running max.
+    """
+    n = equity.size
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    if window == 1:
+        out[:] = 0.0
+        return out
+
+    def drawdown(low, peak):
+        return (low - peak) / np.where(peak == 0, 1.0, peak)
+
+    blocks = -(-n // window)
+    x = np.empty(blocks * window)
+    x[:n] = equity
+    x[n:] = equity[-1]
+    x = x.reshape(blocks, window)
+    pre_max = np.maximum.accumulate(x, axis=1)
+    pre_min = np.minimum.accumulate(x, axis=1).ravel()
+    pre_dd = np.minimum.accumulate(drawdown(x, pre_max), axis=1).ravel()
+    suf_max = np.maximum.accumulate(x[:, ::-1], axis=1)[:, ::-1]
+    suf_min = np.minimum.accumulate(x[:, ::-1], axis=1)[:, ::-1]
+    suf_dd = np.minimum.accumulate(drawdown(suf_min, x)[:, ::-1], axis=1)[:, ::-1].ravel()
+    suf_max = suf_max.ravel()
+
+    end = np.arange(window - 1, n)
+    start = end - window + 1
+    # A window aligned with a block is that whole block: no cross-block drop
+    cross = np.where(start % window == 0, np.inf, drawdown(pre_min[end], suf_max[start]))
+    out[end] = np.minimum(np.minimum(suf_dd[start], pre_dd[end]), cross)
+
+    bad = np.concatenate(([0], np.cumsum(equity <= 0)))
+    starts = np.flatnonzero(bad[window:] - bad[:-window])
+    if starts.size:
+        windows = np.lib.stride_tricks.sliding_window_view(equity, window)
+        chunk = max(1, (1 << 20) // window)
+        for i in range(0, starts.size, chunk):
+            rows = starts[i:i + chunk]
+            w = windows[rows]
+            out[rows + window - 1] = drawdown(w, np.maximum.accumulate(w, axis=1)).min(axis=1)
+    return out
+
+
 def calculate_rolling_metrics(returns: np.ndarray, 
                              window: int = 252,
                              periods_per_year: int = 252) -> pd.DataFrame:
     """
     Calculate rolling performance metrics over a specified window.
+
+    Every column matches the corresponding metric function applied to each trailing window
+    (NaN until the first full window and for windows containing NaN), but is computed in O(n):
+    Sharpe, Sortino, volatility, hit rate and profit factor from pandas' running-sum rolling
+    aggregates, max drawdown from block prefix/suffix scans of the equity curve (windows where
+    the equity is not positive fall back to a direct per-window scan).
     
     Args:
         returns: Array of returns
@@ -368,27 +672,46 @@ def calculate_rolling_metrics(returns: np.ndarray,
     Returns:
         DataFrame with rolling metrics
     """
-    returns = pd.Series(returns)
-    
-    rolling_metrics = pd.DataFrame()
-    
-    # Rolling Sharpe ratio
-    rolling_metrics['rolling_sharpe'] = returns.rolling(window).apply(
-        lambda x: sharpe(x.values, periods_per_year=periods_per_year)
-    )
-    
-    # Rolling volatility
-    rolling_metrics['rolling_volatility'] = returns.rolling(window).apply(
-        lambda x: volatility(x.values, periods_per_year=periods_per_year)
-    )
-    
+    returns = pd.Series(returns, dtype=float)
+    columns = ['rolling_sharpe', 'rolling_volatility', 'rolling_max_dd',
+               'rolling_sortino', 'rolling_hit_rate', 'rolling_profit_factor']
+    if window < 1:
+        # Empty windows: the metric functions return 0 for these
+        return pd.DataFrame(0.0, index=returns.index, columns=columns)
+    sqrt_ppy = np.sqrt(periods_per_year)
+    roll = returns.rolling(window)
+    mean = roll.mean()
+    std = roll.std()
+    up = (returns > 0).astype(float).rolling(window).sum()
+    down = (returns < 0).astype(float).rolling(window).sum()
+
+    rolling_metrics = pd.DataFrame(index=returns.index)
+
+    # Rolling Sharpe ratio and volatility
+    rolling_metrics['rolling_sharpe'] = (mean / std * sqrt_ppy).where(std != 0, 0.0)
+    rolling_metrics['rolling_volatility'] = std * sqrt_ppy
+
     # Rolling max drawdown (requires equity curve)
     equity_curve = (1 + returns).cumprod()
-    rolling_metrics['rolling_max_dd'] = equity_curve.rolling(window).apply(
-        lambda x: max_drawdown(x.values)
-    )
-    
-    return rolling_metrics
+    rolling_metrics['rolling_max_dd'] = _rolling_max_drawdown(equity_curve.to_numpy(), window)
+
+    # Rolling Sortino ratio: std of the negative returns in each window (NaN with a single one)
+    downside_std = returns.where(returns < 0).rolling(window, min_periods=min(2, window)).std()
+    sortino_ratio = (mean / downside_std * sqrt_ppy).where(downside_std != 0, 0.0)
+    no_downside = np.where(mean > 0, np.inf, 0.0)
+    rolling_metrics['rolling_sortino'] = sortino_ratio.where(down > 0, no_downside)
+
+    # Rolling hit rate and profit factor
+    rolling_metrics['rolling_hit_rate'] = up / window
+    gross_profit = returns.clip(lower=0).rolling(window).sum()
+    gross_loss = -returns.clip(upper=0).rolling(window).sum()
+    no_loss = np.where(up > 0, np.inf, 0.0)
+    rolling_metrics['rolling_profit_factor'] = (gross_profit / gross_loss).where(down > 0, no_loss)
+
+    if window == 1:
+        # Single-period windows: the metric functions return 0 for these
+        rolling_metrics[['rolling_sharpe', 'rolling_volatility', 'rolling_sortino']] = 0.0
+    return rolling_metrics.where(mean.notna())
 
 
 def print_metrics_summary(metrics: Dict[str, float]) -> None:
@@ -446,3 +769,308 @@ def print_metrics_summary(metrics: Dict[str, float]) -> None:
     print(f"{'Negative Periods:':<25} {metrics.get('negative_periods', 0):>8}")
     print("="*60)
 
+
+
+class MetricsAccumulator:
+    """
+    Incremental episode metrics updated in O(1) time and memory per step.
+
+    Feed one `update(pnl, inventory, bid_filled, ask_filled)` per env step. Returns are the
+    step-to-step PnL changes with the first step counting as 0 (same as
+    `pd.Series(pnl).diff().fillna(0.0)`), so `sharpe`, `max_drawdown`, `hit_rate` and
+    `std_inventory` match the post-hoc functions on the full history.
+    """
+
+    __slots__ = ('steps', 'last_pnl', '_ret_mean', '_ret_m2', 'positive', 'peak', 'min_drawdown',
+                 'inventory', '_inv_mean', '_inv_m2', 'min_inventory', 'max_inventory', 'bid_fills', 'ask_fills')
+
+    def __init__(self) -> None:
+        self.steps = 0
+        self.last_pnl = 0.0
+        self._ret_mean = 0.0
+        self._ret_m2 = 0.0
+        self.positive = 0
+        self.peak = -np.inf
+        self.min_drawdown = 0.0
+        self.inventory = 0
+        self._inv_mean = 0.0
+        self._inv_m2 = 0.0
+        self.min_inventory = 0
+        self.max_inventory = 0
+        self.bid_fills = 0
+        self.ask_fills = 0
+
+    def update(self, pnl: float, inventory: int, bid_filled: bool = False, ask_filled: bool = False) -> None:
+        """
+        Add one step.
+
+        Args:
+            pnl: Cumulative PnL after the step
+            inventory: Inventory after the step
+            bid_filled: Whether the bid side filled this step
+            ask_filled: Whether the ask side filled this step
+        """
+        n = self.steps + 1
+        ret = pnl - self.last_pnl if self.steps else 0.0
+        # Welford running mean/variance of returns and inventory
+        d = ret - self._ret_mean
+        self._ret_mean += d / n
+        self._ret_m2 += d * (ret - self._ret_mean)
+        if ret > 0:
+            self.positive += 1
+        d = inventory - self._inv_mean
+        self._inv_mean += d / n
+        self._inv_m2 += d * (inventory - self._inv_mean)
+        if n == 1 or inventory < self.min_inventory:
+            self.min_inventory = inventory
+        if n == 1 or inventory > self.max_inventory:
+            self.max_inventory = inventory
+        # Peak and drawdown with the same convention as max_drawdown()
+        if pnl > self.peak:
+            self.peak = pnl
+        denom = self.peak if self.peak != 0 else 1.0
+        dd = (pnl - self.peak) / denom
+        if dd < self.min_drawdown:
+            self.min_drawdown = dd
+        self.bid_fills += bool(bid_filled)
+        self.ask_fills += bool(ask_filled)
+        self.inventory = inventory
+        self.last_pnl = pnl
+        self.steps = n
+
+    def update_from_step(self, rec: Dict[str, Any]) -> None:
+        """Add one step from an env step record (`executed_*` is None/NaN when a side did not fill)."""
+        eb, ea = rec['executed_bid'], rec['executed_ask']
+        self.update(rec['pnl'], rec['inventory'], eb is not None and eb == eb, ea is not None and ea == ea)
+
+    @property
+    def trades(self) -> int:
+        return self.bid_fills + self.ask_fills
+
+    @property
+    def mean_return(self) -> float:
+        return self._ret_mean
+
+    @property
+    def std_return(self) -> float:
+        return float(np.sqrt(self._ret_m2 / (self.steps - 1))) if self.steps > 1 else float('nan')
+
+    @property
+    def mean_inventory(self) -> float:
+        return self._inv_mean
+
+    @property
+    def std_inventory(self) -> float:
+        return float(np.sqrt(self._inv_m2 / (self.steps - 1))) if self.steps > 1 else float('nan')
+
+    def sharpe(self, risk_free: float = 0.0, periods_per_year: int = 252) -> float:
+        if self.steps <= 1:
+            return 0.0
+        std = self.std_return
+        if std == 0:
+            return 0.0
+        return float((self._ret_mean - risk_free / periods_per_year) / std * np.sqrt(periods_per_year))
+
+    def max_drawdown(self) -> float:
+        return float(self.min_drawdown) if self.steps > 1 else 0.0
+
+    def hit_rate(self) -> float:
+        return self.positive / self.steps if self.steps else 0.0
+
+    def fill_rate(self) -> float:
+        return self.trades / self.steps if self.steps else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Episode metrics under the keys the experiments report."""
+        return {
+            'final_pnl': float(self.last_pnl),
+            'final_inventory': int(self.inventory),
+            'std_inventory': self.std_inventory,
+            'sharpe': self.sharpe(),
+            'max_drawdown': self.max_drawdown(),
+            'hit_rate': self.hit_rate(),
+            'trades': int(self.trades),
+            'fill_rate': self.fill_rate(),
+        }
+
+
+def episode_summary(pnl: np.ndarray, inventory: np.ndarray, trades: int) -> Dict[str, Any]:
+    """
+    `MetricsAccumulator.summary()` computed from whole-episode arrays.
+
+    Args:
+        pnl: Cumulative PnL after each step
+        inventory: Inventory after each step
+        trades: Number of fills (both sides) in the episode
+
+    Returns:
+        Dict with the same keys as `MetricsAccumulator.summary()`
+    """
+    pnl = np.asarray(pnl, dtype=float)
+    inventory = np.asarray(inventory)
+    steps = pnl.size
+    returns = np.diff(pnl, prepend=pnl[:1]) if steps else pnl
+    return {
+        'final_pnl': float(pnl[-1]) if steps else 0.0,
+        'final_inventory': int(inventory[-1]) if steps else 0,
+        'std_inventory': float(inventory.std(ddof=1)) if steps > 1 else float('nan'),
+        'sharpe': sharpe(returns),
+        'max_drawdown': max_drawdown(pnl),
+        'hit_rate': hit_rate(returns),
+        'trades': int(trades),
+        'fill_rate': trades / steps if steps else 0.0,
+    }
+
+
+class QuantileSketch:
+    """
+    Mergeable t-digest of a return series for VaR/CVaR without keeping the raw values.
+
+    Values are buffered and compressed into weighted centroids whose size shrinks towards both
+    tails (arcsine scale function), so tail quantiles stay accurate with a few hundred centroids.
+    The rank error of `quantile(q)` is about pi * sqrt(q * (1 - q)) / compression of the count
+    (~0.35% at q=0.05 with the default compression of 200); while no compression has happened the
+    sketch is exact and matches `np.percentile`. Sketches built over chunks of a series, in other
+    processes or from separate files, combine with `merge` (they pickle) to a sketch of the whole.
+    """
+
+    __slots__ = ('compression', 'count', 'min', 'max', '_means', '_weights', '_buffer', '_buffered')
+
+    def __init__(self, compression: float = 200.0) -> None:
+        self.compression = float(compression)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._buffer: list = []
+        self._buffered = 0
+
+    def update(self, values: np.ndarray) -> 'QuantileSketch':
+        """Add a batch of values (NaNs are ignored)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return self
+        self.count += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        # Compress every `buffer_size` values: sorting small batches beats one huge sort
+        buffer_size = int(50 * self.compression)
+        for i in range(0, values.size, buffer_size):
+            chunk = values[i:i + buffer_size]
+            self._buffer.append(chunk)
+            self._buffered += chunk.size
+            if self._buffered >= buffer_size:
+                self._compress()
+        return self
+
+    def merge(self, *others: 'QuantileSketch') -> 'QuantileSketch':
+        """Fold other sketches into this one (in place) and return it."""
+        for other in others:
+            if not other.count:
+                continue
+            self.count += other.count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._means = np.concatenate([self._means, other._means, *other._buffer])
+            self._weights = np.concatenate([self._weights, other._weights, np.ones(other._buffered)])
+        return self._compress()
+
+    def _centroids(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted centroid means and weights with the buffer folded in (uncompressed)."""
+        means = np.concatenate([self._means, *self._buffer])
+        weights = np.concatenate([self._weights, np.ones(self._buffered)])
+        order = np.argsort(means)
+        return means[order], weights[order]
+
+    def _compress(self) -> 'QuantileSketch':
+        means, weights = self._centroids()
+        self._buffer, self._buffered = [], 0
+        if means.size <= self.compression:
+            self._means, self._weights = means, weights
+            return self
+        # Centroids whose mid-rank falls in the same unit of the scale function k(q) merge
+        mid = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * mid - 1)).astype(np.int64)
+        cluster = np.concatenate([[0], np.cumsum(k[1:] != k[:-1])])
+        merged_weights = np.bincount(cluster, weights)
+        self._means = np.bincount(cluster, weights * means) / merged_weights
+        self._weights = merged_weights
+        return self
+
+    def _positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Quantile-function knots: (rank, value), rank on np.percentile's 0..count-1 scale."""
+        means, weights = self._centroids()
+        ranks = np.cumsum(weights) - (weights + 1) / 2
+        if weights[0] > 1:
+            ranks, means = np.concatenate([[0.0], ranks]), np.concatenate([[self.min], means])
+        if weights[-1] > 1:
+            ranks, means = np.concatenate([ranks, [self.count - 1.0]]), np.concatenate([means, [self.max]])
+        return ranks, means
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile (0 <= q <= 1), NaN for an empty sketch."""
+        if not self.count:
+            return float('nan')
+        ranks, values = self._positions()
+        return float(np.interp(q * (self.count - 1), ranks, values))
+
+    def tail_mean(self, q: float) -> float:
+        """Estimated mean of the values at or below the q-quantile, NaN for an empty sketch."""
+        if not self.count:
+            return float('nan')
+        means, weights = self._centroids()
+        # The floor(q * (count - 1)) + 1 smallest values: whole centroids plus part of the next
+        n_tail = int(np.floor(q * (self.count - 1))) + 1
+        before = np.cumsum(weights) - weights
+        full = before + weights <= n_tail
+        total = float(np.dot(weights[full], means[full]))
+        rest = n_tail - int(weights[full].sum())
+        if rest > 0:
+            # The partial centroid's lowest `rest` values, valued at their middle rank
+            ranks, values = self._positions()
+            total += rest * float(np.interp(before[~full][0] + (rest - 1) / 2, ranks, values))
+        return total / n_tail
+
+
+def _as_sketch(sketches: Any) -> QuantileSketch:
+    if isinstance(sketches, QuantileSketch):
+        return sketches
+    sketches = list(sketches)
+    compression = sketches[0].compression if sketches else 200.0
+    return QuantileSketch(compression).merge(*sketches)
+
+
+def sketch_var(sketches: Any, confidence_level: float = 0.05) -> float:
+    """
+    Value at Risk from a quantile sketch instead of the raw returns.
+    
+    Args:
+        sketches: A QuantileSketch, or an iterable of partial sketches (merged without modifying them)
+        confidence_level: Confidence level (e.g., 0.05 for 95% VaR)
+    
+    Returns:
+        Estimated VaR as a percentage (negative value)
+    """
+    sketch = _as_sketch(sketches)
+    if not sketch.count:
+        return 0.0
+    return sketch.quantile(confidence_level)
+
+
+def sketch_cvar(sketches: Any, confidence_level: float = 0.05) -> float:
+    """
+    Conditional Value at Risk from a quantile sketch instead of the raw returns.
+    
+    Args:
+        sketches: A QuantileSketch, or an iterable of partial sketches (merged without modifying them)
+        confidence_level: Confidence level (e.g., 0.05 for 95% CVaR)
+    
+    Returns:
+        Estimated CVaR as a percentage (negative value)
+    """
+    sketch = _as_sketch(sketches)
+    if not sketch.count:
+        return 0.0
+    return sketch.tail_mean(confidence_level)
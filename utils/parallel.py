@@ -0,0 +1,50 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, List, Sequence
+import os
+from tqdm import tqdm
+
+
+def resolve_workers(workers: int | None) -> int:
+    """0/None = one worker per CPU core."""
+    if not workers or int(workers) <= 0:
+        return os.cpu_count() or 1
+    return int(workers)
+
+
+def _run_chunk(fn: Callable[[Any], Any], chunk: Sequence[Any]) -> List[Any]:
+    return [fn(x) for x in chunk]
+
+
+def parallel_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int | None = 0,
+    chunk_size: int = 1,
+    desc: str | None = None,
+) -> List[Any]:
+    """
+    Ordered `[fn(x) for x in items]` spread over a process pool.
+    - `fn` and items must be picklable (module-level function / functools.partial)
+    - items are sent in chunks of `chunk_size`; results come back in input order
+    - progress is reported per finished item with tqdm
+    Runs in-process when there is a single worker or a single item.
+    """
+    items = list(items)
+    workers = min(resolve_workers(workers), max(1, len(items)))
+    chunk_size = max(1, int(chunk_size or 1))
+    if workers <= 1:
+        return [fn(x) for x in tqdm(items, desc=desc)]
+
+    results: List[Any] = [None] * len(items)
+    with ProcessPoolExecutor(max_workers=workers) as pool, tqdm(total=len(items), desc=desc) as bar:
+        futures = {
+            pool.submit(_run_chunk, fn, items[start:start + chunk_size]): start
+            for start in range(0, len(items), chunk_size)
+        }
+        for fut in as_completed(futures):
+            start = futures[fut]
+            out = fut.result()
+            results[start:start + len(out)] = out
+            bar.update(len(out))
+    return results
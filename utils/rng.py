@@ -0,0 +1,53 @@
+from __future__ import annotations
+import numpy as np
+
+
+class BlockRNG:
+    """
+    Drop-in for the scalar `np.random.Generator` calls made in simulation hot loops.
+    Uniforms and standard normals are drawn in blocks of `block_size` and served one
+    at a time; blocks refill transparently. Seeded runs are reproducible, but the
+    stream differs from calling the generator directly because the two kinds of
+    draws come from separate blocks.
+    """
+
+    def __init__(self, seed=None, block_size: int = 4096):
+        self.generator = np.random.default_rng(seed)
+        self.block_size = max(1, int(block_size))
+        self._uniforms = iter(())
+        self._normals = iter(())
+
+    def random(self, size=None):
+        if size is not None:
+            return self.generator.random(size)
+        try:
+            return next(self._uniforms)
+        except StopIteration:
+            self._uniforms = iter(self.generator.random(self.block_size).tolist())
+            return next(self._uniforms)
+
+    def standard_normal(self, size=None):
+        if size is not None:
+            return self.generator.standard_normal(size)
+        try:
+            return next(self._normals)
+        except StopIteration:
+            self._normals = iter(self.generator.standard_normal(self.block_size).tolist())
+            return next(self._normals)
+
+    def normal(self, loc: float = 0.0, scale: float = 1.0, size=None):
+        if size is not None:
+            return self.generator.normal(loc, scale, size)
+        return loc + scale * self.standard_normal()
+
+    def uniform(self, low: float = 0.0, high: float = 1.0, size=None):
+        if size is not None:
+            return self.generator.uniform(low, high, size)
+        return low + (high - low) * self.random()
+
+
+def make_rng(seed=None, block_size: int = 0):
+    """Plain Generator when `block_size` is 0, otherwise a BlockRNG."""
+    if block_size and int(block_size) > 0:
+        return BlockRNG(seed, block_size)
+    return np.random.default_rng(seed)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Optional
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# MLflow log_batch limits per request: params alone, and params + metrics + tags combined
+_MAX_PARAMS = 100
+_MAX_ENTITIES = 1000
+# Consecutive failed flushes before the pending params/metrics are dropped
+_MAX_FLUSH_ATTEMPTS = 3
+# Errors kept in `Tracker.errors` (and logged); later ones are only counted
+_MAX_ERRORS = 20
+# Total time the interpreter waits at exit for closed async trackers to finish uploading
+_DRAIN_TIMEOUT = 60.0
+_STOP = object()
+_open_trackers: "set[Tracker]" = set()
+
+
+class Tracker:
+    """
+    MLflow run sink that keeps logging off the simulation path.
+    - mode 'async': calls only enqueue; a background thread creates the run and flushes params and
+      metrics with `log_batch` (every `batch_size` items or `flush_interval` seconds) and uploads artifacts
+    - mode 'sync': the same work done inline (debugging)
+    - mode 'off': every call is a no-op and mlflow is never imported (sweeps, tests)
+    Artifacts are deduped by resolved file path, so logging a file and then its directory uploads it once.
+    Tracking errors are logged, never raised into the caller. If the run cannot be created nothing
+    is buffered, and params/metrics still unsent after `_MAX_FLUSH_ATTEMPTS` failed flushes are dropped.
+    """
+
+    def __init__(self, experiment: str = 'mmrl', run_name: str | None = None, mode: str = 'async',
+                 batch_size: int = 100, flush_interval: float = 1.0, client: Any = None):
+        if mode not in ('async', 'sync', 'off'):
+            raise ValueError(f"tracking mode must be 'async', 'sync' or 'off', got {mode!r}")
+        self.experiment = experiment
+        self.run_name = run_name
+        self.mode = mode
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.errors: list[BaseException] = []
+        self.dropped_errors = 0
+        self._flush_failures = 0
+        self._client = client
+        self._run_id: Optional[str] = None
+        self._run_ready = threading.Event()
+        self._logged: set[Path] = set()
+        self._params: Dict[str, str] = {}
+        self._metrics: list = []
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        if mode == 'async':
+            self._thread = threading.Thread(target=self._worker, name='mlflow-tracker', daemon=True)
+            self._thread.start()
+            _open_trackers.add(self)
+        elif mode == 'sync':
+            self._guard(self._start_run)
+
+    # Public API (cheap: enqueue only in async mode)
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    @property
+    def run_id(self) -> Optional[str]:
+        """MLflow run id (waits for the background thread to create the run); None when off or failed."""
+        if self.mode == 'off':
+            return None
+        self._run_ready.wait(timeout=60.0)
+        return self._run_id
+
+    @property
+    def started_run_id(self) -> Optional[str]:
+        """MLflow run id if the run has been created yet, else None (never waits)."""
+        return self._run_id
+
+    def write_run_id(self, path: str | os.PathLike, artifact_path: str | None = None) -> None:
+        """Write the run id to `path` and upload it once the run exists (from the background thread in async mode)."""
+        self._submit('run_id', (Path(path), artifact_path))
+
+    def log_param(self, key: str, value: Any) -> None:
+        self.log_params({key: value})
+
+    def log_params(self, params: Dict[str, Any]) -> None:
+        self._submit('params', {str(k): str(v) for k, v in params.items()})
+
+    def log_metric(self, key: str, value: Any, step: int = 0) -> None:
+        self.log_metrics({key: value}, step)
+
+    def log_metrics(self, metrics: Dict[str, Any], step: int = 0) -> None:
+        ts = int(time.time() * 1000)
+        self._submit('metrics', [(str(k), float(v), ts, int(step)) for k, v in metrics.items() if v is not None])
+
+    def log_artifact(self, path: str | os.PathLike, artifact_path: str | None = None) -> None:
+        self._submit('artifact', (Path(path), artifact_path))
+
+    def log_artifacts(self, directory: str | os.PathLike, artifact_path: str | None = None) -> None:
+        """Every file under `directory` (relative layout kept), skipping files already logged."""
+        root = Path(directory)
+        for p in sorted(root.rglob('*')):
+            if p.is_file():
+                rel = p.parent.relative_to(root).as_posix()
+                sub = '/'.join(x for x in (artifact_path, rel if rel != '.' else None) if x) or None
+                self.log_artifact(p, sub)
+
+    def close(self, status: str = 'FINISHED', wait: bool = False) -> None:
+        """Flush and terminate the run. Async trackers drain in the background (and at interpreter exit) unless `wait`."""
+        if self.mode == 'off' or self._closed:
+            return
+        self._closed = True
+        if self.mode == 'sync':
+            self._guard(self._flush)
+            self._guard(lambda: self._end_run(status))
+            return
+        self._queue.put((_STOP, status))
+        if wait:
+            self.join()
+
+    def join(self, timeout: float | None = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+            _open_trackers.discard(self)
+
+    def __enter__(self) -> 'Tracker':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close('FAILED' if exc_type is not None else 'FINISHED')
+        return False
+
+    # Internals
+    def _submit(self, kind: str, payload: Any) -> None:
+        if self.mode == 'off' or not payload:
+            return
+        if self.mode == 'sync':
+            self._guard(lambda: self._apply(kind, payload))
+            self._guard(self._flush)
+        else:
+            self._queue.put((kind, payload))
+
+    def _guard(self, fn) -> None:
+        try:
+            fn()
+        except Exception as e:  # tracking must never break a run
+            if len(self.errors) < _MAX_ERRORS:
+                self.errors.append(e)
+                logger.warning("MLflow tracking failed: %s", e)
+            else:
+                self.dropped_errors += 1
+
+    def _start_run(self) -> None:
+        try:
+            if self._client is None:
+                from mlflow.tracking import MlflowClient
+                self._client = MlflowClient()
+            exp = self._client.get_experiment_by_name(self.experiment)
+            exp_id = exp.experiment_id if exp is not None else self._client.create_experiment(self.experiment)
+            run = self._client.create_run(exp_id, run_name=self.run_name)
+            self._run_id = run.info.run_id
+        finally:
+            self._run_ready.set()
+
+    def _apply(self, kind: str, payload: Any) -> None:
+        if self._run_ready.is_set() and self._run_id is None:
+            return  # the run could not be created: nothing to send this to
+        if kind == 'params':
+            self._params.update(payload)
+        elif kind == 'metrics':
+            self._metrics.extend(payload)
+        elif kind == 'run_id':
+            path, artifact_path = payload
+            if self._run_id is not None:
+                path.write_text(self._run_id)
+                self._apply('artifact', (path, artifact_path))
+        elif kind == 'artifact':
+            path, artifact_path = payload
+            resolved = path.resolve()
+            if resolved in self._logged or self._run_id is None:
+                return
+            self._logged.add(resolved)
+            self._client.log_artifact(self._run_id, str(path), artifact_path)
+
+    def _pending(self) -> int:
+        return len(self._params) + len(self._metrics)
+
+    def _flush(self) -> None:
+        if self._run_id is None or not self._pending():
+            return
+        from mlflow.entities import Metric, Param
+        while self._pending():
+            keys = list(self._params)[:_MAX_PARAMS]
+            n_metrics = min(len(self._metrics), _MAX_ENTITIES - len(keys))
+            try:
+                self._client.log_batch(self._run_id, metrics=[Metric(*m) for m in self._metrics[:n_metrics]],
+                                       params=[Param(k, self._params[k]) for k in keys])
+            except Exception:
+                self._flush_failures += 1
+                if self._flush_failures >= _MAX_FLUSH_ATTEMPTS:
+                    logger.warning("MLflow tracking: dropping %d params/metrics after %d failed flushes",
+                                   self._pending(), self._flush_failures)
+                    self._params, self._metrics = {}, []
+                    self._flush_failures = 0
+                raise
+            self._flush_failures = 0
+            # Dropped only once sent: a failed batch stays pending for the next flush
+            for k in keys:
+                del self._params[k]
+            del self._metrics[:n_metrics]
+
+    def _end_run(self, status: str) -> None:
+        if self._run_id is not None:
+            self._client.set_terminated(self._run_id, status)
+
+    def _worker(self) -> None:
+        self._guard(self._start_run)
+        last_flush = time.monotonic()
+        while True:
+            try:
+                kind, payload = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                kind = None
+            if kind is _STOP:
+                self._guard(self._flush)
+                self._guard(lambda: self._end_run(payload))
+                # Finished trackers need no drain at exit, whether or not anyone joins them
+                _open_trackers.discard(self)
+                return
+            if kind is not None:
+                self._guard(lambda: self._apply(kind, payload))
+            if self._pending() >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval:
+                self._guard(self._flush)
+                last_flush = time.monotonic()
+
+
+def get_tracker(cfg: Dict[str, Any] | None, run_name: str) -> Tracker:
+    """Tracker for the config's experiment (`run_tag`) with the `tracking` section's mode and batching."""
+    cfg = cfg or {}
+    tcfg = cfg.get('tracking') or {}
+    return Tracker(
+        experiment=cfg.get('run_tag', 'mmrl') or 'mmrl',
+        run_name=run_name,
+        mode=tcfg.get('mode', 'async'),
+        batch_size=int(tcfg.get('batch_size', 100)),
+        flush_interval=float(tcfg.get('flush_interval', 1.0)),
+    )
+
+
+@atexit.register
+def _drain_open_trackers() -> None:
+    # Async trackers closed without wait=True still finish their uploads before the interpreter
+    # exits, within one overall deadline
+    trackers = list(_open_trackers)
+    for tracker in trackers:
+        if not tracker._closed:
+            tracker.close()
+    deadline = time.monotonic() + _DRAIN_TIMEOUT
+    for tracker in trackers:
+        tracker.join(timeout=max(0.0, deadline - time.monotonic()))